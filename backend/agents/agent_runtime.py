@@ -0,0 +1,322 @@
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+from uagents import Agent, Context, Model, Protocol
+from uagents.asgi import ASGIServer
+from uagents.communication import Dispenser, send_exchange_envelope
+from uagents.config import REGISTRATION_UPDATE_INTERVAL_SECONDS
+from uagents.crypto import Identity, generate_user_address
+from uagents.dispatch import dispatcher
+from uagents.setup import fund_agent_if_low
+
+logger = logging.getLogger(__name__)
+
+
+class Message(Model):
+    content: str
+
+
+class AgentResponse(Model):
+    reply: str
+
+
+class AgentCapacityError(Exception):
+    """Raised when the runtime already hosts its maximum number of agents"""
+
+
+class AgentNotFoundError(Exception):
+    """Raised for an agent address the runtime is not hosting"""
+
+
+def _free_port(host: str, preferred: int) -> int:
+    """``preferred`` if it can be bound, otherwise a port picked by the OS"""
+    for port in ([preferred] if preferred else []) + [0]:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((host, port))
+            except OSError:
+                logger.warning(f"⚠️ Agent runtime port {port} is in use, picking a free one")
+                continue
+            return sock.getsockname()[1]
+    raise RuntimeError("No free port for the agent runtime")
+
+
+class SharedDispenser(Dispenser):
+    """
+    One outbound envelope queue for every hosted agent.
+
+    The stock Dispenser polls its list with ``asyncio.sleep(0)``, so each
+    agent would keep the loop spinning; this one waits on a queue and sends
+    envelopes concurrently. As upstream, a failed send is logged once and
+    the sender's own timeout reports it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._queue = asyncio.Queue()
+
+    def add_envelope(self, envelope, endpoints, response_future, sync=False):
+        self._queue.put_nowait((envelope, endpoints, response_future, sync))
+
+    async def _send(self, envelope, endpoints, response_future, sync):
+        try:
+            result = await send_exchange_envelope(envelope=envelope, endpoints=endpoints, sync=sync)
+            if not response_future.done():
+                response_future.set_result(result)
+        except Exception as e:
+            logger.error(f"Failed to send envelope: {str(e)}")
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        sending = set()
+        while True:
+            task = loop.create_task(self._send(*await self._queue.get()))
+            sending.add(task)
+            task.add_done_callback(sending.discard)
+
+
+class HostedAgent:
+    """An agent plus the loop tasks the runtime started for it"""
+
+    def __init__(self, agent: Agent, name: str):
+        self.agent = agent
+        self.name = name
+        self.tasks = set()
+        self.last_used = time.monotonic()
+        self.messages = 0
+
+    def touch(self):
+        self.last_used = time.monotonic()
+        self.messages += 1
+
+
+class AgentRuntime:
+    """
+    Hosts many uAgents on one background event loop, Bureau-style.
+
+    All agents share a single ASGI endpoint on a dynamically chosen port;
+    envelopes reach the right agent through the uagents dispatcher, and
+    chats from the API are answered through the same sync-query futures
+    the endpoint uses. Agents that see no traffic for ``idle_seconds`` are
+    stopped, and at most ``max_agents`` run at once.
+    """
+
+    def __init__(self, max_agents: int = 500, idle_seconds: float = 1800, port: int = 0,
+                 host: str = "127.0.0.1", register: bool = False, chat_timeout: float = 30):
+        self.max_agents = max_agents
+        self.idle_seconds = idle_seconds
+        self.preferred_port = port
+        self.host = host
+        self.register = register
+        self.chat_timeout = chat_timeout
+        self.port = None
+        self._agents: Dict[str, HostedAgent] = {}
+        self._queries: Dict[str, asyncio.Future] = {}
+        self._dispenser = SharedDispenser()
+        self._protocol = self._chat_protocol()
+        self._loop = None
+        self._server_task = None
+        self._lock = threading.Lock()
+
+        self.started = 0
+        self.stopped = 0
+        self.evicted = 0
+        self.rejected = 0
+        self.chats = 0
+        self.chat_timeouts = 0
+
+    @property
+    def endpoint(self) -> Optional[str]:
+        return f"http://{self.host}:{self.port}/submit" if self.port else None
+
+    def _chat_protocol(self) -> Protocol:
+        """Built once and included by every agent; schema digests are costly per agent"""
+        protocol = Protocol(name="marketforge-chat", version="0.1.0")
+
+        @protocol.on_message(model=Message, replies=AgentResponse, allow_unverified=True)
+        async def handle_message(ctx: Context, sender: str, msg: Message):
+            hosted = self._agents.get(ctx.agent.address)
+            if hosted is not None:
+                hosted.touch()
+            logger.info(f"Agent {ctx.agent.name} received: {msg.content}")
+            # Process with ASI:One or custom logic here
+            reply = f"Agent {ctx.agent.name} processed: {msg.content}"
+            await ctx.send(sender, AgentResponse(reply=reply))
+
+        return protocol
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self.port = _free_port("0.0.0.0", self.preferred_port)
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="agent-runtime", daemon=True)
+                thread.start()
+                asyncio.run_coroutine_threadsafe(self._start_server(), loop).result()
+                self._loop = loop
+                logger.info(f"🤖 Agent runtime serving {self.endpoint}")
+            return self._loop
+
+    def _run(self, coro, timeout: float = None):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    async def _start_server(self):
+        loop = asyncio.get_running_loop()
+        server = ASGIServer(self.port, loop, self._queries, logger)
+        self._server_task = loop.create_task(server.serve())
+        self._server_task.add_done_callback(self._server_stopped)
+        loop.create_task(self._dispenser.run())
+        loop.create_task(self._evict_idle())
+
+    def _server_stopped(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Agent runtime endpoint stopped: {task.exception()}")
+
+    def create(self, name: str, seed: str) -> Dict:
+        """Start an agent (or return the running one with the same seed)"""
+        return self._run(self._create(name, seed))
+
+    def chat(self, address: str, content: str) -> str:
+        """Deliver ``content`` to a hosted agent and wait for its reply"""
+        return self._run(self._chat(address, content))
+
+    def stop(self, address: str) -> bool:
+        """Stop a hosted agent; False if it was not running"""
+        return self._run(self._stop(address))
+
+    async def _create(self, name: str, seed: str) -> Dict:
+        hosted = self._agents.get(Identity.from_seed(seed, 0).address)
+        if hosted is not None:
+            hosted.last_used = time.monotonic()
+            return self.describe(hosted)
+        if len(self._agents) >= self.max_agents:
+            self.rejected += 1
+            raise AgentCapacityError(f"Agent runtime is full ({self.max_agents} agents running)")
+
+        agent = Agent(name=name, seed=seed, port=self.port, endpoint=[self.endpoint],
+                      loop=asyncio.get_running_loop())
+        hosted = HostedAgent(agent, name)
+        agent.include(self._protocol)
+        agent.update_queries(self._queries)
+        # Agent has no setter for this; both its contexts read the attribute
+        agent._dispenser = agent._ctx._dispenser = self._dispenser
+
+        # The uagents start_* helpers don't hand back their tasks; nothing
+        # else runs on the loop between these two snapshots
+        before = asyncio.all_tasks()
+        agent.start_message_receivers()
+        agent.start_interval_tasks()
+        hosted.tasks = asyncio.all_tasks() - before
+        if self.register:
+            hosted.tasks.add(asyncio.get_running_loop().create_task(self._keep_registered(agent)))
+
+        self._agents[agent.address] = hosted
+        self.started += 1
+        logger.info(f"🤖 Agent {name} started ({len(self._agents)}/{self.max_agents})")
+        return self.describe(hosted)
+
+    async def _keep_registered(self, agent: Agent):
+        """Almanac registration, renewed like Agent.run() would"""
+        await asyncio.get_running_loop().run_in_executor(None, fund_agent_if_low, agent.wallet.address())
+        while True:
+            try:
+                await agent.register()
+                delay = REGISTRATION_UPDATE_INTERVAL_SECONDS
+            except Exception as e:
+                logger.warning(f"⚠️ Almanac registration failed for {agent.address}: {str(e)}")
+                delay = 60
+            await asyncio.sleep(delay)
+
+    async def _chat(self, address: str, content: str) -> str:
+        hosted = self._agents.get(address)
+        if hosted is None:
+            raise AgentNotFoundError(f"Agent {address} is not running")
+        sender = generate_user_address()
+        reply = asyncio.get_running_loop().create_future()
+        self._queries[sender] = reply
+        self.chats += 1
+        try:
+            await dispatcher.dispatch(sender, address, Model.build_schema_digest(Message),
+                                      Message(content=content).model_dump_json(), uuid.uuid4())
+            body, _ = await asyncio.wait_for(reply, self.chat_timeout)
+        except asyncio.TimeoutError:
+            self.chat_timeouts += 1
+            raise
+        finally:
+            self._queries.pop(sender, None)
+        return AgentResponse.model_validate_json(body).reply
+
+    async def _stop(self, address: str, reason: str = "stopped") -> bool:
+        hosted = self._agents.pop(address, None)
+        if hosted is None:
+            return False
+        dispatcher.unregister(address, hosted.agent)
+        for task in hosted.tasks:
+            task.cancel()
+        await asyncio.gather(*hosted.tasks, return_exceptions=True)
+        if reason == "evicted":
+            self.evicted += 1
+        else:
+            self.stopped += 1
+        logger.info(f"🤖 Agent {hosted.name} {reason} ({len(self._agents)}/{self.max_agents})")
+        return True
+
+    async def _evict_idle(self):
+        while True:
+            await asyncio.sleep(max(1.0, min(60.0, self.idle_seconds / 4)))
+            cutoff = time.monotonic() - self.idle_seconds
+            for address in [a for a, hosted in self._agents.items() if hosted.last_used < cutoff]:
+                await self._stop(address, reason="evicted")
+
+    def describe(self, hosted: HostedAgent) -> Dict:
+        return {
+            "agent_id": hosted.agent.address,
+            "name": hosted.name,
+            "status": "active",
+            "endpoint": self.endpoint
+        }
+
+    def stats(self) -> Dict:
+        running = len(self._agents)
+        now = time.monotonic()
+        return {
+            "running": running,
+            "max_agents": self.max_agents,
+            "utilization": round(running / self.max_agents, 3) if self.max_agents else None,
+            "idle_seconds": self.idle_seconds,
+            "oldest_idle_seconds": round(max((now - h.last_used for h in list(self._agents.values())), default=0), 1),
+            "messages": sum(h.messages for h in list(self._agents.values())),
+            "endpoint": self.endpoint,
+            "started": self.started,
+            "stopped": self.stopped,
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+            "chats": self.chats,
+            "chat_timeouts": self.chat_timeouts
+        }
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_agent_runtime() -> AgentRuntime:
+    """Process-wide runtime configured from the environment (loop starts on first agent)"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AgentRuntime(
+                max_agents=int(os.getenv("AGENT_RUNTIME_MAX_AGENTS", "500")),
+                idle_seconds=float(os.getenv("AGENT_IDLE_SECONDS", "1800")),
+                port=int(os.getenv("AGENT_RUNTIME_PORT", "0")),
+                host=os.getenv("AGENT_RUNTIME_HOST", "127.0.0.1"),
+                register=os.getenv("AGENT_ALMANAC_REGISTER", "false").lower() == "true",
+                chat_timeout=float(os.getenv("AGENT_CHAT_TIMEOUT", "30"))
+            )
+        return _runtime
@@ -1,10 +1,15 @@
-import os, requests
+import os
+import asyncio
+from utils.http_transport import http_post, async_request
+from utils.event_loop import ASYNC_PROVIDERS, run_sync
+from utils.llm_cache import llm_cache, make_cache_key, use_llm_cache
+from utils.rate_limiter import request_tokens
 
-ASI1_URL = "https://api.asi1.ai/v1/chat/completions"
+ASI1_URL = os.getenv("ASI1_URL", "https://api.asi1.ai/v1/chat/completions")
 API_KEY = os.getenv("ASI1_API_KEY")
+ASI1_TIMEOUT = float(os.getenv("ASI1_TIMEOUT", "120"))
 
-def ask_asi1(question: str) -> str:
-    system_prompt = """
+SYSTEM_PROMPT = """
 You are a senior business consultant and market analyst. Provide detailed, specific, and actionable business advice.
 
 When analyzing a business:
@@ -16,6 +21,9 @@ When analyzing a business:
 
 Format your response as clear, structured text with specific details.
 """
+
+def _asi1_request(question: str):
+    """Headers and payload shared by the sync and async clients"""
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {API_KEY}"
@@ -23,13 +31,50 @@ Format your response as clear, structured text with specific details.
     payload = {
         "model": "asi1-mini",
         "messages": [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": question.strip()}
         ],
         "temperature": 0.7,  # Increase for more varied responses
         "stream": False,
         "max_tokens": 10000
     }
-    resp = requests.post(ASI1_URL, headers=headers, json=payload)
-    resp.raise_for_status()
-    return resp.json()["choices"][0]["message"]["content"]
\ No newline at end of file
+    return headers, payload
+
+def _asi1_cache_key(payload: dict) -> str:
+    return make_cache_key("asi1", payload["model"], payload["messages"],
+                          payload["temperature"], payload["max_tokens"])
+
+def ask_asi1(question: str, cache: bool = None) -> str:
+    """Ask ASI:One; ``cache`` opts this call site in/out of the response cache"""
+    if ASYNC_PROVIDERS:
+        return run_sync(ask_asi1_async(question, cache=cache))
+    headers, payload = _asi1_request(question)
+
+    def fetch():
+        resp = http_post(ASI1_URL, headers=headers, json=payload, timeout=ASI1_TIMEOUT, provider="asi1",
+                         api_key=API_KEY, tokens=request_tokens(payload["messages"], payload["max_tokens"]))
+        resp.raise_for_status()
+        return resp.json()["choices"][0]["message"]["content"]
+
+    if not use_llm_cache(cache, payload["temperature"]):
+        return fetch()
+    return llm_cache.get_or_compute(_asi1_cache_key(payload), fetch)
+
+async def ask_asi1_async(question: str, cache: bool = None) -> str:
+    headers, payload = _asi1_request(question)
+    use_cache = use_llm_cache(cache, payload["temperature"])
+    if use_cache:
+        key = _asi1_cache_key(payload)
+        cached = await asyncio.to_thread(llm_cache.lookup, key)
+        if cached is not None:
+            return cached
+
+    status, body = await async_request("POST", ASI1_URL, headers=headers, json=payload, timeout=ASI1_TIMEOUT,
+                                       provider="asi1", api_key=API_KEY,
+                                       tokens=request_tokens(payload["messages"], payload["max_tokens"]))
+    if status != 200:
+        raise RuntimeError(f"ASI1 API error: {status}")
+    content = body["choices"][0]["message"]["content"]
+    if use_cache:
+        await asyncio.to_thread(llm_cache.set, key, content)
+    return content
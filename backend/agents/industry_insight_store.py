@@ -0,0 +1,382 @@
+# Precomputed industry insights shared by every analysis job
+import os
+import copy
+import json
+import time
+import uuid
+import zlib
+import sqlite3
+import logging
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from .trend_detector import TrendDetector
+from utils.http_transport import call_class
+from utils.llm_cache import llm_cache_bypass
+
+logger = logging.getLogger(__name__)
+
+INDUSTRY_STORE_ENABLED = os.getenv("INDUSTRY_STORE_ENABLED", "true").lower() == "true"
+
+
+class IndustryInsightStore:
+    """
+    Industry insights keyed by (industry, business size), refreshed in the background.
+
+    Insights don't depend on the business being analyzed, so jobs are served
+    the stored entry while it is younger than ``max_age``. A background
+    thread re-computes the ``top_n`` most requested keys every
+    ``refresh_interval`` seconds, with demand counts halving each cycle so
+    recent traffic dominates. Unseen or expired keys are computed on demand,
+    once per key even under concurrent requests.
+
+    With a ``path`` the entries and demand counts are shared through SQLite
+    by every worker process, and only the process holding the refresh lease
+    runs the refresh cycle over everyone's demand; the others pick its
+    results up from the table. At most
+    ``max_entries`` keys are kept in memory (least recently used first out).
+    """
+
+    LEASE_NAME = "refresh"
+
+    def __init__(self, top_n: int = 20, refresh_interval: float = 3600, max_age: float = 21600,
+                 seed_industries=(), max_entries: int = 500, path: str = None):
+        self.top_n = top_n
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.path = path
+        self._trend_detector = TrendDetector()
+        self._entries = OrderedDict()  # key -> entry, least recently used first
+        self._demand = Counter()
+        self._key_locks = {}  # key -> [lock, holders]; only while a key is being computed
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+        self.refresh_owner = path is None
+        self._seeded = bool(seed_industries)
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            conn = self._conn()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS insights (
+                    industry_key TEXT NOT NULL,
+                    business_size TEXT NOT NULL,
+                    industry TEXT NOT NULL,
+                    computed_at REAL NOT NULL,
+                    value BLOB NOT NULL,
+                    PRIMARY KEY (industry_key, business_size)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    name TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS demand (
+                    industry_key TEXT NOT NULL,
+                    business_size TEXT NOT NULL,
+                    industry TEXT NOT NULL,
+                    requests REAL NOT NULL,
+                    PRIMARY KEY (industry_key, business_size)
+                )
+            """)
+        for industry in seed_industries:
+            self._count_demand(self._key(industry, "small-medium"), industry)
+
+    @staticmethod
+    def _key(industry: str, business_size: str):
+        return " ".join(industry.lower().split()), business_size
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, industry: str, business_size: str = "small-medium") -> Dict:
+        """Insights for the industry, as returned by TrendDetector.get_industry_insights"""
+        self._ensure_refresher()
+        key = self._key(industry, business_size)
+        self._count_demand(key, industry)
+        entry = self._fresh_entry(key)
+        if entry is not None:
+            with self._lock:
+                self.hits += 1
+            return self._serve(entry, "precomputed")
+
+        with self._lock:
+            self.misses += 1
+        with self._key_lock(key):
+            # Another request (or process) may have computed it while we waited
+            entry = self._fresh_entry(key)
+            if entry is not None:
+                return self._serve(entry, "precomputed")
+            return self._serve(self._compute(key, industry, business_size), "on_demand")
+
+    def _count_demand(self, key, industry: str):
+        if not self.path:
+            with self._lock:
+                self._demand[key] += 1
+                if len(self._demand) > 4 * self.max_entries:
+                    self._demand = Counter(dict(self._demand.most_common(2 * self.max_entries)))
+            return
+        try:
+            self._conn().execute(
+                "INSERT INTO demand (industry_key, business_size, industry, requests) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT (industry_key, business_size) DO UPDATE SET requests = requests + 1",
+                (key[0], key[1], industry)
+            )
+        except Exception as e:
+            logger.error(f"Industry demand update failed: {str(e)}")
+
+    def _top_demand(self) -> List[Tuple[Tuple[str, str], str, float]]:
+        """``(key, industry, requests)`` for the ``top_n`` most requested keys"""
+        if not self.path:
+            with self._lock:
+                return [(key, self._entries[key]["industry"] if key in self._entries else key[0], count)
+                        for key, count in self._demand.most_common(self.top_n)]
+        rows = self._conn().execute(
+            "SELECT industry_key, business_size, industry, requests FROM demand ORDER BY requests DESC LIMIT ?",
+            (self.top_n,)
+        ).fetchall()
+        return [((row[0], row[1]), row[2], row[3]) for row in rows]
+
+    def _decay_demand(self):
+        """Halve every count so recent traffic dominates, dropping keys nobody asks for any more"""
+        if not self.path:
+            with self._lock:
+                for key in list(self._demand):
+                    self._demand[key] //= 2
+                self._demand += Counter()  # drop zero counts
+            return
+        conn = self._conn()
+        conn.execute("UPDATE demand SET requests = requests / 2")
+        conn.execute("DELETE FROM demand WHERE requests < 0.5")
+        conn.execute("DELETE FROM demand WHERE rowid NOT IN "
+                     "(SELECT rowid FROM demand ORDER BY requests DESC LIMIT ?)", (2 * self.max_entries,))
+
+    def _fresh_entry(self, key) -> Optional[Dict]:
+        """The entry for ``key`` if younger than max_age, checking the shared table for a newer one"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        # Memory is authoritative until another process may have refreshed the key
+        if self.path and (entry is None or now - entry["checked_at"] >= min(self.refresh_interval, self.max_age)):
+            stored = self._read(key)
+            if stored is not None and (entry is None or stored["computed_at"] > entry["computed_at"]):
+                entry = stored
+            if entry is not None:
+                entry["checked_at"] = now
+                self._remember(key, entry)
+        if entry is None or now - entry["computed_at"] >= self.max_age:
+            return None
+        return entry
+
+    @contextmanager
+    def _key_lock(self, key):
+        """Per-key lock that is dropped once nobody holds or waits for it"""
+        with self._lock:
+            holder = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            holder[1] += 1
+        try:
+            with holder[0]:
+                yield
+        finally:
+            with self._lock:
+                holder[1] -= 1
+                if holder[1] == 0:
+                    del self._key_locks[key]
+
+    def _remember(self, key, entry: Dict):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _read(self, key) -> Optional[Dict]:
+        try:
+            row = self._conn().execute(
+                "SELECT industry, computed_at, value FROM insights WHERE industry_key = ? AND business_size = ?", key
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"Industry insight read failed: {str(e)}")
+            return None
+        if row is None:
+            return None
+        return {"industry": row[0], "computed_at": row[1], "value": json.loads(zlib.decompress(row[2]))}
+
+    def _write(self, key, entry: Dict):
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO insights (industry_key, business_size, industry, computed_at, value) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key[0], key[1], entry["industry"], entry["computed_at"],
+                 zlib.compress(json.dumps(entry["value"], default=str).encode("utf-8")))
+            )
+        except Exception as e:
+            logger.error(f"Industry insight write failed: {str(e)}")
+
+    def _compute(self, key, industry: str, business_size: str) -> Dict:
+        value = self._trend_detector.get_industry_insights(industry, business_size)
+        now = time.time()
+        entry = {"value": value, "computed_at": now, "checked_at": now, "industry": industry}
+        # Fallback content is returned but never stored in place of real insights
+        if "error" not in value:
+            self._remember(key, entry)
+            if self.path:
+                self._write(key, entry)
+        return entry
+
+    def _serve(self, entry: Dict, source: str) -> Dict:
+        value = copy.deepcopy(entry["value"])
+        value["insight_source"] = source
+        value["insight_age_seconds"] = round(time.time() - entry["computed_at"], 1)
+        return value
+
+    def _ensure_refresher(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name="industry-insight-refresh",
+                                                daemon=True)
+                self._thread.start()
+
+    def _refresh_loop(self):
+        # A refresh must fetch new insights, not the cached LLM answer
+        llm_cache_bypass.set(True)
+        call_class.set("industry")
+        owner = uuid.uuid4().hex
+        if not self._seeded:
+            time.sleep(self.refresh_interval)
+        while True:
+            try:
+                self.refresh_owner = self.path is None or self._hold_lease(owner)
+                self.purge_expired()
+                if self.refresh_owner:
+                    self.refresh_top()
+            except Exception as e:
+                logger.error(f"Industry insight refresh failed: {str(e)}")
+            time.sleep(self.refresh_interval)
+
+    def _hold_lease(self, owner: str) -> bool:
+        """Take or renew the refresh lease; it outlives two missed cycles before another process takes over"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (self.LEASE_NAME,)).fetchone()
+            held = row is None or row[0] == owner or row[1] < now
+            if held:
+                conn.execute("INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                             (self.LEASE_NAME, owner, now + 2.5 * self.refresh_interval))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return held
+
+    def purge_expired(self):
+        """Drop entries older than max_age from memory and the shared table"""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry["computed_at"] < cutoff]:
+                del self._entries[key]
+        if self.path:
+            self._conn().execute("DELETE FROM insights WHERE computed_at < ?", (cutoff,))
+
+    def refresh_top(self):
+        """Recompute the most requested keys whose entry is older than the refresh interval"""
+        top = self._top_demand()
+        self._decay_demand()
+
+        due = 0
+        for key, industry, _ in top:
+            with self._key_lock(key):
+                current = self._latest(key)
+                if current is not None and time.time() - current["computed_at"] < self.refresh_interval:
+                    continue
+                due += 1
+                entry = self._compute(key, industry, key[1])
+            if "error" in entry["value"]:
+                self.refresh_failures += 1
+            else:
+                self.refreshes += 1
+        if due:
+            logger.info(f"Refreshed industry insights for {due} categories")
+
+    def _latest(self, key) -> Optional[Dict]:
+        """Newest entry for ``key`` in memory or the shared table, whatever its age"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if self.path:
+            stored = self._read(key)
+            if stored is not None and (entry is None or stored["computed_at"] > entry["computed_at"]):
+                return stored
+        return entry
+
+    def stats(self) -> Dict:
+        now = time.time()
+        try:
+            top = self._top_demand()
+        except Exception:
+            top = []
+        with self._lock:
+            return {
+                "entries": [
+                    {"industry": key[0], "business_size": key[1],
+                     "age_seconds": round(now - entry["computed_at"], 1)}
+                    for key, entry in self._entries.items()
+                ],
+                "top_demand": [
+                    {"industry": key[0], "business_size": key[1], "requests": count}
+                    for key, _, count in top
+                ],
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "evictions": self.evictions,
+                "max_entries": self.max_entries,
+                "refresh_owner": self.refresh_owner,
+                "max_age_seconds": self.max_age,
+                "refresh_interval_seconds": self.refresh_interval
+            }
+
+
+_default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data",
+                             "industry_insights.db")
+
+industry_store = IndustryInsightStore(
+    top_n=int(os.getenv("INDUSTRY_STORE_TOP_N", "20")),
+    refresh_interval=float(os.getenv("INDUSTRY_STORE_REFRESH_SECONDS", "3600")),
+    max_age=float(os.getenv("INDUSTRY_STORE_MAX_AGE", "21600")),
+    seed_industries=[name.strip() for name in os.getenv("INDUSTRY_STORE_SEED", "").split(",") if name.strip()],
+    max_entries=int(os.getenv("INDUSTRY_STORE_MAX_ENTRIES", "500")),
+    path=os.getenv("INDUSTRY_STORE_PATH", _default_path) if INDUSTRY_STORE_ENABLED else None
+)
+
+
+def get_industry_insights(industry: str, business_size: str = "small-medium") -> Dict:
+    """Stored insights, or a direct TrendDetector call when INDUSTRY_STORE_ENABLED is off"""
+    if INDUSTRY_STORE_ENABLED:
+        return industry_store.get(industry, business_size)
+    return TrendDetector().get_industry_insights(industry, business_size)
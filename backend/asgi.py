@@ -0,0 +1,193 @@
+# ASGI entrypoint - same routes and JSON as app.py, served by an async server
+#
+#   uvicorn asgi:app --host 0.0.0.0 --port 5000
+#
+# /api/ask and /api/quick-insights await their provider calls on the server's
+# event loop, so a slow ASI:One or Groq round trip holds no thread. Every
+# other route is the unchanged Flask app behind asgiref's WSGI adapter.
+import io
+import os
+import sys
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask import jsonify, request
+
+from app import app as enhanced_app
+from routes import ask_async, quick_insights_async, request_bypasses_llm_cache
+from utils.http_transport import close_async_session
+from utils.llm_cache import llm_cache_bypass
+
+logger = logging.getLogger(__name__)
+
+# Each delegated Flask request holds one of these threads until it returns,
+# an open SSE stream for as long as it is connected
+WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "64"))
+
+ASYNC_ROUTES = {
+    ("POST", "/api/ask"): ask_async,
+    ("POST", "/api/quick-insights"): quick_insights_async,
+}
+
+
+def _environ(scope: dict, body: bytes) -> dict:
+    """Minimal WSGI environ, so Flask parses the request and applies its response hooks (CORS)"""
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": "",
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        key = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if key == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif key != "CONTENT_LENGTH":
+            key = f"HTTP_{key}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+class PooledWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """WsgiToAsgiInstance running the WSGI app on the given executor"""
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(self._run_wsgi_app, thread_sensitive=False, executor=self.executor)(body)
+
+    def _run_wsgi_app(self, body):
+        """Same steps as asgiref's run_wsgi_app, on an executor thread"""
+        try:
+            environ = self.build_environ(self.scope, body)
+        except ValueError:
+            # Too many duplicate headers (asgiref versions that limit them)
+            self.sync_send({"type": "http.response.start", "status": 400,
+                            "headers": [(b"content-type", b"text/plain")]})
+            self.sync_send({"type": "http.response.body", "body": b"Bad Request: Too many duplicate headers"})
+            return
+        bytes_sent = 0
+        for output in self.wsgi_application(environ, self.start_response):
+            if not self.response_started:
+                self.response_started = True
+                self.sync_send(self.response_start)
+            # Never send more than the Content-Length the app declared
+            if self.response_content_length is not None:
+                output = output[:self.response_content_length - bytes_sent]
+            self.sync_send({"type": "http.response.body", "body": output, "more_body": True})
+            bytes_sent += len(output)
+            if bytes_sent == self.response_content_length:
+                break
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({"type": "http.response.body"})
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """
+    WsgiToAsgi on a thread pool.
+
+    asgiref runs WSGI calls with a thread-sensitive sync_to_async, i.e. one
+    at a time on a single shared thread, so one open SSE stream would stall
+    every other Flask route.
+    """
+
+    def __init__(self, wsgi_application, threads: int = WSGI_THREADS):
+        super().__init__(wsgi_application)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="asgi-wsgi")
+
+    async def __call__(self, scope, receive, send):
+        await PooledWsgiToAsgiInstance(self.wsgi_application, self.executor)(scope, receive, send)
+
+
+class AsyncRoutesApp:
+    """ASGI app awaiting the slow provider routes and delegating the rest to Flask"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = PooledWsgiToAsgi(flask_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        handler = ASYNC_ROUTES.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if handler is None:
+            await self.wsgi(scope, receive, send)
+            return
+        await self._serve(handler, scope, receive, send)
+
+    async def _serve(self, handler, scope, receive, send):
+        environ = _environ(scope, await _read_body(receive))
+        payload = None
+        with self.flask_app.request_context(environ):
+            # Set on this request's task, so the flag stays per request
+            llm_cache_bypass.set(request_bypasses_llm_cache())
+            try:
+                data = request.get_json()
+            except Exception as e:
+                logger.error(f"Async route error: {str(e)}")
+                payload, status = {"error": str(e)}, 500
+        if payload is None:
+            payload, status = await handler(data)
+
+        with self.flask_app.request_context(environ):
+            response = self.flask_app.process_response(self.flask_app.make_response((jsonify(payload), status)))
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in response.headers.items()]
+        })
+        await send({"type": "http.response.body", "body": response.get_data()})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                logger.info("🚀 ASGI mode: /api/ask and /api/quick-insights served asynchronously")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await close_async_session()
+                self.wsgi.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(flask_app=None) -> AsyncRoutesApp:
+    """Wrap an app from app.create_enhanced_app (the module-level one by default)"""
+    return AsyncRoutesApp(flask_app or enhanced_app)
+
+
+app = create_asgi_app()
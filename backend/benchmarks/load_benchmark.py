@@ -0,0 +1,303 @@
+"""
+Offline load benchmark for /api/ask, /api/quick-insights and /api/analyze.
+
+Starts the stub providers from stub_providers.py, points the backend at
+them through ASI1_URL / GROQ_URL / ANTHROPIC_URL / NEWS_API_URL, then
+drives the real Flask app with its test client from concurrent threads.
+Nothing leaves 127.0.0.1. Caches, the job store and rate-limit state go
+to a temporary directory; caches are off unless --caches on.
+
+Reports throughput, p50/p95/p99 latency and errors per endpoint, plus the
+memory an analysis job allocates at peak and retains afterwards. Results
+are written as JSON (tagged with the git commit) so runs can be compared:
+
+    python benchmarks/load_benchmark.py --requests 50 --concurrency 8
+    python benchmarks/load_benchmark.py --set asi1.latency_ms.median=1500 --set groq.error_rate=0.2
+    python benchmarks/load_benchmark.py --compare benchmarks/results/<previous>.json
+"""
+import os
+import sys
+import gc
+import json
+import math
+import time
+import argparse
+import tempfile
+import platform
+import threading
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_providers import StubProviders, apply_setting, merge_profiles  # noqa: E402
+
+SCENARIOS = ("ask", "quick-insights", "analyze")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest-rank percentile
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies, errors: int, wall: float) -> dict:
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else 0.0,
+        "wall_seconds": round(wall, 3),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies, default=0) * 1000, 1)
+        }
+    }
+
+
+def configure_environment(stubs: StubProviders, workdir: str, caches: bool):
+    """Fake keys, stub URLs and throwaway state; must run before the app is imported"""
+    os.environ.update(stubs.env())
+    os.environ.update({
+        "ASI1_API_KEY": "bench-asi1",
+        "GROQ_API_KEY": "bench-groq",
+        "ANTHROPIC_API_KEY": "bench-anthropic",
+        "NEWS_API_KEY": "bench-news",
+        "AGENTVERSE_API_KEY": "bench-agentverse",
+        "NO_PROXY": "127.0.0.1,localhost",
+        "no_proxy": "127.0.0.1,localhost",
+        "JOB_STORE_PATH": os.path.join(workdir, "analysis_jobs.db"),
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.db"),
+        "SCRAPE_CACHE_PATH": os.path.join(workdir, "scrape_cache.db"),
+        "RATE_LIMIT_PATH": os.path.join(workdir, "rate_limits.db"),
+        # Provider quotas would measure the limiter, not the app
+        "RATE_LIMIT_ENABLED": "false",
+    })
+    if not caches:
+        os.environ.update({
+            "LLM_CACHE_ENABLED": "false",
+            "SCRAPE_CACHE_ENABLED": "false",
+            "INDUSTRY_STORE_ENABLED": "false",
+            "NEWS_CACHE_TTL": "0",
+        })
+
+
+def run_requests(count: int, concurrency: int, call) -> dict:
+    """Run ``call(i)`` ``count`` times on ``concurrency`` threads; call returns True on success"""
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            ok = call(i)
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(count)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+class Driver:
+    """Endpoint calls through the Flask test client (one client per thread)"""
+
+    def __init__(self, app, stubs: StubProviders, run_id: str, poll_interval: float, job_timeout: float):
+        self.app = app
+        self.stubs = stubs
+        self.run_id = run_id
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+        self._local = threading.local()
+
+    @property
+    def client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client
+
+    def ask(self, i: int) -> bool:
+        response = self.client.post("/api/ask", json={
+            "question": f"How can business {self.run_id}-{i} grow repeat sales?"})
+        return response.status_code == 200 and response.get_json().get("status") == "success"
+
+    def quick_insights(self, i: int) -> bool:
+        response = self.client.post("/api/quick-insights", json={
+            "business_info": f"Bakery {self.run_id}-{i}, downtown, 6 staff",
+            "question": "What are quick marketing opportunities?"})
+        return response.status_code == 200
+
+    def analyze(self, i: int) -> bool:
+        name = f"Bench Business {self.run_id}-{i}"
+        response = self.client.post("/api/analyze", json={
+            "name": name,
+            "categories": ["bakery", "restaurant", "retail", "fitness"][i % 4],
+            "website": self.stubs.website_url(f"{self.run_id}-{i}")})
+        if response.status_code != 200:
+            return False
+        job_id = response.get_json()["jobId"]
+        deadline = time.monotonic() + self.job_timeout
+        while time.monotonic() < deadline:
+            status = self.client.get(f"/api/analyze/{job_id}/status").get_json()["status"]
+            if status == "completed":
+                return self.client.get(f"/api/analyze/{job_id}/results").status_code == 200
+            if status == "failed":
+                return False
+            time.sleep(self.poll_interval)
+        return False
+
+
+def measure_job_memory(driver: Driver, jobs: int) -> dict:
+    """Peak and retained Python heap per analysis job, one job at a time under tracemalloc"""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    peaks, completed = [], 0
+    for i in range(jobs):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        completed += int(driver.analyze(10_000 + i))
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    result = {
+        "jobs": jobs,
+        "completed": completed,
+        "peak_kb_per_job": round(sum(peaks) / len(peaks) / 1024, 1) if peaks else 0.0,
+        "max_peak_kb": round(max(peaks, default=0) / 1024, 1),
+        "retained_kb_per_job": round(retained / max(jobs, 1) / 1024, 1)
+    }
+    try:
+        import resource
+        scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+        result["process_max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20, 1)
+    except ImportError:
+        pass
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(previous: dict, current: dict):
+    """Print relative change per scenario; positive latency deltas are regressions"""
+    print(f"\nCompared with {previous.get('commit', '?')} ({previous.get('timestamp', '?')}):")
+    for name, now in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        parts = []
+        for label, old, new in [("rps", before["throughput_rps"], now["throughput_rps"])] + [
+                (key, before["latency_ms"][key], now["latency_ms"][key]) for key in ("p50", "p95", "p99")]:
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            parts.append(f"{label} {old} -> {new} ({change})")
+        print(f"  {name:15s} " + ", ".join(parts))
+    before, now = previous.get("memory", {}), current.get("memory", {})
+    if before and now:
+        print(f"  {'memory':15s} peak/job {before['peak_kb_per_job']} -> {now['peak_kb_per_job']} KB, "
+              f"retained/job {before['retained_kb_per_job']} -> {now['retained_kb_per_job']} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--memory-jobs", type=int, default=5, help="sequential analysis jobs under tracemalloc")
+    parser.add_argument("--caches", choices=("off", "on"), default="off")
+    parser.add_argument("--profile", help="JSON file of stub profile overrides, e.g. {\"asi1\": {\"error_rate\": 0.1}}")
+    parser.add_argument("--set", action="append", default=[], metavar="PROVIDER.KEY=VALUE",
+                        help="single profile override, e.g. groq.latency_ms.median=800 (repeatable)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--job-timeout", type=float, default=120)
+    parser.add_argument("--output", help="result file (default benchmarks/results/load-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="previous result file to diff against")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    overrides = {}
+    if args.profile:
+        with open(args.profile) as f:
+            overrides = json.load(f)
+    for setting in args.set:
+        apply_setting(overrides, setting)
+    profiles = merge_profiles(overrides)
+
+    stubs = StubProviders(profiles, seed=args.seed).start()
+    workdir = tempfile.mkdtemp(prefix="marketforge-bench-")
+    configure_environment(stubs, workdir, caches=args.caches == "on")
+
+    import logging
+    logging.disable(logging.ERROR)  # injected provider errors would flood the output
+    from app import app  # noqa: E402  (reads the environment configured above)
+
+    driver = Driver(app, stubs, run_id=str(int(time.time())), poll_interval=0.05, job_timeout=args.job_timeout)
+    calls = {"ask": driver.ask, "quick-insights": driver.quick_insights, "analyze": driver.analyze}
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "caches": args.caches,
+            "seed": args.seed,
+            "provider_client_mode": os.getenv("PROVIDER_CLIENT_MODE", "sync"),
+            "analysis_workers": int(os.getenv("ANALYSIS_WORKERS", "4")),
+            "profiles": profiles
+        },
+        "scenarios": {}
+    }
+    try:
+        for name in scenarios:
+            print(f"Running {name}: {args.requests} requests, concurrency {args.concurrency}")
+            results["scenarios"][name] = run_requests(args.requests, args.concurrency, calls[name])
+        if "analyze" in scenarios and args.memory_jobs > 0:
+            print(f"Measuring memory over {args.memory_jobs} analysis jobs")
+            results["memory"] = measure_job_memory(driver, args.memory_jobs)
+        results["stub_requests"] = stubs.state.counters
+    finally:
+        stubs.stop()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{results['commit']}-{int(time.time())}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps({"scenarios": results["scenarios"], "memory": results.get("memory")}, indent=2))
+    print(f"Saved {output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
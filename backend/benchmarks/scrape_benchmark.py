@@ -0,0 +1,95 @@
+"""
+Compare the streaming page extractor with the original BeautifulSoup path.
+
+Builds synthetic marketing pages (large inline scripts, mega-menus, long
+body copy), then times both extractors on the same bytes and reports how
+much of each page the streaming path actually had to read.
+
+    python benchmarks/scrape_benchmark.py [--runs 20]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.web_scraper import SCRAPE_CHUNK_BYTES, SCRAPE_MAX_BYTES, extract_summary_soup, extract_summary_streaming  # noqa: E402
+
+
+def build_page(script_kb: int, menu_items: int, paragraphs: int) -> bytes:
+    scripts = "".join(
+        f"<script>window.__chunk{i} = {json.dumps('x' * 1024)};</script>\n" for i in range(script_kb)
+    )
+    menu = "".join(f'<li><a href="/p/{i}">Product {i}</a></li>' for i in range(menu_items))
+    body = "".join(
+        f"<p>Paragraph {i}: our artisan bakery serves fresh bread, cakes and coffee every morning.  "
+        f"Visit   us\n   downtown.</p>\n" for i in range(paragraphs)
+    )
+    html = f"""<!DOCTYPE html>
+<html><head>
+<meta charset="utf-8">
+<title>  Sunrise Bakery &amp; Cafe </title>
+<meta name="description" content="Fresh bread and pastries baked daily.">
+<style>{'body{margin:0}' * 2000}</style>
+{scripts}
+</head><body>
+<nav><ul>{menu}</ul></nav>
+<main>{body}</main>
+</body></html>"""
+    return html.encode("utf-8")
+
+
+PAGES = {
+    "small": build_page(script_kb=20, menu_items=50, paragraphs=50),
+    "marketing": build_page(script_kb=400, menu_items=500, paragraphs=2000),
+    "huge": build_page(script_kb=2000, menu_items=2000, paragraphs=10000),
+}
+
+
+def chunked(content: bytes):
+    for start in range(0, len(content), SCRAPE_CHUNK_BYTES):
+        yield content[start:start + SCRAPE_CHUNK_BYTES]
+
+
+def time_it(fn, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - started) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        import bs4  # noqa: F401
+        have_soup = True
+    except ImportError:
+        have_soup = False
+        print("bs4 not installed; timing the streaming extractor only")
+
+    results = {}
+    for name, content in PAGES.items():
+        summary, bytes_read = extract_summary_streaming(chunked(content), "text/html; charset=utf-8")
+        entry = {
+            "page_bytes": len(content),
+            "stream_bytes_read": bytes_read,
+            # Capped pages are cut off before their body text, so summaries differ
+            "capped": bytes_read >= SCRAPE_MAX_BYTES,
+            "stream_ms": round(time_it(lambda: extract_summary_streaming(chunked(content)), args.runs), 2),
+        }
+        if have_soup:
+            expected = extract_summary_soup(content)
+            entry["soup_ms"] = round(time_it(lambda: extract_summary_soup(content), args.runs), 2)
+            entry["same_summary"] = summary == expected
+        results[name] = entry
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
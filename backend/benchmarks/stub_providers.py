@@ -0,0 +1,246 @@
+"""
+Local stand-ins for the upstream services used by the backend.
+
+One threaded HTTP server on 127.0.0.1 answers in each provider's wire
+format under its own path prefix:
+
+    /asi1/v1/chat/completions           ASI:One (OpenAI-style)
+    /groq/openai/v1/chat/completions    Groq (OpenAI-style)
+    /anthropic/v1/messages              Anthropic messages
+    /newsapi/v2/everything              NewsAPI
+    /site/<anything>                    a business website
+
+Every provider has a profile with a log-normal latency distribution, an
+error rate and a log-normal payload size, so runs are reproducible for a
+given seed but still have realistic tails.
+"""
+import copy
+import json
+import sys
+import math
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+# latency_ms / payload: {"median": ..., "sigma": ...} of a log-normal distribution.
+# payload is characters of completion text, articles per NewsAPI response,
+# or KB of HTML for the website.
+DEFAULT_PROFILES = {
+    "asi1": {"latency_ms": {"median": 400, "sigma": 0.5}, "error_rate": 0.02, "error_status": 500,
+             "payload": {"median": 3000, "sigma": 0.4}},
+    "groq": {"latency_ms": {"median": 120, "sigma": 0.6}, "error_rate": 0.02, "error_status": 503,
+             "payload": {"median": 1200, "sigma": 0.3}},
+    "anthropic": {"latency_ms": {"median": 300, "sigma": 0.5}, "error_rate": 0.02, "error_status": 529,
+                  "payload": {"median": 2500, "sigma": 0.4}},
+    "newsapi": {"latency_ms": {"median": 80, "sigma": 0.4}, "error_rate": 0.01, "error_status": 500,
+                "payload": {"median": 8, "sigma": 0.3}},
+    "website": {"latency_ms": {"median": 60, "sigma": 0.7}, "error_rate": 0.05, "error_status": 503,
+                "payload": {"median": 120, "sigma": 0.8}},
+}
+
+PATHS = {
+    "asi1": "/asi1/v1/chat/completions",
+    "groq": "/groq/openai/v1/chat/completions",
+    "anthropic": "/anthropic/v1/messages",
+    "newsapi": "/newsapi/v2/everything",
+    "website": "/site/",
+}
+
+SECTION_TITLES = ["Executive Summary", "Key Opportunities", "Marketing Strategy", "Competitive Position",
+                  "Risks", "Action Plan", "ROI Estimates"]
+
+SENTENCE = ("Focus on local search visibility and repeat customers to lift monthly revenue by 12-18% "
+            "within two quarters while keeping acquisition costs flat. ")
+
+
+def merge_profiles(overrides: Dict) -> Dict:
+    """DEFAULT_PROFILES with ``overrides`` applied one provider key at a time"""
+    profiles = copy.deepcopy(DEFAULT_PROFILES)
+    for provider, values in (overrides or {}).items():
+        if provider not in profiles:
+            raise ValueError(f"Unknown stub provider '{provider}'")
+        for key, value in values.items():
+            if isinstance(value, dict):
+                profiles[provider][key].update(value)
+            else:
+                profiles[provider][key] = value
+    return profiles
+
+
+def apply_setting(overrides: Dict, setting: str):
+    """Parse ``provider.key[.subkey]=value`` (e.g. ``asi1.latency_ms.median=900``) into ``overrides``"""
+    path, _, raw = setting.partition("=")
+    parts = path.split(".")
+    if not raw or len(parts) not in (2, 3):
+        raise ValueError(f"Expected provider.key[.subkey]=value, got '{setting}'")
+    target = overrides.setdefault(parts[0], {})
+    if len(parts) == 3:
+        target = target.setdefault(parts[1], {})
+    target[parts[-1]] = float(raw)
+
+
+def completion_text(chars: int) -> str:
+    """Structured markdown answer of roughly ``chars`` characters"""
+    per_section = max(1, chars // len(SECTION_TITLES))
+    sections = []
+    for title in SECTION_TITLES:
+        body = (SENTENCE * (per_section // len(SENTENCE) + 1))[:per_section]
+        sections.append(f"## {title}\n- {body.strip()}\n")
+    return "\n".join(sections)[:max(chars, 1)]
+
+
+def news_articles(count: int, query: str):
+    published = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return [{
+        "source": {"id": None, "name": f"Stub Wire {i % 4}"},
+        "author": "Benchmark",
+        "title": f"{query.title()} businesses see growth in segment {i}",
+        "description": SENTENCE,
+        "url": f"https://news.invalid/{query}/{i}",
+        "publishedAt": published,
+        "content": SENTENCE * 3
+    } for i in range(count)]
+
+
+def website_html(kb: int, path: str) -> bytes:
+    paragraph = f"<p>{SENTENCE}</p>\n"
+    body = paragraph * max(1, kb * 1024 // len(paragraph))
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Stub Business {path}</title>"
+            f"<meta name=\"description\" content=\"Benchmark business site {path}\">"
+            f"<script>{'var x=1;' * 512}</script></head><body><main>{body}</main></body></html>").encode("utf-8")
+
+
+class StubState:
+    """Profiles, seeded randomness and per-provider counters shared by handler threads"""
+
+    def __init__(self, profiles: Dict, seed: int):
+        self.profiles = profiles
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {name: {"requests": 0, "errors": 0, "bytes": 0} for name in profiles}
+
+    def _lognormal(self, spec: Dict) -> float:
+        with self._lock:
+            gauss = self._random.gauss(0, 1)
+        return spec["median"] * math.exp(spec["sigma"] * gauss)
+
+    def draw(self, provider: str):
+        """(latency seconds, failed, payload size) for one request"""
+        profile = self.profiles[provider]
+        latency = self._lognormal(profile["latency_ms"]) / 1000
+        with self._lock:
+            failed = self._random.random() < profile["error_rate"]
+        return latency, failed, max(1, int(self._lognormal(profile["payload"])))
+
+    def count(self, provider: str, failed: bool, size: int):
+        with self._lock:
+            counters = self.counters[provider]
+            counters["requests"] += 1
+            counters["errors"] += int(failed)
+            counters["bytes"] += size
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _provider(self):
+        for name, prefix in PATHS.items():
+            if self.path.startswith(prefix):
+                return name
+        return None
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request_body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        provider = self._provider()
+        if provider is None:
+            self._send(404, b'{"error": "unknown stub path"}', "application/json")
+            return
+
+        latency, failed, size = self.state.draw(provider)
+        time.sleep(latency)
+        profile = self.state.profiles[provider]
+        if failed:
+            body = json.dumps({"error": {"message": f"stub {provider} failure"}}).encode("utf-8")
+            self.state.count(provider, True, len(body))
+            self._send(int(profile["error_status"]), body, "application/json")
+            return
+
+        if provider == "website":
+            body, content_type = website_html(size, self.path), "text/html; charset=utf-8"
+        else:
+            payload = self._payload(provider, size, request_body)
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        self.state.count(provider, False, len(body))
+        self._send(200, body, content_type)
+
+    def _payload(self, provider: str, size: int, request_body: Dict) -> Dict:
+        if provider == "newsapi":
+            query = self.path.partition("q=")[2].split("&")[0] or "business"
+            articles = news_articles(size, query)
+            return {"status": "ok", "totalResults": len(articles), "articles": articles}
+        text = completion_text(size)
+        if provider == "anthropic":
+            return {"id": "msg_stub", "type": "message", "role": "assistant",
+                    "content": [{"type": "text", "text": text}], "model": request_body.get("model")}
+        return {"id": "chatcmpl-stub", "object": "chat.completion", "model": request_body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}]}
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The streaming scraper hangs up once it has enough of a page
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class StubProviders:
+    """Run the stub server on a background thread; ``env()`` points the backend at it"""
+
+    def __init__(self, profiles: Dict = None, seed: int = 1):
+        self.state = StubState(profiles or copy.deepcopy(DEFAULT_PROFILES), seed)
+        handler = type("BoundStubHandler", (StubHandler,), {"state": self.state})
+        self.server = StubServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stub-providers", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def env(self) -> Dict[str, str]:
+        return {
+            "ASI1_URL": self.base_url + PATHS["asi1"],
+            "GROQ_URL": self.base_url + PATHS["groq"],
+            "ANTHROPIC_URL": self.base_url + PATHS["anthropic"],
+            "NEWS_API_URL": self.base_url + PATHS["newsapi"],
+        }
+
+    def website_url(self, name: str) -> str:
+        return f"{self.base_url}{PATHS['website']}{name}"
@@ -0,0 +1,21 @@
+import os
+import tempfile
+
+# Throwaway state and fake keys; routes read these at import time
+_workdir = tempfile.mkdtemp(prefix="marketforge-tests-")
+os.environ.update({
+    "ASI1_API_KEY": "test-asi1",
+    "GROQ_API_KEY": "test-groq",
+    "ANTHROPIC_API_KEY": "test-anthropic",
+    "NEWS_API_KEY": "test-news",
+    "AGENTVERSE_API_KEY": "test-agentverse",
+    "JOB_STORE_PATH": os.path.join(_workdir, "analysis_jobs.db"),
+    "JOB_STORE_SPILL_DIR": _workdir,
+    "LLM_CACHE_PATH": os.path.join(_workdir, "llm_cache.db"),
+    "SCRAPE_CACHE_PATH": os.path.join(_workdir, "scrape_cache.db"),
+    "RATE_LIMIT_PATH": os.path.join(_workdir, "rate_limits.db"),
+    "RATE_LIMIT_ENABLED": "false",
+    "LLM_CACHE_ENABLED": "false",
+    "SCRAPE_CACHE_ENABLED": "false",
+    "INDUSTRY_STORE_ENABLED": "false",
+})
@@ -1,20 +1,37 @@
 # Enhanced routes.py - Building on your existing codebase
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 import os
+import asyncio
 import logging
+import contextvars
+import copy
 import uuid
 import json
 from datetime import datetime
-import requests
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import time
 import re
-from bs4 import BeautifulSoup
 
 # Import your existing modules
-from agents.asi1_client import ask_asi1  # Your existing ASI1 integration
-from agents.agentverse_client import create_agent, chat_with_agent  # Your existing agent code
+from agents.asi1_client import ask_asi1, ask_asi1_async  # Your existing ASI1 integration
+from agents.agentverse_client import create_agent, chat_with_agent, stop_agent  # Your existing agent code
+from agents.agent_runtime import AgentCapacityError, get_agent_runtime
 from agents.trend_detector import TrendDetector  # Enhanced version
+from agents.industry_insight_store import get_industry_insights, industry_store
+from utils.job_scheduler import JobScheduler, QueueFullError, PRIORITIES
+from utils.job_store import create_job_store
+from utils.cache import TTLCache
+from utils.metrics import registry as metrics_registry
+from utils.http_transport import http_post, async_request, call_class, request_deadline, transport_stats
+from utils.event_loop import ASYNC_PROVIDERS, run_sync
+from utils.scrape_cache import get_page_summary, scrape_cache
+from utils.ai_extraction import extract_analysis_sections
+from utils.result_model import ALL_FIELDS, compact_results, parse_fields, project_results
+from utils.circuit_breaker import breaker_stats
+from utils.rate_limiter import rate_limiter, request_tokens
+from utils.hedging import LatencyTracker, HedgeStats, hedged_call
+from utils.context_compactor import compact_analysis_context, estimate_tokens
+from utils.llm_cache import llm_cache, llm_cache_bypass, make_cache_key, use_llm_cache
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -22,8 +39,71 @@ logger = logging.getLogger(__name__)
 # Create blueprint for routes
 api = Blueprint('api', __name__)
 
-# In-memory storage for jobs (enhance this with your Supabase later)
-analysis_jobs = {}
+# Job storage shared across worker processes (JOB_STORE_BACKEND=sqlite|memory)
+job_store = create_job_store()
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+
+# One scheduler for the whole process: bounded workers and queue for analysis jobs
+job_scheduler = JobScheduler(
+    workers=ANALYSIS_WORKERS,
+    max_queue=int(os.getenv("ANALYSIS_QUEUE_SIZE", "100"))
+)
+
+# Website, news, industry and competitor
+GATHER_STAGES_PER_JOB = 4
+
+# Shared pool for the independent data-gathering stages of an analysis job,
+# sized so every running job's stages start right away
+gather_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GATHER_MAX_WORKERS", str(ANALYSIS_WORKERS * GATHER_STAGES_PER_JOB))),
+    thread_name_prefix="gather"
+)
+
+# Per-stage timeouts (seconds) for the concurrent gather stage
+GATHER_STAGE_TIMEOUTS = {
+    "website": float(os.getenv("GATHER_TIMEOUT_WEBSITE", "15")),
+    "news": float(os.getenv("GATHER_TIMEOUT_NEWS", "15")),
+    "industry": float(os.getenv("GATHER_TIMEOUT_INDUSTRY", "90")),
+    "competitor": float(os.getenv("GATHER_TIMEOUT_COMPETITOR", "90")),
+}
+
+STAGE_DURATION = metrics_registry.histogram(
+    "marketforge_analysis_stage_seconds",
+    "Duration of each analysis stage (website, news, industry, competitor, analysis, extraction)",
+    labels=("stage", "outcome")
+)
+JOB_DURATION = metrics_registry.histogram(
+    "marketforge_analysis_job_seconds",
+    "End-to-end duration of analysis jobs once they start running",
+    labels=("outcome",)
+)
+JOB_OUTCOMES = metrics_registry.counter(
+    "marketforge_analysis_jobs_total",
+    "Finished analysis jobs by outcome",
+    labels=("outcome",)
+)
+
+# Largest batch accepted by POST /api/analyze/batch
+BATCH_MAX_BUSINESSES = int(os.getenv("BATCH_MAX_BUSINESSES", "100"))
+
+# Batch records share the job store under their own key prefix, so a batch id
+# is never found (or streamed forever) by the per-job endpoints
+BATCH_KEY_PREFIX = "batch:"
+# How long a batch keeps its shared per-category stage results
+BATCH_SHARED_TTL = float(os.getenv("BATCH_SHARED_TTL", "3600"))
+
+# /quick-insights provider strategy: "hedged" (start ASI:One once Groq is
+# slower than its recent p90), "race" (both at once) or "sequential" (Groq,
+# then ASI:One only after a Groq failure)
+QUICK_INSIGHTS_MODE = os.getenv("QUICK_INSIGHTS_MODE", "hedged").lower()
+QUICK_INSIGHTS_DEADLINE = float(os.getenv("QUICK_INSIGHTS_DEADLINE", "20"))
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "90"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "2.0"))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.3"))
+
+groq_latency = LatencyTracker()
+quick_insights_hedging = HedgeStats()
 
 def scrape_website_info(url: str) -> str:
     """Scrape basic info from website"""
@@ -31,28 +111,16 @@ def scrape_website_info(url: str) -> str:
         if not url.startswith('http'):
             url = f"https://{url}"
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        page = get_page_summary(url)
         
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title and meta description
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else ""
-            
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            desc_text = meta_desc.get('content', '').strip() if meta_desc else ""
-            
-            # Extract some text content (clean it up)
-            for script in soup(["script", "style"]):
-                script.decompose()
-            text_content = soup.get_text()
-            lines = (line.strip() for line in text_content.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text_content = ' '.join(chunk for chunk in chunks if chunk)[:500]
+        if page["error"]:
+            logger.error(f"Website scraping error: {page['error']}")
+            return f"Website analysis failed: {page['error']}"
+        if page["status_code"] == 200:
+            summary = page["summary"]
+            title_text = summary["title"]
+            desc_text = summary["description"]
+            text_content = summary["text"]
             
             # Extract keywords from content
             keywords = []
@@ -72,13 +140,84 @@ Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}"""
             
             return result
         else:
-            logger.warning(f"Website returned status {response.status_code}")
-            return f"Website analysis failed: HTTP {response.status_code}"
+            logger.warning(f"Website returned status {page['status_code']}")
+            return f"Website analysis failed: HTTP {page['status_code']}"
         
     except Exception as e:
-        logger.error(f"Enhanced agent creation error: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Website scraping error: {str(e)}")
+        return f"Website analysis failed: {str(e)}"
+
+
+def _run_stage(name: str, fn, timeout: float, state: dict):
+    # Runs inside the stage's copied context, so the deadline and call class stay per stage
+    state["started"] = time.monotonic()
+    request_deadline.set(state["started"] + timeout)
+    call_class.set(name)
+    return fn()
+
+
+def run_gather_stages(stages: list, on_stage_done=None) -> dict:
+    """Run independent stages concurrently, each bounded by its own timeout.
+
+    ``stages`` is a list of ``(name, fn, timeout, fallback)`` tuples. Returns
+    ``{name: result}``; a stage that raises or exceeds its timeout yields its
+    fallback instead. A stage's clock starts when a pool thread picks it up,
+    and its provider calls are capped by the same deadline so abandoned
+    work frees the thread. ``on_stage_done(name, ok, result)`` is called
+    from the calling thread as each stage settles.
+    """
+    futures = {}
+    for name, fn, timeout, fallback in stages:
+        # Each stage runs in the caller's context (e.g. LLM cache bypass flag)
+        context = contextvars.copy_context()
+        state = {"started": None}
+        futures[gather_executor.submit(context.run, _run_stage, name, fn, timeout, state)] = (name, timeout, fallback, state)
+
+    def deadline(future):
+        _, timeout, _, state = futures[future]
+        return state["started"] + timeout if state["started"] is not None else None
 
+    def elapsed(future, now):
+        started = futures[future][3]["started"]
+        return now - started if started is not None else 0.0
+
+    results = {}
+    pending = set(futures)
+    while pending:
+        deadlines = [d for d in map(deadline, pending) if d is not None]
+        # Stages still waiting for a thread have no deadline yet; look again shortly
+        wait_for = min(deadlines) - time.monotonic() if deadlines else 0.5
+        if len(deadlines) < len(pending):
+            wait_for = min(wait_for, 0.5)
+        done, pending = wait(pending, timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+
+        now = time.monotonic()
+        for future in done:
+            name, _, fallback, _ = futures[future]
+            try:
+                results[name] = future.result()
+                ok = True
+            except Exception as e:
+                logger.error(f"Gather stage '{name}' failed: {str(e)}")
+                results[name] = fallback
+                ok = False
+            STAGE_DURATION.observe(elapsed(future, now), stage=name, outcome="ok" if ok else "error")
+            if on_stage_done:
+                on_stage_done(name, ok, results[name])
+
+        # Give up on anything past its own deadline; its provider calls are
+        # capped by the same deadline, so the thread is released soon after
+        now = time.monotonic()
+        for future in [f for f in pending if deadline(f) is not None and deadline(f) <= now]:
+            name, _, fallback, _ = futures[future]
+            pending.discard(future)
+            logger.warning(f"Gather stage '{name}' timed out")
+            STAGE_DURATION.observe(elapsed(future, now), stage=name, outcome="timeout")
+            results[name] = fallback
+            if on_stage_done:
+                on_stage_done(name, False, fallback)
+
+    return results
 
 
 # Register all routes
@@ -88,8 +227,16 @@ def register_enhanced_routes(app):
     logger.info("Enhanced routes registered - building on your existing codebase")
 
 # Enhanced Multi-AI Client that works with your existing ASI1 integration
+GROQ_URL = os.getenv('GROQ_URL', 'https://api.groq.com/openai/v1/chat/completions')
+ANTHROPIC_URL = os.getenv('ANTHROPIC_URL', 'https://api.anthropic.com/v1/messages')
+
 class EnhancedAIClient:
-    """Enhanced AI client that builds on your existing ASI1 integration"""
+    """Enhanced AI client that builds on your existing ASI1 integration
+
+    Every provider call has a blocking and an ``*_async`` variant. With
+    PROVIDER_CLIENT_MODE=async the blocking methods are a thin facade over
+    the async ones running on the shared background event loop.
+    """
     
     def __init__(self):
         self.groq_api_key = os.getenv('GROQ_API_KEY')
@@ -98,366 +245,282 @@ class EnhancedAIClient:
         logger.info("Enhanced AI Client initialized")
         logger.info(f"Groq available: {bool(self.groq_api_key)}")
         logger.info(f"Anthropic available: {bool(self.anthropic_api_key)}")
+        logger.info(f"Provider client mode: {'async' if ASYNC_PROVIDERS else 'sync'}")
     
-    def ask_asi1_enhanced(self, prompt: str):
+    def ask_asi1_enhanced(self, prompt: str, cache: bool = None):
         """Use your existing ASI1 integration with enhancements"""
+        if ASYNC_PROVIDERS:
+            return run_sync(self.ask_asi1_enhanced_async(prompt, cache=cache))
         try:
             # Use your existing ask_asi1 function
-            response = ask_asi1(prompt)
-            return {
-                "response": response,
-                "provider": "ASI1",
-                "status": "success"
-            }
+            response = ask_asi1(prompt, cache=cache)
+            return self._asi1_result(response)
         except Exception as e:
-            logger.error(f"ASI1 error: {str(e)}")
-            return {
-                "response": f"ASI1 error: {str(e)}",
-                "provider": "ASI1", 
-                "status": "error"
-            }
+            return self._asi1_error(e)
+
+    async def ask_asi1_enhanced_async(self, prompt: str, cache: bool = None):
+        try:
+            response = await ask_asi1_async(prompt, cache=cache)
+            return self._asi1_result(response)
+        except Exception as e:
+            return self._asi1_error(e)
+
+    def _asi1_result(self, response: str):
+        return {
+            "response": response,
+            "provider": "ASI1",
+            "status": "success"
+        }
+
+    def _asi1_error(self, e: Exception):
+        logger.error(f"ASI1 error: {str(e)}")
+        return {
+            "response": f"ASI1 error: {str(e)}",
+            "provider": "ASI1", 
+            "status": "error"
+        }
     
-    def ask_groq_fast(self, prompt: str, max_tokens: int = 1000):
+    def ask_groq_fast(self, prompt: str, max_tokens: int = 1000, cache: bool = None):
         """Fast processing with Groq"""
         if not self.groq_api_key:
-            return {
-                "response": "Groq API key not configured",
-                "provider": "Groq",
-                "status": "not_configured"
-            }
+            return self._not_configured("Groq")
+        if ASYNC_PROVIDERS:
+            return run_sync(self.ask_groq_fast_async(prompt, max_tokens, cache=cache))
         
+        headers, data = self._groq_request(prompt, max_tokens)
+
+        def fetch():
+            try:
+                response = http_post(GROQ_URL, headers=headers, json=data, timeout=20, provider="groq",
+                                     api_key=self.groq_api_key, tokens=self._request_tokens(data))
+                return self._groq_result(response.status_code,
+                                         response.json() if response.status_code == 200 else None)
+            except Exception as e:
+                return self._provider_error("Groq", e)
+
+        if not use_llm_cache(cache, data.get('temperature')):
+            return fetch()
+        return llm_cache.get_or_compute(self._cache_key("groq", data), fetch, should_cache=self._is_success)
+
+    async def ask_groq_fast_async(self, prompt: str, max_tokens: int = 1000, cache: bool = None):
+        if not self.groq_api_key:
+            return self._not_configured("Groq")
+        headers, data = self._groq_request(prompt, max_tokens)
+        use_cache = use_llm_cache(cache, data.get('temperature'))
+        if use_cache:
+            key = self._cache_key("groq", data)
+            cached = await asyncio.to_thread(llm_cache.lookup, key)
+            if cached is not None:
+                return cached
         try:
-            headers = {
-                'Authorization': f'Bearer {self.groq_api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            data = {
-                'model': 'llama3-70b-8192',
-                'messages': [{'role': 'user', 'content': prompt}],
-                'max_tokens': max_tokens,
-                'temperature': 0.5
-            }
-            
-            response = requests.post('https://api.groq.com/openai/v1/chat/completions', 
-                                   headers=headers, json=data, timeout=20)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "response": result['choices'][0]['message']['content'],
-                    "provider": "Groq",
-                    "status": "success"
-                }
-            else:
-                return {
-                    "response": f"Groq API error: {response.status_code}",
-                    "provider": "Groq",
-                    "status": "error"
-                }
-                
+            status, body = await async_request("POST", GROQ_URL, headers=headers, json=data, timeout=20,
+                                               provider="groq", api_key=self.groq_api_key,
+                                               tokens=self._request_tokens(data))
+            result = self._groq_result(status, body)
         except Exception as e:
-            logger.error(f"Groq request failed: {str(e)}")
+            return self._provider_error("Groq", e)
+        if use_cache and self._is_success(result):
+            await asyncio.to_thread(llm_cache.set, key, result)
+        return result
+
+    @staticmethod
+    def _cache_key(provider: str, data: dict) -> str:
+        return make_cache_key(provider, data['model'], data['messages'],
+                              data.get('temperature'), data['max_tokens'])
+
+    @staticmethod
+    def _request_tokens(data: dict) -> int:
+        return request_tokens(data['messages'], data['max_tokens'])
+
+    @staticmethod
+    def _is_success(result: dict) -> bool:
+        return result.get("status") == "success"
+
+    def _groq_request(self, prompt: str, max_tokens: int):
+        headers = {
+            'Authorization': f'Bearer {self.groq_api_key}',
+            'Content-Type': 'application/json'
+        }
+        
+        data = {
+            'model': 'llama3-70b-8192',
+            'messages': [{'role': 'user', 'content': prompt}],
+            'max_tokens': max_tokens,
+            'temperature': 0.5
+        }
+        return headers, data
+
+    def _groq_result(self, status_code: int, result):
+        if status_code == 200:
             return {
-                "response": f"Groq error: {str(e)}",
+                "response": result['choices'][0]['message']['content'],
                 "provider": "Groq",
-                "status": "error"
+                "status": "success"
             }
+        return {
+            "response": f"Groq API error: {status_code}",
+            "provider": "Groq",
+            "status": "error"
+        }
     
     def ask_anthropic_strategic(self, prompt: str, max_tokens: int = 2000):
         """Strategic analysis with Anthropic"""
         if not self.anthropic_api_key:
-            return {
-                "response": "Anthropic API key not configured",
-                "provider": "Anthropic",
-                "status": "not_configured"
-            }
+            return self._not_configured("Anthropic")
+        if ASYNC_PROVIDERS:
+            return run_sync(self.ask_anthropic_strategic_async(prompt, max_tokens))
         
         try:
-            headers = {
-                'x-api-key': self.anthropic_api_key,
-                'Content-Type': 'application/json',
-                'anthropic-version': '2023-06-01'
-            }
-            
-            data = {
-                'model': 'claude-3-sonnet-20240229',
-                'max_tokens': max_tokens,
-                'messages': [{'role': 'user', 'content': prompt}]
-            }
-            
-            response = requests.post('https://api.anthropic.com/v1/messages', 
-                                   headers=headers, json=data, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "response": result['content'][0]['text'],
-                    "provider": "Anthropic",
-                    "status": "success"
-                }
-            else:
-                return {
-                    "response": f"Anthropic API error: {response.status_code}",
-                    "provider": "Anthropic", 
-                    "status": "error"
-                }
-                
+            headers, data = self._anthropic_request(prompt, max_tokens)
+            response = http_post(ANTHROPIC_URL, headers=headers, json=data, timeout=30, provider="anthropic",
+                                 api_key=self.anthropic_api_key, tokens=self._request_tokens(data))
+            return self._anthropic_result(response.status_code,
+                                          response.json() if response.status_code == 200 else None)
         except Exception as e:
-            logger.error(f"Anthropic request failed: {str(e)}")
+            return self._provider_error("Anthropic", e)
+
+    async def ask_anthropic_strategic_async(self, prompt: str, max_tokens: int = 2000):
+        if not self.anthropic_api_key:
+            return self._not_configured("Anthropic")
+        try:
+            headers, data = self._anthropic_request(prompt, max_tokens)
+            status, body = await async_request("POST", ANTHROPIC_URL, headers=headers, json=data, timeout=30,
+                                               provider="anthropic", api_key=self.anthropic_api_key,
+                                               tokens=self._request_tokens(data))
+            return self._anthropic_result(status, body)
+        except Exception as e:
+            return self._provider_error("Anthropic", e)
+
+    def _anthropic_request(self, prompt: str, max_tokens: int):
+        headers = {
+            'x-api-key': self.anthropic_api_key,
+            'Content-Type': 'application/json',
+            'anthropic-version': '2023-06-01'
+        }
+        
+        data = {
+            'model': 'claude-3-sonnet-20240229',
+            'max_tokens': max_tokens,
+            'messages': [{'role': 'user', 'content': prompt}]
+        }
+        return headers, data
+
+    def _anthropic_result(self, status_code: int, result):
+        if status_code == 200:
             return {
-                "response": f"Anthropic error: {str(e)}",
+                "response": result['content'][0]['text'],
                 "provider": "Anthropic",
-                "status": "error"
+                "status": "success"
             }
+        return {
+            "response": f"Anthropic API error: {status_code}",
+            "provider": "Anthropic", 
+            "status": "error"
+        }
+
+    def _not_configured(self, provider: str):
+        return {
+            "response": f"{provider} API key not configured",
+            "provider": provider,
+            "status": "not_configured"
+        }
+
+    def _provider_error(self, provider: str, e: Exception):
+        logger.error(f"{provider} request failed: {str(e)}")
+        return {
+            "response": f"{provider} error: {str(e)}",
+            "provider": provider,
+            "status": "error"
+        }
 
 # Initialize enhanced AI client
 enhanced_ai = EnhancedAIClient()
 
-def extract_action_plan_from_ai(ai_response: str, business_name: str, categories: str) -> list:
-    """Extract actionable items from AI response"""
-    try:
-        action_items = []
-        lines = ai_response.split('\n')
-        priority = 1
-        
-        # Look for action-oriented content
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and headers
-            if len(line) < 15 or line.startswith('#') or line.upper() == line:
-                continue
-                
-            # Look for actionable content
-            action_keywords = ['implement', 'create', 'develop', 'launch', 'optimize', 'build', 'establish', 'start', 'begin', 'setup', 'design', 'improve']
-            
-            if any(keyword in line.lower() for keyword in action_keywords):
-                # Clean the line
-                clean_line = re.sub(r'^[\d\.\-\*\#\s]+', '', line)
-                clean_line = clean_line.replace('*', '').replace('#', '').strip()
-                
-                if len(clean_line) > 20 and len(clean_line) < 120:
-                    # Extract ROI if mentioned in the line or nearby lines
-                    roi_match = re.search(r'(\d+[-–]\d+%|\d+%)', line)
-                    roi = roi_match.group(1) if roi_match else f"{120 + priority*30}-{180 + priority*40}%"
-                    
-                    # Extract timeline if mentioned
-                    timeline_match = re.search(r'(\d+\s*(?:days?|weeks?|months?))', line.lower())
-                    timeline = timeline_match.group(1) if timeline_match else f"{priority*30} days"
-                    
-                    # Create description
-                    description = f"Strategic implementation for {business_name} in the {categories} sector"
-                    
-                    action_items.append({
-                        "title": clean_line,
-                        "priority": priority,
-                        "timeline": timeline,
-                        "roi_estimate": roi,
-                        "description": description
-                    })
-                    
-                    priority += 1
-                    if len(action_items) >= 5:  # Get up to 5 items
-                        break
-        
-        # If we didn't find enough items, look for any strategic content
-        if len(action_items) < 3:
-            for line in lines:
-                line = line.strip()
-                strategy_keywords = ['strategy', 'approach', 'plan', 'focus', 'target', 'utilize', 'leverage', 'enhance']
-                
-                if any(keyword in line.lower() for keyword in strategy_keywords) and len(line) > 20 and len(line) < 120:
-                    clean_line = re.sub(r'^[\d\.\-\*\#\s]+', '', line)
-                    clean_line = clean_line.replace('*', '').replace('#', '').strip()
-                    
-                    if clean_line and not any(item['title'] == clean_line for item in action_items):
-                        action_items.append({
-                            "title": clean_line,
-                            "priority": len(action_items) + 1,
-                            "timeline": f"{(len(action_items) + 1)*30} days",
-                            "roi_estimate": f"{150 + len(action_items)*25}-{200 + len(action_items)*30}%",
-                            "description": f"Strategic initiative for {business_name} in {categories}"
-                        })
-                        
-                        if len(action_items) >= 3:
-                            break
-        
-        # Fallback if still no items found
-        if not action_items:
-            action_items = [
-                {
-                    "title": f"Digital transformation strategy for {business_name}",
-                    "priority": 1,
-                    "timeline": "30 days",
-                    "roi_estimate": "150-250%",
-                    "description": f"Modernize digital presence and customer engagement for {categories} business"
-                },
-                {
-                    "title": f"Customer acquisition optimization for {business_name}",
-                    "priority": 2,
-                    "timeline": "60 days",
-                    "roi_estimate": "200-300%",
-                    "description": f"Implement targeted marketing strategies for {categories} market"
-                },
-                {
-                    "title": f"Operational efficiency enhancement for {business_name}",
-                    "priority": 3,
-                    "timeline": "90 days",
-                    "roi_estimate": "120-220%",
-                    "description": f"Streamline processes and reduce costs for {categories} operations"
-                }
-            ]
-        
-        return action_items[:3]  # Return top 3 items
-        
-    except Exception as e:
-        logger.error(f"Error extracting action plan: {e}")
-        return []
+# Sections readable through /results?partial=1 before the job completes
+GATHER_SECTIONS = {"website": "website_info", "news": "market_data", "industry": "industry_insights",
+                   "competitor": "competitor_intel"}
+EXTRACTED_SECTIONS = ("trends", "opportunities", "actionPlan", "marketingStrategy", "productivityTips",
+                      "riskAssessment")
 
-def extract_trends_from_ai(ai_response: str, categories: str) -> list:
-    """Extract market trends from AI response"""
-    trends = []
-    lines = ai_response.split('\n')
-    
-    trend_keywords = ['trend', 'growing', 'increasing', 'emerging', 'rising', 'shift', 'change', 'evolution', 'adoption', 'transformation']
-    
-    for line in lines:
-        line = line.strip()
-        if any(keyword in line.lower() for keyword in trend_keywords):
-            if len(line) > 25 and len(line) < 150:
-                clean_trend = re.sub(r'^[\d\.\-\*\#\s]+', '', line)
-                clean_trend = clean_trend.replace('*', '').replace('#', '').strip()
-                
-                if clean_trend and not clean_trend.startswith(('The ', 'A ', 'An ')):
-                    trends.append(clean_trend)
-    
-    # Remove duplicates and keep unique trends
-    unique_trends = []
-    for trend in trends:
-        if not any(similar_trend in trend.lower() or trend.lower() in similar_trend for similar_trend in unique_trends):
-            unique_trends.append(trend)
-    
-    # Fallback trends if none found
-    if not unique_trends:
-        unique_trends = [
-            f"Digital adoption accelerating across {categories} industry",
-            f"Customer expectations evolving in {categories} market",
-            f"Technology integration becoming essential for {categories} businesses"
-        ]
-    
-    return unique_trends[:3]
+def expected_sections(business_data: dict) -> list:
+    """Section names a job will publish, in the order they usually become ready"""
+    gathered = [section for stage, section in GATHER_SECTIONS.items()
+                if stage != "website" or business_data.get('website')]
+    return gathered + ["ai_analysis"] + list(EXTRACTED_SECTIONS)
 
-def extract_opportunities_from_ai(ai_response: str, business_name: str, categories: str) -> list:
-    """Extract opportunities from AI response"""
-    opportunities = []
-    lines = ai_response.split('\n')
-    
-    opp_keywords = ['opportunity', 'potential', 'gap', 'market', 'untapped', 'chance', 'opening', 'prospects', 'leverage', 'capitalize']
-    
-    for line in lines:
-        line = line.strip()
-        if any(keyword in line.lower() for keyword in opp_keywords):
-            if len(line) > 25 and len(line) < 150:
-                clean_opp = re.sub(r'^[\d\.\-\*\#\s]+', '', line)
-                clean_opp = clean_opp.replace('*', '').replace('#', '').strip()
-                
-                if clean_opp and business_name.lower() not in clean_opp.lower():
-                    # Add business context to opportunity
-                    if not any(word in clean_opp.lower() for word in ['for', 'to']):
-                        clean_opp = f"{clean_opp} for {business_name}"
-                    opportunities.append(clean_opp)
-    
-    # Remove duplicates
-    unique_opportunities = []
-    for opp in opportunities:
-        if not any(similar_opp in opp.lower() or opp.lower() in similar_opp for similar_opp in unique_opportunities):
-            unique_opportunities.append(opp)
-    
-    # Fallback opportunities
-    if not unique_opportunities:
-        unique_opportunities = [
-            f"Digital marketing expansion opportunities for {business_name}",
-            f"Local market penetration strategies for {business_name}",
-            f"Customer experience enhancement initiatives for {business_name}"
-        ]
-    
-    return unique_opportunities[:3]
+def partial_results_payload(job: dict) -> dict:
+    """Sections published so far, with a readiness flag for every expected section"""
+    business_data = job.get("business_data") or {}
+    expected = expected_sections(business_data)
+    if job["status"] == "completed":
+        # Published sections are dropped on completion; read them from the final results
+        results = project_results(job["results"], ALL_FIELDS, business_data)
+        details = results["analysis_details"]
+        sections = {name: results[name] if name in EXTRACTED_SECTIONS else details[name] for name in expected}
+    else:
+        sections = job.get("partial_results") or {}
+    payload = {
+        "status": job["status"],
+        "progress": job["progress"],
+        "complete": job["status"] == "completed",
+        "ready": {name: name in sections for name in expected},
+        "sections": sections
+    }
+    if job["status"] == "completed":
+        payload["results"] = project_results(job["results"], business_data=business_data)
+    return payload
 
-def extract_marketing_strategy_from_ai(ai_response: str, business_name: str) -> str:
-    """Extract marketing strategy from AI response"""
-    lines = ai_response.split('\n')
-    strategy_keywords = ['marketing', 'strategy', 'approach', 'campaign', 'promotion', 'advertising', 'outreach']
-    
-    for i, line in enumerate(lines):
-        if any(keyword in line.lower() for keyword in strategy_keywords):
-            # Get this line and next few lines for context
-            strategy_section = []
-            for j in range(i, min(i + 4, len(lines))):
-                clean_line = lines[j].strip().replace('*', '').replace('#', '')
-                if clean_line and len(clean_line) > 10:
-                    strategy_section.append(clean_line)
-            
-            if strategy_section:
-                strategy = ' '.join(strategy_section)
-                if len(strategy) > 60:
-                    return strategy[:300] + "..." if len(strategy) > 300 else strategy
-    
-    return f"Implement comprehensive multi-channel marketing strategy for {business_name} focusing on digital transformation, customer acquisition, and brand building"
+def update_job(job_id: str, **fields):
+    """Persist job fields and publish a progress event when status/progress change"""
+    job_store.update(job_id, **fields)
+    if "status" in fields or "progress" in fields:
+        event = {k: fields[k] for k in ("status", "progress") if k in fields}
+        job_store.publish(job_id, "progress", event)
 
-def extract_productivity_tips_from_ai(ai_response: str, categories: str) -> list:
-    """Extract productivity tips from AI response"""
-    tips = []
-    lines = ai_response.split('\n')
-    
-    productivity_keywords = ['automate', 'efficiency', 'productivity', 'streamline', 'optimize', 'improve', 'enhance', 'system', 'process', 'workflow']
-    
-    for line in lines:
-        line = line.strip()
-        if any(keyword in line.lower() for keyword in productivity_keywords):
-            if len(line) > 20 and len(line) < 120:
-                clean_tip = re.sub(r'^[\d\.\-\*\#\s]+', '', line)
-                clean_tip = clean_tip.replace('*', '').replace('#', '').strip()
-                
-                if clean_tip:
-                    tips.append(clean_tip)
-    
-    # Remove duplicates
-    unique_tips = []
-    for tip in tips:
-        if not any(similar_tip in tip.lower() or tip.lower() in similar_tip for similar_tip in unique_tips):
-            unique_tips.append(tip)
-    
-    # Fallback tips
-    if not unique_tips:
-        unique_tips = [
-            f"Implement automation tools for {categories} operations",
-            f"Use data analytics to optimize {categories} performance",
-            f"Streamline customer communication processes",
-            f"Adopt cloud-based solutions for {categories} management",
-            f"Create standardized workflows for {categories} tasks"
-        ]
-    
-    return unique_tips[:5]
+class BatchSharedStages:
+    """
+    Category-level stages (news, industry insights) shared by a batch's jobs.
 
-def extract_risk_assessment_from_ai(ai_response: str, business_name: str) -> str:
-    """Extract risk assessment from AI response"""
-    lines = ai_response.split('\n')
-    risk_keywords = ['risk', 'challenge', 'threat', 'concern', 'issue', 'problem', 'barrier', 'obstacle']
-    
-    for line in lines:
-        if any(keyword in line.lower() for keyword in risk_keywords):
-            if len(line.strip()) > 30:
-                clean_risk = line.strip().replace('*', '').replace('#', '')
-                return clean_risk[:250] + "..." if len(clean_risk) > 250 else clean_risk
-    
-    return f"Moderate risk profile for {business_name} - success depends on proper strategy execution, market adaptation, and continuous performance monitoring"
+    Each result is computed once per normalized category; jobs that need it
+    while it is being computed wait for that computation instead of starting
+    their own. Failed results aren't kept, so a later job retries them.
+    """
+
+    def __init__(self, ttl: float = BATCH_SHARED_TTL):
+        self._cache = TTLCache(max_entries=1024, ttl=ttl)
+        self._trend_detector = TrendDetector()
+
+    @staticmethod
+    def _key(stage: str, categories: str):
+        return stage, " ".join(categories.lower().split())
+
+    def _get(self, stage: str, categories: str, loader):
+        result = self._cache.get_or_load(self._key(stage, categories), loader,
+                                         should_cache=lambda value: "error" not in value)
+        # Jobs must not share (and mutate) one result object
+        return copy.deepcopy(result)
+
+    def news(self, categories: str) -> dict:
+        return self._get("news", categories, lambda: self._trend_detector.get_news_trends(categories, limit=5))
 
-def process_enhanced_analysis(job_id: str, business_data: dict):
-    """Real AI-driven analysis with dynamic results"""
+    def industry(self, categories: str) -> dict:
+        return self._get("industry", categories, lambda: get_industry_insights(categories, "small-medium"))
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+def process_enhanced_analysis(job_id: str, business_data: dict, cache_bypass: bool = False,
+                              shared_stages: BatchSharedStages = None):
+    """Real AI-driven analysis with dynamic results
+
+    Jobs from one batch pass the batch's ``shared_stages`` so category-level
+    stages run once per category instead of once per business.
+    """
+    llm_cache_bypass.set(cache_bypass)
+    call_class.set("analysis")
+    job_started = time.monotonic()
     try:
-        analysis_jobs[job_id]["status"] = "processing"
-        analysis_jobs[job_id]["progress"] = 10
+        update_job(job_id, status="processing", progress=10)
         
         # Extract business data
         business_name = business_data.get('name', 'Unknown Business')
@@ -466,23 +529,60 @@ def process_enhanced_analysis(job_id: str, business_data: dict):
         
         logger.info(f"🚀 Starting REAL AI analysis for {business_name} in {categories}")
         
-        # Step 1: Website analysis
-        website_info = ""
-        if website:
-            logger.info(f"🔍 Analyzing website: {website}")
-            website_info = scrape_website_info(website)
-            analysis_jobs[job_id]["progress"] = 20
-        
-        # Step 2: Industry analysis using TrendDetector
-        logger.info(f"📊 Gathering market intelligence for {categories}")
+        # Steps 1-2: Website analysis and market intelligence run concurrently,
+        # none of them depends on another's output
+        logger.info(f"📊 Gathering website and market intelligence for {categories}")
         trend_detector = TrendDetector()
-        market_trends = trend_detector.get_news_trends(categories, limit=5)
-        industry_insights = trend_detector.get_industry_insights(categories, "small-medium")
-        competitor_intel = trend_detector.get_competitor_intelligence(business_name, categories)
+        stages = []
+        if website:
+            stages.append(("website", lambda: scrape_website_info(website),
+                           GATHER_STAGE_TIMEOUTS["website"],
+                           "Website analysis failed: timed out"))
+        if shared_stages is not None:
+            news_stage = lambda: shared_stages.news(categories)
+            industry_stage = lambda: shared_stages.industry(categories)
+        else:
+            news_stage = lambda: trend_detector.get_news_trends(categories, limit=5)
+            industry_stage = lambda: get_industry_insights(categories, "small-medium")
+        stages += [
+            ("news", news_stage,
+             GATHER_STAGE_TIMEOUTS["news"],
+             {"error": "News stage timed out", "articles": []}),
+            ("industry", industry_stage,
+             GATHER_STAGE_TIMEOUTS["industry"],
+             {"error": "Industry stage timed out", "industry": categories}),
+            ("competitor", lambda: trend_detector.get_competitor_intelligence(business_name, categories),
+             GATHER_STAGE_TIMEOUTS["competitor"],
+             {"error": "Competitor stage timed out", "business_context": {"name": business_name, "industry": categories}}),
+        ]
+
+        # Gathering covers progress 10 -> 40, split evenly across stages
+        progress_step = 30 / len(stages)
+        completed = []
+        partial = {}
+
+        def on_stage_done(name, ok, result):
+            completed.append(name)
+            # Readable through /results?partial=1 right away; stores get a snapshot, not the live dict
+            partial[GATHER_SECTIONS[name]] = result
+            update_job(job_id, progress=10 + int(progress_step * len(completed)), partial_results=dict(partial))
+            job_store.publish(job_id, "stage", {"stage": name, "ok": ok,
+                                                "completed": len(completed), "total": len(stages)})
+            logger.info(f"{'✅' if ok else '⚠️'} Stage '{name}' finished ({len(completed)}/{len(stages)})")
+
+        gathered = run_gather_stages(stages, on_stage_done)
+
+        # Merge in a fixed order regardless of completion order
+        website_info = gathered.get("website", "")
+        market_trends = gathered["news"]
+        industry_insights = gathered["industry"]
+        competitor_intel = gathered["competitor"]
         
-        analysis_jobs[job_id]["progress"] = 40
+        update_job(job_id, progress=40)
         
         # Step 3: Comprehensive AI analysis
+        # Deduplicated, summarized sections instead of raw stage dicts
+        context = compact_analysis_context(website_info, market_trends, industry_insights, competitor_intel)
         logger.info(f"🤖 Generating comprehensive analysis with ASI:One")
         comprehensive_prompt = f"""
 You are a senior business consultant with 15+ years of experience analyzing {categories} businesses. Provide a detailed, actionable analysis for {business_name}.
@@ -493,16 +593,16 @@ BUSINESS CONTEXT:
 - Website: {website}
 
 WEBSITE ANALYSIS:
-{website_info}
+{context['website']}
 
 MARKET INTELLIGENCE:
-{market_trends}
+{context['market']}
 
 INDUSTRY INSIGHTS:
-{industry_insights}
+{context['industry']}
 
 COMPETITOR INTELLIGENCE:
-{competitor_intel}
+{context['competitor']}
 
 ANALYSIS REQUIREMENTS:
 
@@ -536,35 +636,43 @@ Identify main risks for {business_name} in the {categories} industry and mitigat
 Focus on actionable, specific advice for {business_name}. Use concrete numbers, timelines, and ROI estimates where possible. Avoid generic recommendations.
 """
         
-        analysis_jobs[job_id]["progress"] = 60
+        update_job(job_id, progress=60)
         
         # Step 4: Get AI analysis
-        ai_analysis = enhanced_ai.ask_asi1_enhanced(comprehensive_prompt)
-        analysis_jobs[job_id]["progress"] = 80
+        stage_started = time.monotonic()
+        ai_analysis = enhanced_ai.ask_asi1_enhanced(comprehensive_prompt, cache=True)
+        STAGE_DURATION.observe(time.monotonic() - stage_started, stage="analysis",
+                               outcome="ok" if ai_analysis['status'] == "success" else "error")
+        partial["ai_analysis"] = ai_analysis['response']
+        update_job(job_id, progress=80, partial_results=dict(partial))
+        job_store.publish(job_id, "stage", {"stage": "analysis", "ok": ai_analysis['status'] == "success"})
         
         # Step 5: Parse AI response and extract structured data
         ai_response = ai_analysis['response']
         logger.info(f"✅ Received comprehensive analysis ({len(ai_response)} characters)")
         
-        # Step 6: Extract structured data from AI response
-        action_plan = extract_action_plan_from_ai(ai_response, business_name, categories)
-        trends = extract_trends_from_ai(ai_response, categories)
-        opportunities = extract_opportunities_from_ai(ai_response, business_name, categories)
-        marketing_strategy = extract_marketing_strategy_from_ai(ai_response, business_name)
-        productivity_tips = extract_productivity_tips_from_ai(ai_response, categories)
-        risk_assessment = extract_risk_assessment_from_ai(ai_response, business_name)
+        # Step 6: Extract structured data from AI response (single pass over all sections)
+        stage_started = time.monotonic()
+        try:
+            sections = extract_analysis_sections(ai_response, business_name, categories)
+        except Exception:
+            STAGE_DURATION.observe(time.monotonic() - stage_started, stage="extraction", outcome="error")
+            raise
+        STAGE_DURATION.observe(time.monotonic() - stage_started, stage="extraction", outcome="ok")
         
-        analysis_jobs[job_id]["progress"] = 95
+        partial.update(sections)
+        update_job(job_id, progress=95, partial_results=dict(partial))
+        job_store.publish(job_id, "stage", {"stage": "extraction", "ok": True})
         
         # Step 7: Format final results
         final_results = {
-            "trends": trends,
-            "opportunities": opportunities,
-            "actionPlan": action_plan,
-            "marketingStrategy": marketing_strategy,
+            "trends": sections["trends"],
+            "opportunities": sections["opportunities"],
+            "actionPlan": sections["actionPlan"],
+            "marketingStrategy": sections["marketingStrategy"],
             "competitiveAnalysis": f"AI-driven competitive analysis reveals {business_name} has strong potential in the {categories} market with proper strategic execution",
-            "productivityTips": productivity_tips,
-            "riskAssessment": risk_assessment,
+            "productivityTips": sections["productivityTips"],
+            "riskAssessment": sections["riskAssessment"],
             "analysis_details": {
                 "ai_analysis": ai_response,
                 "business_context": business_data,
@@ -581,26 +689,65 @@ Focus on actionable, specific advice for {business_name}. Use concrete numbers,
                 "industry": categories,
                 "website_analyzed": bool(website_info and "Website information not available" not in website_info),
                 "analysis_method": "real_ai_parsing",
+                "prompt_tokens_estimate": estimate_tokens(comprehensive_prompt),
                 "data_sources": "website_scraping + market_intelligence + ai_analysis"
             }
         }
         
-        analysis_jobs[job_id]["results"] = final_results
-        analysis_jobs[job_id]["status"] = "completed"
-        analysis_jobs[job_id]["progress"] = 100
+        # Stored normalized: articles and long texts once, referenced from analysis_details
+        stored_results = compact_results(final_results)
+        update_job(job_id, results=stored_results, partial_results=None, status="completed", progress=100)
+        job_store.publish(job_id, "result", project_results(stored_results, business_data=business_data))
         
+        JOB_OUTCOMES.inc(outcome="completed")
+        JOB_DURATION.observe(time.monotonic() - job_started, outcome="completed")
         logger.info(f"🎉 Comprehensive AI analysis completed for {business_name}")
         
     except Exception as e:
+        JOB_OUTCOMES.inc(outcome="failed")
+        JOB_DURATION.observe(time.monotonic() - job_started, outcome="failed")
         logger.error(f"❌ Analysis failed for job {job_id}: {str(e)}")
-        analysis_jobs[job_id]["status"] = "failed"
-        analysis_jobs[job_id]["error"] = str(e)
+        update_job(job_id, status="failed", error=str(e))
+        job_store.publish(job_id, "failed", {"error": str(e)})
+
+    if shared_stages is not None:
+        try:
+            refresh_batch_status((job_store.get(job_id) or {}).get("batch_id"))
+        except Exception as e:
+            logger.error(f"Batch status update failed for job {job_id}: {str(e)}")
+
+def request_bypasses_llm_cache() -> bool:
+    """True when the client asked for fresh LLM output (X-LLM-Cache: bypass or Cache-Control: no-cache)"""
+    return (request.headers.get('X-LLM-Cache', '').lower() == 'bypass'
+            or 'no-cache' in request.headers.get('Cache-Control', '').lower())
+
+def ask_payload(result: dict) -> dict:
+    return {
+        "response": result['response'],
+        "provider": result['provider'],
+        "status": result['status'],
+        "enhanced": True
+    }
+
+async def ask_async(data: dict):
+    """/api/ask awaiting ASI:One instead of holding a thread; returns (payload, status)"""
+    try:
+        call_class.set("ask")
+        question = data.get('question', '')
+        if not question:
+            return {"error": "Question is required"}, 400
+        return ask_payload(await enhanced_ai.ask_asi1_enhanced_async(question)), 200
+    except Exception as e:
+        logger.error(f"Enhanced ask route error: {str(e)}")
+        return {"error": str(e)}, 500
 
 # Your existing route enhanced
 @api.route('/ask', methods=['POST'])
 def enhanced_ask_route():
     """Enhanced version of your existing /ask route"""
     try:
+        llm_cache_bypass.set(request_bypasses_llm_cache())
+        call_class.set("ask")
         data = request.get_json()
         question = data.get('question', '')
         
@@ -610,12 +757,7 @@ def enhanced_ask_route():
         # Use your existing ASI1 integration
         result = enhanced_ai.ask_asi1_enhanced(question)
         
-        return jsonify({
-            "response": result['response'],
-            "provider": result['provider'],
-            "status": result['status'],
-            "enhanced": True
-        })
+        return jsonify(ask_payload(result))
         
     except Exception as e:
         logger.error(f"Enhanced ask route error: {str(e)}")
@@ -630,25 +772,37 @@ def start_enhanced_analysis():
         
         if 'name' not in data:
             return jsonify({"error": "Business name is required"}), 400
+
+        priority = data.get('priority', 'interactive')
+        if priority not in PRIORITIES:
+            return jsonify({"error": f"Unknown priority '{priority}'", "allowed": list(PRIORITIES)}), 400
         
         # Create analysis job
         job_id = str(uuid.uuid4())
-        analysis_jobs[job_id] = {
+        job_store.create(job_id, {
             "status": "queued",
             "progress": 0,
             "created_at": datetime.now().isoformat(),
             "business_data": data,
+            "priority": priority,
             "type": "enhanced_business_analysis"
-        }
+        })
+        job_store.publish(job_id, "progress", {"status": "queued", "progress": 0})
         
-        # Start background processing
-        executor = ThreadPoolExecutor(max_workers=2)
-        executor.submit(process_enhanced_analysis, job_id, data)
+        # Queue on the shared scheduler; a full queue is reported as backpressure
+        try:
+            job_scheduler.submit(job_id, process_enhanced_analysis, job_id, data,
+                                 request_bypasses_llm_cache(), priority=priority)
+        except QueueFullError as e:
+            job_store.delete(job_id)
+            logger.warning(f"Rejected analysis request: {str(e)}")
+            return jsonify({"error": str(e), "retry_after": 30}), 503, {"Retry-After": "30"}
         
         return jsonify({
             "jobId": job_id,
             "message": "Enhanced business analysis started",
             "uses_your_existing_code": True,
+            "queue_position": job_scheduler.queue_position(job_id),
             "estimated_completion": "2-3 minutes"
         })
         
@@ -659,66 +813,312 @@ def start_enhanced_analysis():
 @api.route('/analyze/<job_id>/status', methods=['GET'])
 def get_enhanced_status(job_id):
     """Get status of enhanced analysis"""
-    if job_id not in analysis_jobs:
+    job = get_job(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
-    
-    job = analysis_jobs[job_id]
+
     return jsonify({
         "status": job["status"],
         "progress": job["progress"],
         "created_at": job["created_at"],
         "type": job.get("type", "analysis"),
+        "queue_position": job_scheduler.queue_position(job_id),
         "enhanced": True
     })
 
+@api.route('/analyze/queue', methods=['GET'])
+def get_analysis_queue():
+    """Scheduler queue depth, running jobs and wait times"""
+    return jsonify(job_scheduler.stats())
+
+@api.route('/analyze/batch', methods=['POST'])
+def start_batch_analysis():
+    """Queue one analysis per business, sharing category-level stages across the batch"""
+    try:
+        data = request.get_json() or {}
+        businesses = data.get('businesses')
+        if not isinstance(businesses, list) or not businesses:
+            return jsonify({"error": "'businesses' must be a non-empty list"}), 400
+        if len(businesses) > BATCH_MAX_BUSINESSES:
+            return jsonify({"error": f"At most {BATCH_MAX_BUSINESSES} businesses per batch"}), 400
+        missing = [index for index, business in enumerate(businesses)
+                   if not isinstance(business, dict) or 'name' not in business]
+        if missing:
+            return jsonify({"error": "Business name is required", "invalid_indexes": missing}), 400
+
+        priority = data.get('priority', 'batch')
+        if priority not in PRIORITIES:
+            return jsonify({"error": f"Unknown priority '{priority}'", "allowed": list(PRIORITIES)}), 400
+
+        # Accept the whole batch or none of it
+        if job_scheduler.available_slots() < len(businesses):
+            return jsonify({"error": "Analysis queue cannot take this batch right now",
+                            "available_slots": job_scheduler.available_slots(),
+                            "retry_after": 30}), 503, {"Retry-After": "30"}
+
+        batch_id = str(uuid.uuid4())
+        created_at = datetime.now().isoformat()
+        shared_stages = BatchSharedStages()
+        cache_bypass = request_bypasses_llm_cache()
+        job_ids = []
+        for business in businesses:
+            job_id = str(uuid.uuid4())
+            job_store.create(job_id, {
+                "status": "queued",
+                "progress": 0,
+                "created_at": created_at,
+                "business_data": business,
+                "priority": priority,
+                "batch_id": batch_id,
+                "type": "enhanced_business_analysis"
+            })
+            job_store.publish(job_id, "progress", {"status": "queued", "progress": 0})
+            try:
+                job_scheduler.submit(job_id, process_enhanced_analysis, job_id, business, cache_bypass,
+                                     shared_stages, priority=priority)
+            except QueueFullError as e:
+                # Lost a race for the last slots; the jobs already queued still run
+                job_store.update(job_id, status="failed", error=str(e))
+                job_store.publish(job_id, "failed", {"error": str(e)})
+            job_ids.append(job_id)
+
+        job_store.create(BATCH_KEY_PREFIX + batch_id, {
+            "status": "queued",
+            "progress": 0,
+            "created_at": created_at,
+            "job_ids": job_ids,
+            "priority": priority,
+            "type": "batch_analysis"
+        })
+        # Jobs may already have finished (or failed to queue) before the record existed
+        refresh_batch_status(batch_id)
+
+        categories = {" ".join(b.get('categories', 'general business').lower().split()) for b in businesses}
+        logger.info(f"📦 Batch {batch_id}: {len(job_ids)} businesses across {len(categories)} categories")
+        return jsonify({
+            "batchId": batch_id,
+            "jobIds": job_ids,
+            "businesses": len(job_ids),
+            "shared_categories": len(categories),
+            "message": "Batch analysis started"
+        })
+
+    except Exception as e:
+        logger.error(f"Batch analysis start error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+def get_job(job_id: str):
+    """A single analysis job, never a batch record"""
+    return None if job_id.startswith(BATCH_KEY_PREFIX) else job_store.get(job_id)
+
+def batch_summary(batch: dict) -> dict:
+    """Status, progress and per-job states of a batch, derived from its jobs"""
+    jobs = []
+    counts = {}
+    for job_id in batch["job_ids"]:
+        job = job_store.get(job_id)
+        status = job["status"] if job else "expired"
+        counts[status] = counts.get(status, 0) + 1
+        jobs.append({
+            "jobId": job_id,
+            "name": job["business_data"].get("name") if job else None,
+            "status": status,
+            "progress": job["progress"] if job else 0
+        })
+
+    total = len(jobs)
+    finished = sum(counts.get(status, 0) for status in ("completed", "failed", "expired"))
+    if finished == total:
+        status = "completed" if counts.get("completed", 0) == total else "completed_with_errors"
+    elif counts.get("queued", 0) == total:
+        status = "queued"
+    else:
+        status = "processing"
+
+    return {
+        "status": status,
+        "progress": round(sum(100 if job["status"] in ("failed", "expired") else job["progress"]
+                              for job in jobs) / total) if total else 100,
+        "counts": counts,
+        "jobs": jobs
+    }
+
+def refresh_batch_status(batch_id: str):
+    """Write the derived status back to the batch record; a finished batch is stored as completed"""
+    if not batch_id:
+        return
+    batch = job_store.get(BATCH_KEY_PREFIX + batch_id)
+    if batch is None:
+        return
+    summary = batch_summary(batch)
+    status = "completed" if summary["status"] == "completed_with_errors" else summary["status"]
+    job_store.update(BATCH_KEY_PREFIX + batch_id, status=status, progress=summary["progress"],
+                     outcome=summary["status"])
+
+@api.route('/analyze/batch/<batch_id>', methods=['GET'])
+def get_batch_status(batch_id):
+    """Aggregate progress of a batch and the status of each of its jobs"""
+    batch = job_store.get(BATCH_KEY_PREFIX + batch_id)
+    if batch is None:
+        return jsonify({"error": "Batch not found"}), 404
+
+    summary = batch_summary(batch)
+    return jsonify({
+        "batchId": batch_id,
+        "status": summary["status"],
+        "progress": summary["progress"],
+        "created_at": batch["created_at"],
+        "counts": summary["counts"],
+        "jobs": summary["jobs"]
+    })
+
 @api.route('/analyze/<job_id>/results', methods=['GET'])
 def get_enhanced_results(job_id):
     """Get enhanced analysis results"""
-    if job_id not in analysis_jobs:
+    job = get_job(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
     
-    job = analysis_jobs[job_id]
+    if request.args.get('partial', '').lower() in ('1', 'true'):
+        return jsonify(partial_results_payload(job))
     
     if job["status"] != "completed":
         return jsonify({"error": "Analysis not completed yet", "status": job["status"]}), 400
     
-    return jsonify(job["results"])
+    # Summary fields by default; fields=* or e.g. fields=trends,analysis_details.ai_analysis for more
+    try:
+        fields = parse_fields(request.args.get('fields', ''))
+    except ValueError as e:
+        return jsonify({"error": str(e), "allowed": list(ALL_FIELDS) + ["analysis_details.<section>", "*"]}), 400
+    return jsonify(project_results(job["results"], fields, job.get("business_data")))
 
-@api.route('/quick-insights', methods=['POST'])
-def quick_business_insights():
-    """Fast insights using Groq while preserving your ASI1 integration"""
+# Events that end an analysis event stream
+TERMINAL_EVENTS = ("result", "failed")
+
+def format_sse(event_id: int, event: str, data) -> str:
+    """Serialize one Server-Sent Event"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@api.route('/analyze/<job_id>/events', methods=['GET'])
+def stream_analysis_events(job_id):
+    """Server-Sent Events stream of progress, stage completion and the final result"""
+    if get_job(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    # Browsers resend the last id they saw via Last-Event-ID on reconnect
     try:
-        data = request.get_json()
-        business_info = data.get('business_info', '')
-        question = data.get('question', 'What are quick marketing opportunities?')
-        
-        prompt = f"""
+        last_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id', 0))
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID must be an integer"}), 400
+
+    def generate():
+        cursor = last_id
+        yield "retry: 3000\n\n"
+        while True:
+            events = job_store.wait_for_events(job_id, cursor, timeout=15)
+            if not events:
+                job = job_store.get(job_id)
+                # Job purged, or the client already saw the terminal event
+                if job is None or job["status"] in ("completed", "failed"):
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for event_id, event, data in events:
+                cursor = event_id
+                yield format_sse(event_id, event, data)
+                if event in TERMINAL_EVENTS:
+                    return
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def quick_insights_payload(result: dict, fallback_used: bool) -> dict:
+    if fallback_used:
+        return {
+            "insights": result['response'],
+            "provider": result['provider'],
+            "fallback_used": True,
+            "response_time": "Using your existing ASI1 integration"
+        }
+    return {
+        "insights": result['response'],
+        "provider": result['provider'],
+        "response_time": "< 5 seconds",
+        "asi1_available": True
+    }
+
+def quick_insights_prompt(data: dict) -> str:
+    business_info = data.get('business_info', '')
+    question = data.get('question', 'What are quick marketing opportunities?')
+    
+    return f"""
         Business: {business_info}
         Question: {question}
         
         Provide 3-5 quick, actionable business insights for immediate implementation.
         Focus on marketing, productivity, and growth opportunities.
         """
+
+async def hedged_quick_insights(prompt: str):
+    """Groq with ASI:One as a hedge (or a straight race); returns (payload, status)"""
+    hedge_after = 0.0 if QUICK_INSIGHTS_MODE == "race" else max(
+        HEDGE_MIN_DELAY, groq_latency.percentile(HEDGE_PERCENTILE, HEDGE_DEFAULT_DELAY))
+    outcome = await hedged_call(
+        lambda: enhanced_ai.ask_groq_fast_async(prompt, 500),
+        lambda: enhanced_ai.ask_asi1_enhanced_async(prompt),
+        hedge_after=hedge_after,
+        deadline=QUICK_INSIGHTS_DEADLINE,
+        is_success=enhanced_ai._is_success,
+        primary_latency=groq_latency
+    )
+    quick_insights_hedging.count(outcome["hedged"], outcome["winner"])
+
+    if outcome["result"] is None:
+        return {
+            "error": f"No provider answered within {QUICK_INSIGHTS_DEADLINE:g} seconds",
+            "hedged": outcome["hedged"]
+        }, 504
+
+    payload = quick_insights_payload(outcome["result"], fallback_used=outcome["winner"] == "secondary")
+    payload.update({
+        "hedged": outcome["hedged"],
+        "hedge_after_seconds": round(hedge_after, 3),
+        "elapsed_seconds": round(outcome["elapsed"], 3)
+    })
+    return payload, 200
+
+async def quick_insights_async(data: dict):
+    """/api/quick-insights awaiting the providers instead of holding a thread; returns (payload, status)"""
+    try:
+        call_class.set("quick_insights")
+        prompt = quick_insights_prompt(data)
+        if QUICK_INSIGHTS_MODE == "sequential":
+            groq_result = await enhanced_ai.ask_groq_fast_async(prompt, 500)
+            if groq_result['status'] == 'success':
+                return quick_insights_payload(groq_result, fallback_used=False), 200
+            return quick_insights_payload(await enhanced_ai.ask_asi1_enhanced_async(prompt), fallback_used=True), 200
+        return await hedged_quick_insights(prompt)
+    except Exception as e:
+        logger.error(f"Quick insights error: {str(e)}")
+        return {"error": str(e)}, 500
+
+@api.route('/quick-insights', methods=['POST'])
+def quick_business_insights():
+    """Fast insights using Groq while preserving your ASI1 integration"""
+    try:
+        llm_cache_bypass.set(request_bypasses_llm_cache())
+        call_class.set("quick_insights")
+        prompt = quick_insights_prompt(request.get_json())
         
-        # Try Groq first for speed, fallback to your ASI1
-        groq_result = enhanced_ai.ask_groq_fast(prompt, 500)
-        
-        if groq_result['status'] != 'success':
-            # Fallback to your existing ASI1
-            asi1_result = enhanced_ai.ask_asi1_enhanced(prompt)
-            return jsonify({
-                "insights": asi1_result['response'],
-                "provider": asi1_result['provider'],
-                "fallback_used": True,
-                "response_time": "Using your existing ASI1 integration"
-            })
-        
-        return jsonify({
-            "insights": groq_result['response'],
-            "provider": groq_result['provider'],
-            "response_time": "< 5 seconds",
-            "asi1_available": True
-        })
+        if QUICK_INSIGHTS_MODE == "sequential":
+            # Try Groq first for speed, fallback to your ASI1
+            groq_result = enhanced_ai.ask_groq_fast(prompt, 500)
+            if groq_result['status'] == 'success':
+                return jsonify(quick_insights_payload(groq_result, fallback_used=False))
+            return jsonify(quick_insights_payload(enhanced_ai.ask_asi1_enhanced(prompt), fallback_used=True))
+
+        payload, status = run_sync(hedged_quick_insights(prompt))
+        return jsonify(payload), status
         
     except Exception as e:
         logger.error(f"Quick insights error: {str(e)}")
@@ -741,6 +1141,8 @@ def create_enhanced_agent():
             "uses_your_existing_code": True
         })
         
+    except AgentCapacityError as e:
+        return jsonify({"error": str(e), "retry_after": 60}), 503, {"Retry-After": "60"}
     except Exception as e:
         logger.error(f"Enhanced agent creation error: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -766,6 +1168,102 @@ def chat_enhanced_agent(agent_id):
         logger.error(f"Enhanced agent chat error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@api.route('/agent/<agent_id>', methods=['DELETE'])
+def stop_enhanced_agent(agent_id):
+    """Stop an agent and free its runtime slot"""
+    if not stop_agent(agent_id):
+        return jsonify({"error": "Agent not found or not active"}), 404
+    return jsonify({"agent_id": agent_id, "status": "stopped"})
+
+def _cache_samples():
+    """(cache, result) -> lookup count for every cache with hit/miss counters"""
+    news = TrendDetector.news_cache_stats()
+    llm = llm_cache.stats()
+    industry = industry_store.stats()
+    scrape = scrape_cache.stats()
+    counts = {
+        "news": (news["hits"], news["misses"]),
+        "llm_memory": (llm["memory"]["hits"], llm["memory"]["misses"]),
+        "llm_disk": (llm["disk"]["hits"], llm["disk"]["misses"]),
+        "industry_insights": (industry["hits"], industry["misses"]),
+        # A stale entry counts once, as served; its background refresh is exported separately
+        "scrape": (scrape["fresh"] + scrape["stale"] + scrape["negative_hits"],
+                   scrape["not_modified"] + scrape["fetched"] + scrape["errors"])
+    }
+    samples = {}
+    for cache, (hits, misses) in counts.items():
+        samples[(cache, "hit")] = hits
+        samples[(cache, "miss")] = misses
+    return samples
+
+metrics_registry.counter_callback(
+    "marketforge_cache_requests_total", "Cache lookups by cache and result (hit or miss)",
+    ("cache", "result"), _cache_samples
+)
+metrics_registry.counter_callback(
+    "marketforge_scrape_revalidations_total", "Background revalidations of stale scrape cache entries by result",
+    ("result",), lambda: {(result,): count for result, count in scrape_cache.stats()["revalidations"].items()}
+)
+metrics_registry.gauge_callback(
+    "marketforge_queue_depth", "Analysis jobs waiting in the scheduler queue",
+    (), lambda: {(): job_scheduler.stats()["queue_depth"]}
+)
+metrics_registry.gauge_callback(
+    "marketforge_jobs_running", "Analysis jobs currently running",
+    (), lambda: {(): job_scheduler.stats()["running"]}
+)
+metrics_registry.gauge_callback(
+    "marketforge_queue_oldest_seconds", "Age of the oldest queued analysis job",
+    (), lambda: {(): job_scheduler.stats()["oldest_queued_seconds"]}
+)
+metrics_registry.gauge_callback(
+    "marketforge_circuit_open", "1 while a provider's circuit breaker is open or half-open",
+    ("provider",), lambda: {(name,): int(st["state"] != "closed") for name, st in breaker_stats().items()}
+)
+metrics_registry.counter_callback(
+    "marketforge_rate_limit_wait_seconds_total", "Time provider calls spent queued by the rate limiter",
+    ("provider",), lambda: {(name,): st["throttled_seconds"] for name, st in rate_limiter.stats().items()}
+)
+
+def _job_store_events():
+    stats = job_store.stats()
+    return {(event,): stats[event] for event in ("spilled", "rehydrated", "dropped", "expired") if event in stats}
+
+metrics_registry.counter_callback(
+    "marketforge_job_store_events_total", "Finished jobs spilled to disk, rehydrated, dropped or expired",
+    ("event",), _job_store_events
+)
+metrics_registry.gauge_callback(
+    "marketforge_job_store_jobs", "Analysis jobs held in memory or in the spill segment",
+    ("location",), lambda: {(location,): job_store.stats().get(f"{location}_jobs") for location in ("resident", "spilled")}
+)
+metrics_registry.gauge_callback(
+    "marketforge_job_store_resident_bytes", "Serialized size of finished jobs held in memory",
+    (), lambda: {(): job_store.stats().get("resident_finished_bytes")}
+)
+
+def _agent_lifecycle():
+    stats = get_agent_runtime().stats()
+    return {(event,): stats[event] for event in ("started", "stopped", "evicted", "rejected")}
+
+metrics_registry.counter_callback(
+    "marketforge_agent_lifecycle_total", "Hosted agents started, stopped, evicted when idle or rejected at capacity",
+    ("event",), _agent_lifecycle
+)
+metrics_registry.gauge_callback(
+    "marketforge_agents_running", "Agents hosted by the agent runtime",
+    (), lambda: {(): get_agent_runtime().stats()["running"]}
+)
+metrics_registry.gauge_callback(
+    "marketforge_agents_capacity", "Maximum agents the agent runtime will host",
+    (), lambda: {(): get_agent_runtime().stats()["max_agents"]}
+)
+
+@api.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text exposition of in-process metrics"""
+    return Response(metrics_registry.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
 @api.route('/health', methods=['GET'])
 def enhanced_health():
     """Enhanced health check showing your existing + new capabilities"""
@@ -785,6 +1283,23 @@ def enhanced_health():
             "website_scraping": "✅ Active",
             "ai_response_parsing": "✅ Active"
         },
+        "caches": {
+            "news": TrendDetector.news_cache_stats(),
+            "llm": llm_cache.stats(),
+            "scrape": scrape_cache.stats(),
+            "industry_insights": industry_store.stats()
+        },
+        "scheduler": job_scheduler.stats(),
+        "job_store": job_store.stats(),
+        "agents": get_agent_runtime().stats(),
+        "quick_insights": {
+            "mode": QUICK_INSIGHTS_MODE,
+            "groq_latency": groq_latency.stats(),
+            "hedging": quick_insights_hedging.stats()
+        },
+        "circuit_breakers": breaker_stats(),
+        "rate_limits": rate_limiter.stats(),
+        "http_transport": transport_stats(),
         "built_on_your_code": True
     })
 
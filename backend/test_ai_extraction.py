@@ -0,0 +1,93 @@
+import pytest
+
+from utils.ai_extraction import extract_analysis_sections
+
+AI_RESPONSE = """\
+# Comprehensive Analysis for Sunrise Bakery
+
+## Market Trends
+1. **Demand for artisanal sourdough is growing** by 12% per year in urban neighbourhoods
+2. Plant-based pastry adoption among younger customers keeps rising each quarter
+- Online pre-ordering shift accelerated after 2020 and continues to climb
+
+## Opportunities
+* Untapped catering market for corporate breakfast meetings in the business district
+* Seasonal gift boxes are a strong prospects channel during holidays
+- Wholesale partnerships with independent coffee shops nearby
+
+## Risk Assessment
+Rising flour and butter costs are the main risk to margins over the next 12 months, followed by staffing challenges.
+
+## Marketing Strategy
+Focus the marketing budget on Instagram and local food bloggers.
+Run a loyalty campaign that rewards every tenth purchase with a free loaf.
+Partner with the farmers market for weekend promotion stands.
+
+## Productivity
+- Automate inventory tracking with a cloud POS system
+- Streamline morning bake schedules using a shared workflow board
+- Optimize oven utilization by batching similar products together
+
+## 30-60-90 Day Plan
+30 days: Launch online pre-ordering with pickup slots, expected ROI 150-200%
+60 days: Develop a corporate catering menu within 8 weeks and pitch ten offices
+90 days: Establish two wholesale accounts with coffee shops, targeting 25% revenue growth
+"""
+
+# What the per-section extract_*_from_ai helpers produced for AI_RESPONSE
+BASELINE_SECTIONS = {
+    "trends": [
+        "Demand for artisanal sourdough is growing by 12% per year in urban neighbourhoods",
+        "Plant-based pastry adoption among younger customers keeps rising each quarter",
+        "Online pre-ordering shift accelerated after 2020 and continues to climb"
+    ],
+    "opportunities": [
+        "Untapped catering market for corporate breakfast meetings in the business district",
+        "Seasonal gift boxes are a strong prospects channel during holidays for Sunrise Bakery",
+        "Focus the marketing budget on Instagram and local food bloggers. for Sunrise Bakery"
+    ],
+    "actionPlan": [
+        {
+            "title": "Optimize oven utilization by batching similar products together",
+            "priority": 1,
+            "timeline": "30 days",
+            "roi_estimate": "150-220%",
+            "description": "Strategic implementation for Sunrise Bakery in the bakery sector"
+        },
+        {
+            "title": "days: Launch online pre-ordering with pickup slots, expected ROI 150-200%",
+            "priority": 2,
+            "timeline": "30 days",
+            "roi_estimate": "150-200%",
+            "description": "Strategic implementation for Sunrise Bakery in the bakery sector"
+        },
+        {
+            "title": "days: Develop a corporate catering menu within 8 weeks and pitch ten offices",
+            "priority": 3,
+            "timeline": "60 days",
+            "roi_estimate": "210-300%",
+            "description": "Strategic implementation for Sunrise Bakery in the bakery sector"
+        }
+    ],
+    "marketingStrategy": " Marketing Strategy Focus the marketing budget on Instagram and local food bloggers. Run a loyalty campaign that rewards every tenth purchase with a free loaf. Partner with the farmers market for weekend promotion stands.",
+    "productivityTips": [
+        "Automate inventory tracking with a cloud POS system",
+        "Streamline morning bake schedules using a shared workflow board",
+        "Optimize oven utilization by batching similar products together"
+    ],
+    "riskAssessment": "Rising flour and butter costs are the main risk to margins over the next 12 months, followed by staffing challenges."
+}
+
+
+@pytest.mark.parametrize("section", list(BASELINE_SECTIONS))
+def test_single_pass_matches_the_per_section_extractors(section):
+    sections = extract_analysis_sections(AI_RESPONSE, "Sunrise Bakery", "bakery")
+    assert sections[section] == BASELINE_SECTIONS[section]
+
+
+def test_fallbacks_when_nothing_matches():
+    sections = extract_analysis_sections("Thanks!", "Sunrise Bakery", "bakery")
+    assert sections["trends"][0] == "Digital adoption accelerating across bakery industry"
+    assert sections["actionPlan"][0]["title"] == "Digital transformation strategy for Sunrise Bakery"
+    assert len(sections["productivityTips"]) == 5
+    assert sections["riskAssessment"].startswith("Moderate risk profile for Sunrise Bakery")
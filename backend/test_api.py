@@ -0,0 +1,127 @@
+import socket
+import threading
+import time
+import uuid
+import http.client
+
+import pytest
+import uvicorn
+
+from asgi import create_asgi_app
+from agents.trend_detector import TrendDetector
+from routes import job_store
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def asgi_server():
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(create_asgi_app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started:
+        assert time.time() < deadline, "uvicorn did not start"
+        time.sleep(0.05)
+    yield port
+    server.should_exit = True
+    thread.join(10)
+
+
+def test_asgi_sse_stream_does_not_block_other_routes(asgi_server):
+    job_id = str(uuid.uuid4())
+    job_store.create(job_id, {"status": "processing", "progress": 10, "business_data": {"name": "Test"}})
+
+    streams = []
+    for _ in range(2):
+        stream = http.client.HTTPConnection("127.0.0.1", asgi_server, timeout=10)
+        stream.request("GET", f"/api/analyze/{job_id}/events")
+        response = stream.getresponse()
+        assert response.status == 200
+        assert response.readline().startswith(b"retry:")
+        streams.append((stream, response))
+
+    try:
+        started = time.time()
+        health = http.client.HTTPConnection("127.0.0.1", asgi_server, timeout=5)
+        health.request("GET", "/api/health")
+        assert health.getresponse().status == 200
+        assert time.time() - started < 5
+    finally:
+        job_store.update(job_id, status="failed", error="test finished")
+        job_store.publish(job_id, "failed", {"error": "test finished"})
+        for stream, _ in streams:
+            stream.close()
+
+
+class FakeTrendDetector(TrendDetector):
+    """Canned provider data in the shapes TrendDetector returns"""
+
+    news_calls = []
+
+    def get_news_trends(self, query, limit=5):
+        self.news_calls.append(query)
+        return self._mock_news_trends(query)
+
+    def get_competitor_intelligence(self, business_name, industry):
+        return {"competitor_analysis": "Two established competitors nearby",
+                "market_data": self._mock_news_trends(industry),
+                "business_context": {"name": business_name, "industry": industry}}
+
+
+def fake_industry_insights(calls):
+    def get_industry_insights(industry, business_size):
+        calls.append(industry)
+        return {"industry_insights": "Demand is stable",
+                "market_data": FakeTrendDetector()._mock_news_trends(industry),
+                "industry": industry, "business_size": business_size}
+    return get_industry_insights
+
+
+def test_batch_shares_category_stages_and_finishes(monkeypatch):
+    import routes
+    from app import app
+
+    industry_calls = []
+    FakeTrendDetector.news_calls = []
+    monkeypatch.setattr(routes, "TrendDetector", FakeTrendDetector)
+    monkeypatch.setattr(routes, "get_industry_insights", fake_industry_insights(industry_calls))
+    monkeypatch.setattr(routes.enhanced_ai, "ask_asi1_enhanced", lambda prompt, cache=None: {
+        "response": "1. Launch online pre-ordering with pickup slots within 30 days",
+        "provider": "ASI1", "status": "success"})
+
+    client = app.test_client()
+    businesses = [{"name": "Sunrise Bakery", "categories": "Bakery"},
+                  {"name": "Corner Loaf", "categories": "bakery "},
+                  {"name": "Pipe Pros", "categories": "Plumbing"}]
+    started = client.post("/api/analyze/batch", json={"businesses": businesses}).get_json()
+    batch_id = started["batchId"]
+    assert started["shared_categories"] == 2
+
+    # The batch record lives under its own prefix and is not a job
+    for path in (f"/api/analyze/{batch_id}/status", f"/api/analyze/batch:{batch_id}/status",
+                 f"/api/analyze/batch:{batch_id}/results", f"/api/analyze/batch:{batch_id}/events"):
+        assert client.get(path).status_code == 404
+
+    deadline = time.time() + 30
+    while True:
+        batch = client.get(f"/api/analyze/batch/{batch_id}").get_json()
+        if batch["status"] != "processing" and batch["status"] != "queued":
+            break
+        assert time.time() < deadline, batch
+        time.sleep(0.1)
+
+    assert batch["status"] == "completed"
+    assert batch["progress"] == 100
+    assert batch["counts"] == {"completed": 3}
+    # Once per normalized category, whichever business of the category ran first
+    assert sorted(query.strip().lower() for query in FakeTrendDetector.news_calls) == ["bakery", "plumbing"]
+    assert sorted(query.strip().lower() for query in industry_calls) == ["bakery", "plumbing"]
+
+    stored = job_store.get("batch:" + batch_id)
+    assert (stored["status"], stored["progress"], stored["outcome"]) == ("completed", 100, "completed")
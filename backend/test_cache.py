@@ -0,0 +1,30 @@
+import asyncio
+
+from utils.cache import TTLCache
+
+
+def test_followers_survive_a_cancelled_leader():
+    cache = TTLCache()
+    calls = []
+
+    async def loader():
+        calls.append(len(calls))
+        await asyncio.sleep(0.05)
+        return f"value-{len(calls)}"
+
+    async def scenario():
+        leader = asyncio.ensure_future(cache.get_or_load_async("key", loader))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.ensure_future(cache.get_or_load_async("key", loader)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader, results
+
+    leader, results = asyncio.run(scenario())
+
+    assert leader.cancelled()
+    # One follower re-ran the load and the other shared it
+    assert results == ["value-2", "value-2"]
+    assert len(calls) == 2
+    assert cache.get("key") == "value-2"
@@ -0,0 +1,34 @@
+from utils.circuit_breaker import ADAPTIVE_TIMEOUT_MULTIPLIER, CircuitBreaker
+from utils.http_transport import _call_class, call_class
+
+
+def test_short_calls_do_not_size_the_timeout_of_a_long_call_class():
+    breaker = CircuitBreaker("asi1", min_calls=10)
+    ask = _call_class(120)
+    token = call_class.set("analysis")
+    try:
+        analysis = _call_class(120)
+    finally:
+        call_class.reset(token)
+    assert ask != analysis
+
+    for _ in range(50):
+        breaker.record_success(1.0, ask)
+
+    assert breaker.timeout(120, ask) == 1.0 * ADAPTIVE_TIMEOUT_MULTIPLIER
+    assert breaker.timeout(120, analysis) == 120
+
+
+def test_timed_out_calls_let_the_window_grow():
+    breaker = CircuitBreaker("asi1", min_calls=10, failure_rate=1.1)
+    for _ in range(20):
+        breaker.record_success(1.0, "analysis:120")
+    limit = breaker.timeout(120, "analysis:120")
+
+    # The provider slowed down: every call now runs into the adaptive timeout
+    for _ in range(5):
+        breaker.record_timeout(limit, "analysis:120")
+        limit = breaker.timeout(120, "analysis:120")
+
+    assert limit == 120
+    assert breaker.state == "closed"
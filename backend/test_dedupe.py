@@ -0,0 +1,45 @@
+from utils.dedupe import NearDuplicateFilter, dedupe, normalize_text, shingles
+
+
+def jaccard(a: str, b: str) -> float:
+    x, y = shingles(normalize_text(a)), shingles(normalize_text(b))
+    return len(x & y) / len(x | y)
+
+
+def test_near_duplicates_are_dropped():
+    original = "Local bakeries are growing their online pre-order sales every quarter"
+    variants = [
+        "local bakeries are growing their online pre-order sales every quarter!",
+        "**Local bakeries are growing their online pre order sales every quarter**",
+        "Local bakeries are growing their online pre-order sales each quarter",
+    ]
+    assert all(jaccard(original, variant) >= 0.7 for variant in variants)
+
+    seen = NearDuplicateFilter()
+    assert seen.add(original)
+    assert not any(seen.add(variant) for variant in variants)
+
+
+def test_distinct_items_are_kept_in_order():
+    items = [
+        "Plant-based pastry demand keeps rising among younger customers",
+        "Corporate catering is an untapped market in the business district",
+        "Plant-based pastry demand keeps rising among young customers",
+        "Wholesale partnerships with coffee shops add steady revenue",
+        "Seasonal gift boxes sell well during the holidays",
+        "CORPORATE CATERING is an untapped market in the business district.",
+    ]
+    assert dedupe(items) == [items[0], items[1], items[3], items[4]]
+
+
+def test_similar_but_different_items_are_kept():
+    first = "Automate inventory tracking with a cloud POS system"
+    second = "Automate staff scheduling with a shared calendar"
+    assert jaccard(first, second) < 0.7
+    assert dedupe([first, second]) == [first, second]
+
+
+def test_key_and_limit():
+    items = [{"title": "Launch online pre-ordering"}, {"title": "launch online pre-ordering."},
+             {"title": "Develop a catering menu"}, {"title": "Establish wholesale accounts"}]
+    assert dedupe(items, key=lambda item: item["title"], limit=2) == [items[0], items[2]]
@@ -0,0 +1,27 @@
+import asyncio
+
+from utils.hedging import LatencyTracker, hedged_call
+
+
+def test_cancelled_slow_primaries_keep_the_percentile_up():
+    tracker = LatencyTracker(min_samples=10)
+    hedge_after = 0.05
+
+    async def primary(delay):
+        await asyncio.sleep(delay)
+        return "primary"
+
+    async def secondary():
+        return "secondary"
+
+    async def run(delay):
+        return await hedged_call(lambda: primary(delay), secondary, hedge_after=hedge_after,
+                                 deadline=5, primary_latency=tracker)
+
+    # One in five primaries is slow enough to lose to the hedge
+    delays = [2.0 if i % 5 == 4 else 0.001 for i in range(20)]
+    outcomes = [asyncio.run(run(delay)) for delay in delays]
+
+    assert [outcome["winner"] for outcome in outcomes].count("secondary") == 4
+    assert tracker.stats()["samples"] == 20
+    assert tracker.percentile(90) >= hedge_after
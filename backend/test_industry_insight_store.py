@@ -0,0 +1,51 @@
+import time
+
+from agents import industry_insight_store
+from agents.industry_insight_store import IndustryInsightStore
+
+
+class FakeTrendDetector:
+    def __init__(self):
+        self.calls = []
+
+    def get_industry_insights(self, industry, business_size):
+        self.calls.append(industry)
+        return {"industry": industry, "timestamp": time.time()}
+
+
+def make_store(monkeypatch, path, **kwargs):
+    monkeypatch.setattr(industry_insight_store, "TrendDetector", FakeTrendDetector)
+    store = IndustryInsightStore(path=path, **kwargs)
+    store._thread = True  # no background refresher; the test drives refresh_top
+    return store
+
+
+def test_lease_holder_refreshes_what_other_workers_request(monkeypatch, tmp_path):
+    path = str(tmp_path / "insights.db")
+    owner = make_store(monkeypatch, path, top_n=1)
+    worker = make_store(monkeypatch, path, top_n=1)
+    assert owner._hold_lease("owner") and not worker._hold_lease("worker")
+
+    owner.get("Bakery")
+    for _ in range(3):
+        worker.get("Plumbing")
+    # Both entries are due for a refresh
+    owner._conn().execute("UPDATE insights SET computed_at = computed_at - 7200")
+    owner._entries.clear()
+
+    owner.refresh_top()
+    assert owner._trend_detector.calls == ["Bakery", "Plumbing"]
+    assert owner.stats()["top_demand"] == [{"industry": "plumbing", "business_size": "small-medium",
+                                            "requests": 1.5}]
+
+
+def test_memory_is_bounded_and_locks_are_dropped(monkeypatch, tmp_path):
+    store = make_store(monkeypatch, str(tmp_path / "insights.db"), max_entries=2)
+    for name in ("a", "b", "c", "a"):
+        store.get(name)
+
+    assert list(store._entries) == [("c", "small-medium"), ("a", "small-medium")]
+    assert store.evictions == 2
+    assert store._key_locks == {}
+    # "a" was evicted from memory but served from the shared table
+    assert store._trend_detector.calls == ["a", "b", "c"]
@@ -0,0 +1,90 @@
+import os
+import time
+
+import pytest
+
+from utils.job_store import MemoryJobStore, SQLiteJobStore
+
+
+def test_unfinished_jobs_of_a_stopped_process_are_failed_on_startup(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    previous = SQLiteJobStore(path)
+    previous.create("running", {"status": "processing", "progress": 40})
+    previous.create("queued", {"status": "queued", "progress": 0})
+    previous.create("done", {"status": "completed", "progress": 100})
+    previous.release()
+
+    restarted = SQLiteJobStore(path)
+
+    for job_id in ("running", "queued"):
+        job = restarted.get(job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == SQLiteJobStore.ORPHAN_ERROR
+        assert restarted.events_since(job_id)[-1][1] == "failed"
+    assert restarted.get("done")["status"] == "completed"
+    assert restarted.orphaned == 2
+
+
+def test_jobs_of_live_or_stale_processes(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    live = SQLiteJobStore(path)
+    live.create("live", {"status": "processing"})
+
+    sibling = SQLiteJobStore(path, owner_stale_seconds=60)
+    assert sibling.get("live")["status"] == "processing"
+
+    # A crashed process leaves its heartbeat behind; once it is stale its jobs are failed
+    live._released.set()
+    live._conn().execute("UPDATE job_owners SET heartbeat = ?", (time.time() - 120,))
+    assert sibling.recover_orphans() == 1
+    assert sibling.get("live")["status"] == "failed"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_process_opens_its_own_connection(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    store.create("parent", {"status": "completed"})
+    parent_conn = store._conn()
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ok = store._conn() is not parent_conn and store.get("parent")["status"] == "completed"
+            store.create("child", {"status": "completed"})
+            os._exit(0 if ok else 1)
+        except BaseException:
+            os._exit(2)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert store._conn() is parent_conn
+    assert store.get("child")["status"] == "completed"
+
+def test_spill_segments_of_stores_sharing_a_directory_are_private(tmp_path):
+    first = MemoryJobStore(max_resident=1, spill_dir=str(tmp_path))
+    second = MemoryJobStore(max_resident=1, spill_dir=str(tmp_path))
+    for store, name in ((first, "first"), (second, "second")):
+        for i in range(3):
+            store.create(f"{name}-{i}", {"status": "completed", "owner": name})
+            store.publish(f"{name}-{i}", "result", {"owner": name})
+
+    for store, name in ((first, "first"), (second, "second")):
+        assert store.stats()["spilled"] == 2
+        for i in range(3):
+            assert store.get(f"{name}-{i}")["owner"] == name
+            assert store.events_since(f"{name}-{i}")[0][2] == {"owner": name}
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_events_for_unknown_jobs_and_zero_ttl(tmp_path, backend):
+    store = MemoryJobStore() if backend == "memory" else SQLiteJobStore(str(tmp_path / "jobs.db"))
+    with pytest.raises(KeyError):
+        store.publish("missing", "progress", {"progress": 10})
+    assert store.events_since("missing") == []
+
+    store.create("job", {"status": "completed"})
+    store.publish("job", "result", {})
+    time.sleep(0.01)
+    assert store.purge_expired(0) == 1
+    assert store.get("job") is None
+    assert store.events_since("job") == []
@@ -0,0 +1,45 @@
+import time
+from multiprocessing import get_context
+
+import pytest
+
+from utils import http_transport
+from utils.rate_limiter import MemoryBucketStore, RateLimiter, RateLimitExceeded, SQLiteBucketStore
+
+
+def _reserve_in_process(path):
+    # Each worker process opens the shared file itself
+    return SQLiteBucketStore(path).reserve([("asi1:key:requests", 1.0, 1.0, 1)], max_wait=30)
+
+
+def test_sqlite_buckets_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    SQLiteBucketStore(path)
+    with get_context("spawn").Pool(4) as pool:
+        waits = sorted(pool.map(_reserve_in_process, [path] * 4))
+
+    # One budget of 1 request/s: the four processes queue one second apart
+    assert waits[0] == 0
+    for previous, wait in zip(waits, waits[1:]):
+        assert 0.5 < wait - previous < 1.5
+
+
+def test_throttled_call_does_not_queue_past_its_deadline(monkeypatch):
+    limiter = RateLimiter(MemoryBucketStore(), max_wait=10)
+    while limiter.reserve("asi1", "key") == 0:
+        pass
+    monkeypatch.setattr(http_transport, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(http_transport, "rate_limiter", limiter)
+
+    token = http_transport.request_deadline.set(time.monotonic() + 0.2)
+    try:
+        started = time.monotonic()
+        with pytest.raises(RateLimitExceeded):
+            http_transport.http_post("http://127.0.0.1:9/", provider="asi1", api_key="key")
+        assert time.monotonic() - started < 0.2
+
+        http_transport.request_deadline.set(time.monotonic() - 1)
+        with pytest.raises(TimeoutError):
+            http_transport.http_post("http://127.0.0.1:9/", provider="asi1", api_key="key")
+    finally:
+        http_transport.request_deadline.reset(token)
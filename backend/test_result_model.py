@@ -0,0 +1,95 @@
+import uuid
+
+import pytest
+
+from utils.result_model import (ALL_FIELDS, BLOB_REF, SUMMARY_FIELDS, compact_results, parse_fields,
+                                 project_results)
+
+ARTICLE = {"title": "Bakeries expand online pre-orders", "url": "https://example.com/a", "description": "x" * 300}
+
+
+def make_results():
+    summary = {name: [f"{name} item"] for name in SUMMARY_FIELDS if name != "metadata"}
+    summary["metadata"] = {"generated_at": "2026-01-01T00:00:00"}
+    summary["analysis_details"] = {
+        "ai_analysis": "A" * 400,
+        "business_context": {"name": "Sunrise Bakery", "industry": "Bakery"},
+        "market_data": {"articles": [ARTICLE], "status": "success"},
+        "industry_insights": {"industry_insights": "Demand is stable", "market_data": {"articles": [ARTICLE]}},
+        "analysis_type": "enhanced",
+    }
+    return summary
+
+
+def test_parse_fields_defaults_and_all():
+    assert parse_fields("") == SUMMARY_FIELDS
+    assert parse_fields("  ") == SUMMARY_FIELDS
+    assert parse_fields(" * ") == ALL_FIELDS
+
+
+def test_parse_fields_accepts_top_level_and_nested():
+    assert parse_fields("trends, analysis_details.ai_analysis,") == ("trends", "analysis_details.ai_analysis")
+    assert parse_fields("analysis_details") == ("analysis_details",)
+
+
+@pytest.mark.parametrize("raw", ["blobs", "trends,bogus", "analysis_details.bogus", "trends.ai_analysis",
+                                 "analysis_details.ai_analysis.extra"])
+def test_parse_fields_rejects_unknown(raw):
+    with pytest.raises(ValueError, match="Unknown field"):
+        parse_fields(raw)
+
+
+def test_project_results_default_is_summary():
+    stored = compact_results(make_results())
+    projected = project_results(stored)
+    assert set(projected) == set(SUMMARY_FIELDS)
+    assert "blobs" not in projected and "analysis_details" not in projected
+
+
+def test_project_results_expands_nested_sections():
+    results = make_results()
+    stored = compact_results(results)
+    # The article is kept once, however many sections embed it
+    assert stored["analysis_details"]["market_data"]["articles"][0] == \
+        stored["analysis_details"]["industry_insights"]["market_data"]["articles"][0]
+    assert BLOB_REF in stored["analysis_details"]["market_data"]["articles"][0]
+
+    projected = project_results(stored, ("trends", "analysis_details.market_data"))
+    assert projected == {"trends": results["trends"],
+                         "analysis_details": {"market_data": results["analysis_details"]["market_data"]}}
+
+    business = results["analysis_details"]["business_context"]
+    details = project_results(stored, ("analysis_details",), business)["analysis_details"]
+    assert details == results["analysis_details"]
+
+
+def test_project_results_reads_the_older_full_form():
+    results = make_results()
+    projected = project_results(results, ("analysis_details.ai_analysis", "analysis_details.business_context"))
+    assert projected["analysis_details"] == {"ai_analysis": results["analysis_details"]["ai_analysis"],
+                                             "business_context": results["analysis_details"]["business_context"]}
+
+
+def test_results_endpoint_projects_fields():
+    from app import app
+    from routes import job_store
+
+    results = make_results()
+    job_id = str(uuid.uuid4())
+    job_store.create(job_id, {"status": "completed", "progress": 100, "results": compact_results(results),
+                              "business_data": results["analysis_details"]["business_context"]})
+    client = app.test_client()
+
+    default = client.get(f"/api/analyze/{job_id}/results").get_json()
+    assert set(default) == set(SUMMARY_FIELDS)
+
+    nested = client.get(f"/api/analyze/{job_id}/results?fields=actionPlan,analysis_details.ai_analysis").get_json()
+    assert nested == {"actionPlan": results["actionPlan"],
+                      "analysis_details": {"ai_analysis": results["analysis_details"]["ai_analysis"]}}
+
+    everything = client.get(f"/api/analyze/{job_id}/results?fields=*").get_json()
+    assert everything["analysis_details"] == results["analysis_details"]
+
+    unknown = client.get(f"/api/analyze/{job_id}/results?fields=trends,blobs")
+    assert unknown.status_code == 400
+    assert unknown.get_json()["error"] == "Unknown field 'blobs'"
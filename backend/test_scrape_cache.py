@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from utils import scrape_cache as scrape_cache_module
+from utils.scrape_cache import ScrapeCache
+
+URL = "https://bakery.example"
+
+
+class FakeSite:
+    """Stands in for fetch_page_summary; answers 304 to a matching ETag"""
+
+    def __init__(self, etag="v1", summary=None):
+        self.etag = etag
+        self.summary = summary or {"title": "Sunrise Bakery"}
+        self.fail = False
+        self.requests = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, url, headers=None):
+        self.requests.append(dict(headers or {}))
+        self.release.wait(5)
+        if self.fail:
+            raise ConnectionError("site down")
+        if headers and headers.get("If-None-Match") == self.etag:
+            return {"status_code": 304, "summary": None, "headers": {}}
+        return {"status_code": 200, "summary": dict(self.summary), "headers": {"ETag": self.etag}}
+
+
+@pytest.fixture
+def site(monkeypatch):
+    fake = FakeSite()
+    monkeypatch.setattr(scrape_cache_module, "fetch_page_summary", fake)
+    return fake
+
+
+def age(cache, seconds):
+    cache._conn().execute("UPDATE pages SET fetched_at = fetched_at - ?", (seconds,))
+
+
+def test_expired_entry_is_refreshed_with_a_304(site, tmp_path):
+    cache = ScrapeCache(str(tmp_path / "scrape.db"), ttl=60, stale_ttl=60)
+    assert cache.get(URL)["summary"] == {"title": "Sunrise Bakery"}
+    age(cache, 600)
+
+    result = cache.get(URL)
+
+    assert result["summary"] == {"title": "Sunrise Bakery"}
+    assert site.requests[-1] == {"If-None-Match": "v1"}
+    assert cache.stats()["not_modified"] == 1
+    # The 304 renewed the entry, so it is fresh again
+    assert cache.get(URL)["summary"] == {"title": "Sunrise Bakery"}
+    assert len(site.requests) == 2
+
+
+def test_stale_entry_is_served_while_it_revalidates(site, tmp_path):
+    cache = ScrapeCache(str(tmp_path / "scrape.db"), ttl=60, stale_ttl=3600)
+    cache.get(URL)
+    age(cache, 120)
+    site.etag, site.summary = "v2", {"title": "Sunrise Bakery & Cafe"}
+    site.release.clear()
+
+    started = time.monotonic()
+    result = cache.get(URL)
+    assert time.monotonic() - started < 1
+    assert result["summary"] == {"title": "Sunrise Bakery"}
+
+    site.release.set()
+    deadline = time.monotonic() + 5
+    while cache.stats()["revalidations"]["fetched"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert cache.stats()["revalidations"]["fetched"] == 1
+    assert cache.stats()["stale"] == 1
+    assert cache.get(URL)["summary"] == {"title": "Sunrise Bakery & Cafe"}
+
+
+def test_negative_entry_expires(site, tmp_path):
+    cache = ScrapeCache(str(tmp_path / "scrape.db"), negative_ttl=30)
+    site.fail = True
+    assert cache.get(URL)["error"] == "site down"
+    assert cache.get(URL)["error"] == "site down"
+    assert len(site.requests) == 1
+    assert cache.stats()["negative_hits"] == 1
+
+    site.fail = False
+    age(cache, 31)
+    assert cache.get(URL)["summary"] == {"title": "Sunrise Bakery"}
+    assert len(site.requests) == 2
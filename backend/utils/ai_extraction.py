@@ -0,0 +1,307 @@
+import re
+import logging
+from typing import Dict, List
+
+from utils.dedupe import NearDuplicateFilter, dedupe
+
+logger = logging.getLogger(__name__)
+
+# Keyword sets used to classify each line of an AI response
+SECTION_KEYWORDS = {
+    "action": ['implement', 'create', 'develop', 'launch', 'optimize', 'build', 'establish', 'start', 'begin', 'setup', 'design', 'improve'],
+    "action_strategy": ['strategy', 'approach', 'plan', 'focus', 'target', 'utilize', 'leverage', 'enhance'],
+    "trend": ['trend', 'growing', 'increasing', 'emerging', 'rising', 'shift', 'change', 'evolution', 'adoption', 'transformation'],
+    "opportunity": ['opportunity', 'potential', 'gap', 'market', 'untapped', 'chance', 'opening', 'prospects', 'leverage', 'capitalize'],
+    "marketing": ['marketing', 'strategy', 'approach', 'campaign', 'promotion', 'advertising', 'outreach'],
+    "productivity": ['automate', 'efficiency', 'productivity', 'streamline', 'optimize', 'improve', 'enhance', 'system', 'process', 'workflow'],
+    "risk": ['risk', 'challenge', 'threat', 'concern', 'issue', 'problem', 'barrier', 'obstacle'],
+}
+
+_BULLET_PREFIX_RE = re.compile(r'^[\d\.\-\*\#\s]+')
+_ROI_RE = re.compile(r'(\d+[-–]\d+%|\d+%)')
+_TIMELINE_RE = re.compile(r'(\d+\s*(?:days?|weeks?|months?))')
+
+
+class KeywordClassifier:
+    """
+    Tag lines with every keyword set they contain, in one regex scan.
+
+    All keywords are compiled into a single prefix-factored (trie-shaped)
+    alternation inside a lookahead, so a match is attempted at every offset
+    and overlapping keywords are all seen. The longest keyword wins at each
+    offset; a keyword that contains another (``marketing`` / ``market``)
+    carries both keywords' tags, which keeps the result identical to testing
+    ``keyword in line`` for each keyword separately.
+    """
+
+    def __init__(self, keyword_sets: Dict[str, List[str]]):
+        owners = {}
+        for tag, keywords in keyword_sets.items():
+            for keyword in keywords:
+                owners.setdefault(keyword.lower(), set()).add(tag)
+
+        self._tags = {
+            keyword: frozenset().union(*(tags for other, tags in owners.items() if other in keyword))
+            for keyword in owners
+        }
+        self._pattern = re.compile(f"(?=({self._trie_pattern(owners)}))")
+
+    @staticmethod
+    def _trie_pattern(words) -> str:
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            # A word ending here makes the rest optional; greedy, so longest first
+            return f"(?:{body})?" if "" in node else body
+
+        return build(trie)
+
+    def classify_lines(self, text: str) -> List[frozenset]:
+        """Tags for each ``\\n``-separated line of ``text``, from one scan"""
+        text_lower = text.lower()
+        tags = [frozenset()] * (text_lower.count("\n") + 1)
+        line, next_break = 0, text_lower.find("\n")
+        for match in self._pattern.finditer(text_lower):
+            while next_break != -1 and match.start() > next_break:
+                line += 1
+                next_break = text_lower.find("\n", next_break + 1)
+            tags[line] = tags[line] | self._tags[match.group(1)]
+        return tags
+
+
+_classifier = KeywordClassifier(SECTION_KEYWORDS)
+
+
+class _Line:
+    """One response line, stripped and classified once"""
+
+    __slots__ = ("raw", "text", "tags", "_clean")
+
+    def __init__(self, raw: str, tags: frozenset):
+        self.raw = raw
+        self.text = raw.strip()
+        self.tags = tags
+        self._clean = None
+
+    @property
+    def clean(self) -> str:
+        """Line without list markers and markdown emphasis"""
+        if self._clean is None:
+            self._clean = _BULLET_PREFIX_RE.sub('', self.text).replace('*', '').replace('#', '').strip()
+        return self._clean
+
+
+def extract_analysis_sections(ai_response: str, business_name: str, categories: str) -> Dict:
+    """
+    Extract every structured section from an AI analysis in a single pass.
+
+    Returns the ``trends``, ``opportunities``, ``actionPlan``,
+    ``marketingStrategy``, ``productivityTips`` and ``riskAssessment``
+    entries of the final results.
+    """
+    raw_lines = ai_response.split('\n')
+    lines = [_Line(raw, tags) for raw, tags in zip(raw_lines, _classifier.classify_lines(ai_response))]
+    by_tag = {tag: [] for tag in SECTION_KEYWORDS}
+    for index, line in enumerate(lines):
+        for tag in line.tags:
+            by_tag[tag].append(index)
+
+    return {
+        "trends": _trends(lines, by_tag["trend"], categories),
+        "opportunities": _opportunities(lines, by_tag["opportunity"], business_name),
+        "actionPlan": _action_plan(lines, by_tag, business_name, categories),
+        "marketingStrategy": _marketing_strategy(lines, by_tag["marketing"], business_name),
+        "productivityTips": _productivity_tips(lines, by_tag["productivity"], categories),
+        "riskAssessment": _risk_assessment(lines, by_tag["risk"], business_name),
+    }
+
+
+def _action_plan(lines: List[_Line], by_tag: Dict, business_name: str, categories: str) -> list:
+    """Extract actionable items from AI response"""
+    try:
+        action_items = []
+        seen = NearDuplicateFilter()
+        priority = 1
+
+        for index in by_tag["action"]:
+            line = lines[index]
+            # Skip short lines and headers
+            if len(line.text) < 15 or line.text.startswith('#') or line.text.upper() == line.text:
+                continue
+
+            clean_line = line.clean
+            if 20 < len(clean_line) < 120 and seen.add(clean_line):
+                # Extract ROI and timeline if mentioned in the line
+                roi_match = _ROI_RE.search(line.text)
+                roi = roi_match.group(1) if roi_match else f"{120 + priority*30}-{180 + priority*40}%"
+
+                timeline_match = _TIMELINE_RE.search(line.text.lower())
+                timeline = timeline_match.group(1) if timeline_match else f"{priority*30} days"
+
+                action_items.append({
+                    "title": clean_line,
+                    "priority": priority,
+                    "timeline": timeline,
+                    "roi_estimate": roi,
+                    "description": f"Strategic implementation for {business_name} in the {categories} sector"
+                })
+
+                priority += 1
+                if len(action_items) >= 5:  # Get up to 5 items
+                    break
+
+        # If we didn't find enough items, look for any strategic content
+        if len(action_items) < 3:
+            for index in by_tag["action_strategy"]:
+                line = lines[index]
+                if not 20 < len(line.text) < 120:
+                    continue
+                clean_line = line.clean
+                if clean_line and seen.add(clean_line):
+                    action_items.append({
+                        "title": clean_line,
+                        "priority": len(action_items) + 1,
+                        "timeline": f"{(len(action_items) + 1)*30} days",
+                        "roi_estimate": f"{150 + len(action_items)*25}-{200 + len(action_items)*30}%",
+                        "description": f"Strategic initiative for {business_name} in {categories}"
+                    })
+
+                    if len(action_items) >= 3:
+                        break
+
+        # Fallback if still no items found
+        if not action_items:
+            action_items = [
+                {
+                    "title": f"Digital transformation strategy for {business_name}",
+                    "priority": 1,
+                    "timeline": "30 days",
+                    "roi_estimate": "150-250%",
+                    "description": f"Modernize digital presence and customer engagement for {categories} business"
+                },
+                {
+                    "title": f"Customer acquisition optimization for {business_name}",
+                    "priority": 2,
+                    "timeline": "60 days",
+                    "roi_estimate": "200-300%",
+                    "description": f"Implement targeted marketing strategies for {categories} market"
+                },
+                {
+                    "title": f"Operational efficiency enhancement for {business_name}",
+                    "priority": 3,
+                    "timeline": "90 days",
+                    "roi_estimate": "120-220%",
+                    "description": f"Streamline processes and reduce costs for {categories} operations"
+                }
+            ]
+
+        return action_items[:3]  # Return top 3 items
+
+    except Exception as e:
+        logger.error(f"Error extracting action plan: {e}")
+        return []
+
+
+def _trends(lines: List[_Line], indexes: List[int], categories: str) -> list:
+    """Extract market trends from AI response"""
+    trends = []
+    for index in indexes:
+        line = lines[index]
+        if 25 < len(line.text) < 150:
+            clean_trend = line.clean
+            if clean_trend and not clean_trend.startswith(('The ', 'A ', 'An ')):
+                trends.append(clean_trend)
+
+    unique_trends = dedupe(trends, limit=3)
+    if not unique_trends:
+        unique_trends = [
+            f"Digital adoption accelerating across {categories} industry",
+            f"Customer expectations evolving in {categories} market",
+            f"Technology integration becoming essential for {categories} businesses"
+        ]
+
+    return unique_trends[:3]
+
+
+def _opportunities(lines: List[_Line], indexes: List[int], business_name: str) -> list:
+    """Extract opportunities from AI response"""
+    opportunities = []
+    name_lower = business_name.lower()
+    for index in indexes:
+        line = lines[index]
+        if 25 < len(line.text) < 150:
+            clean_opp = line.clean
+            if clean_opp and name_lower not in clean_opp.lower():
+                # Add business context to opportunity
+                if not any(word in clean_opp.lower() for word in ['for', 'to']):
+                    clean_opp = f"{clean_opp} for {business_name}"
+                opportunities.append(clean_opp)
+
+    unique_opportunities = dedupe(opportunities, limit=3)
+    if not unique_opportunities:
+        unique_opportunities = [
+            f"Digital marketing expansion opportunities for {business_name}",
+            f"Local market penetration strategies for {business_name}",
+            f"Customer experience enhancement initiatives for {business_name}"
+        ]
+
+    return unique_opportunities[:3]
+
+
+def _marketing_strategy(lines: List[_Line], indexes: List[int], business_name: str) -> str:
+    """Extract marketing strategy from AI response"""
+    for index in indexes:
+        # Get this line and next few lines for context
+        strategy_section = []
+        for line in lines[index:index + 4]:
+            clean_line = line.text.replace('*', '').replace('#', '')
+            if clean_line and len(clean_line) > 10:
+                strategy_section.append(clean_line)
+
+        if strategy_section:
+            strategy = ' '.join(strategy_section)
+            if len(strategy) > 60:
+                return strategy[:300] + "..." if len(strategy) > 300 else strategy
+
+    return f"Implement comprehensive multi-channel marketing strategy for {business_name} focusing on digital transformation, customer acquisition, and brand building"
+
+
+def _productivity_tips(lines: List[_Line], indexes: List[int], categories: str) -> list:
+    """Extract productivity tips from AI response"""
+    tips = []
+    for index in indexes:
+        line = lines[index]
+        if 20 < len(line.text) < 120 and line.clean:
+            tips.append(line.clean)
+
+    unique_tips = dedupe(tips, limit=5)
+    if not unique_tips:
+        unique_tips = [
+            f"Implement automation tools for {categories} operations",
+            f"Use data analytics to optimize {categories} performance",
+            f"Streamline customer communication processes",
+            f"Adopt cloud-based solutions for {categories} management",
+            f"Create standardized workflows for {categories} tasks"
+        ]
+
+    return unique_tips[:5]
+
+
+def _risk_assessment(lines: List[_Line], indexes: List[int], business_name: str) -> str:
+    """Extract risk assessment from AI response"""
+    for index in indexes:
+        line = lines[index]
+        if len(line.text) > 30:
+            clean_risk = line.text.replace('*', '').replace('#', '')
+            return clean_risk[:250] + "..." if len(clean_risk) > 250 else clean_risk
+
+    return f"Moderate risk profile for {business_name} - success depends on proper strategy execution, market adaptation, and continuous performance monitoring"
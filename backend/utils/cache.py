@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+
+# Resolves an async in-flight load whose leader was cancelled; a waiting
+# follower takes over the load instead of inheriting the cancellation
+_RETRY = object()
+
+
+class _InFlight:
+    """A fetch currently running for one key; followers wait on it"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and single-flight loading.
+
+    ``get_or_load(key, loader)`` returns a fresh cached value if present.
+    Otherwise exactly one caller runs ``loader()`` while concurrent callers
+    for the same key wait for its result instead of issuing their own.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}
+        self._async_inflight = {}  # key -> asyncio.Future, on the caller's loop
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value or None, counting a hit or miss"""
+        with self._lock:
+            value = self._get_locked(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        with self._lock:
+            self._set_locked(key, value, self.ttl if ttl is None else ttl)
+
+    def get_or_load(self, key, loader, should_cache=None):
+        """
+        Return the cached value for ``key`` or load it once.
+
+        ``should_cache(value)`` can veto storing a loaded value (e.g. error
+        responses); waiting callers still receive it.
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            flight = self._inflight.get(key)
+            if flight is None:
+                self.misses += 1
+                flight = self._inflight[key] = _InFlight()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None and (should_cache is None or should_cache(flight.value)):
+                    self._set_locked(key, flight.value, self.ttl)
+                del self._inflight[key]
+            flight.event.set()
+        return flight.value
+
+    async def get_or_load_async(self, key, loader, should_cache=None):
+        """
+        Coroutine counterpart of ``get_or_load``; ``loader`` is a coroutine
+        function. Callers on the same event loop share one in-flight load.
+        If the caller running the load is cancelled, one of the callers
+        waiting for it runs the load again.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        while True:
+            with self._lock:
+                value = self._get_locked(key)
+                if value is not None:
+                    self.hits += 1
+                    return value
+                flight = self._async_inflight.get(flight_key)
+                if flight is None:
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+            if flight is None:
+                break
+            value = await asyncio.shield(flight)
+            if value is not _RETRY:
+                return value
+
+        flight = self._async_inflight[flight_key] = loop.create_future()
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            self._async_inflight.pop(flight_key, None)
+            flight.set_result(_RETRY)
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            # Mark retrieved so an un-awaited failure doesn't log a warning
+            flight.exception()
+            raise
+        else:
+            flight.set_result(value)
+            if should_cache is None or should_cache(value):
+                self.set(key, value)
+            return value
+        finally:
+            self._async_inflight.pop(flight_key, None)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def _get_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_locked(self, key, value, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
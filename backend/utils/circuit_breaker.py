@@ -0,0 +1,180 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict
+
+from utils.hedging import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "50"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "10"))
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1"))
+# Adaptive timeout = observed p99 latency * multiplier, clamped to
+# [ADAPTIVE_TIMEOUT_MIN, the call site's own timeout]
+ADAPTIVE_TIMEOUT_PERCENTILE = float(os.getenv("ADAPTIVE_TIMEOUT_PERCENTILE", "99"))
+ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "3"))
+ADAPTIVE_TIMEOUT_MIN = float(os.getenv("ADAPTIVE_TIMEOUT_MIN", "2"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open; retry in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Rolling error-rate circuit breaker for one upstream provider.
+
+    The outcomes of the last ``window`` calls are kept. Once at least
+    ``min_calls`` have been seen and the failure share reaches
+    ``failure_rate``, the circuit opens and calls fail immediately for
+    ``open_seconds``. After that a few probe calls are let through
+    (half-open): a successful probe closes the circuit, a failed one
+    reopens it.
+
+    Latency is tracked per call class (e.g. "ask:120"), so a provider's
+    short calls don't size the timeouts of its long ones. A call that
+    timed out is recorded as a lower bound of its class's latency.
+    """
+
+    def __init__(self, name: str, window: int = CIRCUIT_WINDOW, min_calls: int = CIRCUIT_MIN_CALLS,
+                 failure_rate: float = CIRCUIT_FAILURE_RATE, open_seconds: float = CIRCUIT_OPEN_SECONDS,
+                 half_open_probes: int = CIRCUIT_HALF_OPEN_PROBES):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.window = window
+        self._latency = {}  # call class -> LatencyTracker
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit '{self.name}' half-open, probing")
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may go through now"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_in)
+
+    def latency(self, call_class: str = "default") -> LatencyTracker:
+        with self._lock:
+            tracker = self._latency.get(call_class)
+            if tracker is None:
+                tracker = self._latency[call_class] = LatencyTracker(window=self.window, min_samples=self.min_calls)
+            return tracker
+
+    def record_success(self, latency: float, call_class: str = "default"):
+        self.latency(call_class).record(latency)
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._outcomes.clear()
+                logger.info(f"Circuit '{self.name}' closed")
+            self._outcomes.append(True)
+
+    def record_timeout(self, elapsed: float, call_class: str = "default"):
+        """A failure whose elapsed time still tells the window the class takes at least that long"""
+        self.latency(call_class).record(elapsed)
+        self.record_failure()
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip()
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (self._state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._trip()
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.trips += 1
+        logger.warning(f"Circuit '{self.name}' opened for {self.open_seconds:g}s")
+
+    def release(self):
+        """Forget an allowed call that ended without an outcome (e.g. cancelled)"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def timeout(self, ceiling: float, call_class: str = "default") -> float:
+        """Timeout derived from the class's observed latency, never above the call site's ``ceiling``"""
+        observed = self.latency(call_class).percentile(ADAPTIVE_TIMEOUT_PERCENTILE)
+        if observed is None:
+            return ceiling
+        return min(ceiling, max(ADAPTIVE_TIMEOUT_MIN, observed * ADAPTIVE_TIMEOUT_MULTIPLIER))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            latency = dict(self._latency)
+        return {
+            "state": state,
+            "window_calls": calls,
+            "error_rate": round(failures / calls, 3) if calls else 0.0,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "latency": {call_class: tracker.stats() for call_class, tracker in latency.items()}
+        }
+
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a provider, creating it on first use"""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_stats() -> Dict:
+    with _registry_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.stats() for name, breaker in breakers.items()}
@@ -0,0 +1,168 @@
+import os
+import re
+import logging
+from typing import Dict, List
+
+from utils.dedupe import NearDuplicateFilter
+
+logger = logging.getLogger(__name__)
+
+# Rough English average for the providers' tokenizers; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Per-section token budgets for the comprehensive analysis prompt
+SECTION_BUDGETS = {
+    "website": int(os.getenv("PROMPT_BUDGET_WEBSITE", "250")),
+    "market": int(os.getenv("PROMPT_BUDGET_MARKET", "400")),
+    "industry": int(os.getenv("PROMPT_BUDGET_INDUSTRY", "700")),
+    "competitor": int(os.getenv("PROMPT_BUDGET_COMPETITOR", "700")),
+}
+
+ARTICLE_DESCRIPTION_CHARS = 160
+
+_STRUCTURAL_RE = re.compile(r'^(#+\s|\d+[\.\)]\s|[-*•]\s|[A-Z][A-Z /&]{3,}:?$)')
+_MARKDOWN_RE = re.compile(r'[*_`]+')
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(' ', 1)[0]
+    return cut.rstrip(' ,;:') + "…"
+
+
+def summarize_text(text: str, max_tokens: int) -> str:
+    """
+    Extractive summary of an LLM answer that fits ``max_tokens``.
+
+    Near-duplicate lines are dropped. Headings, numbered points and bullets
+    are kept before free prose, and the kept lines stay in their original
+    order.
+    """
+    if not text:
+        return ""
+    seen = NearDuplicateFilter()
+    lines = []
+    for raw in text.split('\n'):
+        line = _MARKDOWN_RE.sub('', raw).strip()
+        if line and seen.add(line):
+            lines.append(line)
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    if sum(len(line) + 1 for line in lines) <= budget:
+        return '\n'.join(lines)
+
+    ranked = sorted(range(len(lines)), key=lambda i: (not _STRUCTURAL_RE.match(lines[i]), i))
+    chosen = {}
+    remaining = budget
+    for i in ranked:
+        if remaining <= 40:
+            break
+        line = _truncate(lines[i], min(remaining - 1, 240))
+        chosen[i] = line
+        remaining -= len(line) + 1
+    return '\n'.join(chosen[i] for i in sorted(chosen))
+
+
+class ContextCompactor:
+    """
+    Turns the gathered stage outputs into compact prompt sections.
+
+    Articles are shared across sections: each one is rendered once (title,
+    source, short description) the first time it appears. Bookkeeping
+    fields (``raw_data``, timestamps, flags) are dropped, and each section
+    is summarized to its token budget.
+    """
+
+    def __init__(self, budgets: Dict[str, int] = None):
+        self.budgets = dict(SECTION_BUDGETS, **(budgets or {}))
+        self._seen_urls = set()
+        self._seen_titles = NearDuplicateFilter()
+
+    def _new_articles(self, market_data) -> List[str]:
+        if not isinstance(market_data, dict):
+            return []
+        rendered = []
+        for article in market_data.get('articles', []) or []:
+            title = (article.get('title') or '').strip()
+            url = article.get('url')
+            if not title or (url and url in self._seen_urls) or not self._seen_titles.add(title):
+                continue
+            if url:
+                self._seen_urls.add(url)
+            source = (article.get('source') or {}).get('name')
+            line = f"- {title}" + (f" ({source})" if source else "")
+            description = (article.get('description') or '').strip()
+            if description:
+                line += f": {_truncate(description, ARTICLE_DESCRIPTION_CHARS)}"
+            rendered.append(line)
+        return rendered
+
+    def _section(self, name: str, summary: str, articles: List[str]) -> str:
+        """Fit a summary plus article lines into the section's budget"""
+        budget = self.budgets[name] * CHARS_PER_TOKEN
+        article_lines = []
+        used = 0
+        # Articles get at most a third of the budget when there is a summary
+        article_budget = budget // 3 if summary else budget
+        for line in articles:
+            if used + len(line) + 1 > article_budget:
+                break
+            article_lines.append(line)
+            used += len(line) + 1
+
+        parts = []
+        if summary:
+            parts.append(summarize_text(summary, (budget - used) // CHARS_PER_TOKEN))
+        if article_lines:
+            parts.append("Related news:\n" + '\n'.join(article_lines))
+        return '\n'.join(parts) if parts else "No data available"
+
+    @staticmethod
+    def _fallback_text(data: Dict, *keys) -> str:
+        """Render fallback insight dicts (lists of strings) as bullet text"""
+        for key in keys:
+            block = data.get(key)
+            if isinstance(block, dict):
+                lines = []
+                for title, items in block.items():
+                    lines.append(f"{title.replace('_', ' ').title()}:")
+                    lines.extend(f"- {item}" for item in (items if isinstance(items, list) else [items]))
+                return '\n'.join(lines)
+        return ""
+
+    def compact(self, website_info: str, market_trends: Dict, industry_insights: Dict,
+                competitor_intel: Dict) -> Dict[str, str]:
+        """Return ``{"website", "market", "industry", "competitor"}`` prompt sections"""
+        industry_insights = industry_insights or {}
+        competitor_intel = competitor_intel or {}
+
+        sections = {
+            "website": summarize_text(website_info or "", self.budgets["website"]) or "Not provided",
+            "market": self._section("market", "", self._new_articles(market_trends)),
+            "industry": self._section(
+                "industry",
+                industry_insights.get('industry_insights') or self._fallback_text(industry_insights, 'basic_insights'),
+                self._new_articles(industry_insights.get('market_data'))
+            ),
+            "competitor": self._section(
+                "competitor",
+                competitor_intel.get('competitor_analysis') or self._fallback_text(competitor_intel, 'fallback_insights'),
+                self._new_articles(competitor_intel.get('market_data'))
+            ),
+        }
+        return sections
+
+
+def compact_analysis_context(website_info: str, market_trends: Dict, industry_insights: Dict,
+                             competitor_intel: Dict, budgets: Dict[str, int] = None) -> Dict[str, str]:
+    """Compact the gathered stage outputs into budgeted prompt sections"""
+    sections = ContextCompactor(budgets).compact(website_info, market_trends, industry_insights, competitor_intel)
+    before = estimate_tokens(f"{website_info}{market_trends}{industry_insights}{competitor_intel}")
+    after = sum(estimate_tokens(text) for text in sections.values())
+    logger.info(f"Compacted analysis context from ~{before} to ~{after} tokens")
+    return sections
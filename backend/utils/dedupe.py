@@ -0,0 +1,116 @@
+import os
+import re
+import zlib
+from typing import Callable, Iterable
+
+DEFAULT_THRESHOLD = float(os.getenv("DEDUPE_SIMILARITY_THRESHOLD", "0.7"))
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace"""
+    return _WHITESPACE_RE.sub(" ", _NON_WORD_RE.sub(" ", text.lower())).strip()
+
+
+def shingles(normalized: str, size: int = 4) -> frozenset:
+    """Character n-grams of already normalized text"""
+    if len(normalized) <= size:
+        return frozenset([normalized])
+    return frozenset(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+
+
+def _lsh_shape(num_perm: int, threshold: float):
+    """(bands, rows) whose LSH collision threshold sits comfortably below ``threshold``"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and (1 / (num_perm // rows)) ** (1 / rows) <= threshold * 0.85:
+            best = (num_perm // rows, rows)
+    return best
+
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate suppression in roughly linear time.
+
+    Exact duplicates (after normalization) are caught by a hash set. Other
+    items get a MinHash signature of their character shingles (one-
+    permutation hashing: each shingle is hashed once and binned, so the
+    cost is linear in the text length) and are only compared against
+    earlier items sharing an LSH band. A candidate counts as a duplicate
+    when the exact Jaccard similarity of the shingle sets is >= threshold.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, shingle_size: int = 4, num_perm: int = 64):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands, self.rows = _lsh_shape(num_perm, threshold)
+        self._exact = set()
+        self._buckets = [{} for _ in range(self.bands)]
+        self._kept_shingles = []
+
+    def _signature(self, items: frozenset) -> list:
+        bins = [None] * self.num_perm
+        for shingle in items:
+            h = zlib.crc32(shingle.encode("utf-8"))
+            b, value = h % self.num_perm, h // self.num_perm
+            if bins[b] is None or value < bins[b]:
+                bins[b] = value
+        # Densify: an empty bin borrows the next non-empty bin's value (wrapping
+        # around), tagged with the distance so borrowed values stay distinct
+        signature = [None] * self.num_perm
+        carry, distance = None, 0
+        for i in reversed(range(2 * self.num_perm)):
+            value = bins[i % self.num_perm]
+            if value is not None:
+                carry, distance = value, 0
+            else:
+                distance += 1
+            if i < self.num_perm:
+                signature[i] = (carry, distance)
+        return signature
+
+    def add(self, text: str) -> bool:
+        """Record ``text``; returns False if it near-duplicates an earlier item"""
+        normalized = normalize_text(text)
+        if normalized in self._exact:
+            return False
+
+        items = shingles(normalized, self.shingle_size)
+        signature = self._signature(items)
+        bands = [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+        candidates = set()
+        for bucket, band in zip(self._buckets, bands):
+            candidates.update(bucket.get(band, ()))
+        for candidate in candidates:
+            other = self._kept_shingles[candidate]
+            if len(items & other) / len(items | other) >= self.threshold:
+                return False
+
+        item_id = len(self._kept_shingles)
+        self._kept_shingles.append(items)
+        self._exact.add(normalized)
+        for bucket, band in zip(self._buckets, bands):
+            bucket.setdefault(band, []).append(item_id)
+        return True
+
+
+def dedupe(items: Iterable, key: Callable = None, threshold: float = DEFAULT_THRESHOLD, limit: int = None) -> list:
+    """
+    Keep the first of each group of near-duplicate items, preserving order.
+
+    ``key`` maps an item to the text compared (defaults to the item itself);
+    ``limit`` stops once that many unique items have been kept.
+    """
+    seen = NearDuplicateFilter(threshold=threshold)
+    unique = []
+    for item in items:
+        text = key(item) if key else item
+        if not text or seen.add(text):
+            unique.append(item)
+            if limit is not None and len(unique) >= limit:
+                break
+    return unique
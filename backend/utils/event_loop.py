@@ -0,0 +1,52 @@
+import os
+import asyncio
+import logging
+import threading
+import contextvars
+
+logger = logging.getLogger(__name__)
+
+# PROVIDER_CLIENT_MODE=async sends the blocking provider clients through
+# their asyncio implementations on the shared background loop
+ASYNC_PROVIDERS = os.getenv("PROVIDER_CLIENT_MODE", "sync").lower() == "async"
+
+_loop = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide background event loop, starting it on first use"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="provider-event-loop", daemon=True)
+            thread.start()
+            _loop = loop
+            logger.info("Background provider event loop started")
+        return _loop
+
+
+async def _in_context(values, coro):
+    # Tasks on the loop don't inherit the submitting thread's context vars
+    # (e.g. the LLM cache bypass flag), so copy them across explicitly
+    for var, value in values:
+        var.set(value)
+    return await coro
+
+
+def run_sync(coro, timeout: float = None):
+    """Run a coroutine on the background loop and block for its result"""
+    context = list(contextvars.copy_context().items())
+    future = asyncio.run_coroutine_threadsafe(_in_context(context, coro), get_loop())
+    try:
+        return future.result(timeout)
+    except Exception:
+        future.cancel()
+        raise
+
+
+def submit(coro):
+    """Schedule a coroutine on the background loop; returns a concurrent Future"""
+    context = list(contextvars.copy_context().items())
+    return asyncio.run_coroutine_threadsafe(_in_context(context, coro), get_loop())
@@ -0,0 +1,142 @@
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies (seconds) for percentile estimates"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float, default: float = None) -> Optional[float]:
+        """Nearest-rank percentile, or ``default`` until ``min_samples`` are recorded"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return default
+        rank = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+        return samples[rank]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count = len(self._samples)
+        return {
+            "samples": count,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99)
+        }
+
+
+class HedgeStats:
+    """Counters describing how often hedged calls fire and win"""
+
+    def __init__(self):
+        self.calls = 0
+        self.hedges = 0
+        self.secondary_wins = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def count(self, hedged: bool, winner: Optional[str]):
+        with self._lock:
+            self.calls += 1
+            self.hedges += hedged
+            self.secondary_wins += winner == "secondary"
+            self.timeouts += winner is None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "secondary_wins": self.secondary_wins,
+                "timeouts": self.timeouts
+            }
+
+
+async def hedged_call(primary: Callable[[], Awaitable], secondary: Callable[[], Awaitable],
+                      hedge_after: float, deadline: float,
+                      is_success: Callable = lambda result: True,
+                      primary_latency: LatencyTracker = None) -> Dict:
+    """
+    Run ``primary`` and hedge with ``secondary`` if it is slow or fails.
+
+    ``secondary`` starts once ``hedge_after`` seconds pass without a primary
+    answer, or as soon as the primary returns an unsuccessful result. The
+    first successful result wins and the other call is cancelled. If nothing
+    succeeds, the last result to finish is returned. Within ``deadline``
+    seconds the result is returned. ``result`` is None if no call finished
+    in time. A successful primary's latency is recorded in
+    ``primary_latency``, and so is the time a losing primary had run when
+    it was cancelled, as a lower bound.
+
+    Returns ``{"result", "winner", "hedged", "elapsed"}``. ``winner`` is
+    "primary", "secondary" or None.
+    """
+    started = time.monotonic()
+    end = started + deadline
+    roles = {}
+
+    async def timed(factory):
+        begin = time.monotonic()
+        result = await factory()
+        return result, time.monotonic() - begin
+
+    primary_task = asyncio.ensure_future(timed(primary))
+    roles[primary_task] = "primary"
+    pending = {primary_task}
+    hedged = False
+    last = None, None
+
+    try:
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_for = remaining if hedged else min(remaining, max(0.0, hedge_after - (time.monotonic() - started)))
+            done, pending = await asyncio.wait(pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                role = roles[task]
+                try:
+                    result, elapsed = task.result()
+                except Exception as e:
+                    logger.warning(f"Hedged {role} call raised: {str(e)}")
+                    continue
+                if is_success(result):
+                    if role == "primary" and primary_latency is not None:
+                        primary_latency.record(elapsed)
+                    return {"result": result, "winner": role, "hedged": hedged,
+                            "elapsed": time.monotonic() - started}
+                last = result, role
+
+            # Hedge when the primary is slow, or fail over when it returned an error
+            if not hedged and (primary_task.done() or time.monotonic() - started >= hedge_after):
+                hedged = True
+                secondary_task = asyncio.ensure_future(timed(secondary))
+                roles[secondary_task] = "secondary"
+                pending.add(secondary_task)
+
+        result, role = last
+        return {"result": result, "winner": role, "hedged": hedged, "elapsed": time.monotonic() - started}
+    finally:
+        # A primary still running when we give up took at least this long; leaving
+        # it out would bias the percentile that sets hedge_after low
+        if primary_latency is not None and not primary_task.done():
+            primary_latency.record(time.monotonic() - started)
+        for task in roles:
+            if not task.done():
+                task.cancel()
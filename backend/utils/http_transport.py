@@ -0,0 +1,282 @@
+import os
+import asyncio
+import logging
+import time
+import threading
+import contextvars
+from collections import OrderedDict
+from typing import Dict
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.circuit_breaker import get_breaker
+from utils.rate_limiter import RATE_LIMIT_ENABLED, RateLimitExceeded, rate_limiter
+from utils.metrics import PROVIDER_LATENCY
+
+logger = logging.getLogger(__name__)
+
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+MAX_HOSTS = int(os.getenv("HTTP_MAX_HOSTS", "64"))
+RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+# Monotonic deadline of the work the current call belongs to (e.g. an
+# analysis gather stage); provider timeouts never run past it
+request_deadline = contextvars.ContextVar("request_deadline", default=None)
+# What the current provider calls are for (e.g. "ask", "analysis"); adaptive
+# timeouts learn latency per class and call-site timeout
+call_class = contextvars.ContextVar("call_class", default="default")
+
+# Pooled sessions keyed by scheme://host; least recently used hosts are closed
+_sessions = OrderedDict()
+_stats = {}
+_lock = threading.Lock()
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _build_session() -> requests.Session:
+    # Connect errors are always retried; read/status retries only apply to
+    # idempotent methods, so POSTs to the LLM providers are never duplicated
+    retry = Retry(
+        total=RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the keep-alive session for the URL's host"""
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _build_session()
+            _stats.setdefault(key, {"requests": 0, "errors": 0})
+            while len(_sessions) > MAX_HOSTS:
+                old_key, old_session = _sessions.popitem(last=False)
+                old_session.close()
+                logger.debug(f"Closed idle HTTP session for {old_key}")
+        else:
+            _sessions.move_to_end(key)
+        return session
+
+
+def _is_upstream_failure(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def _call_class(ceiling: float) -> str:
+    return f"{call_class.get()}:{ceiling:g}"
+
+
+def _record_provider_call(breaker, provider: str, status_code, elapsed: float, latency_class: str,
+                          timed_out: bool = False):
+    """Feed a finished provider call to its breaker and latency histogram; ``status_code`` None means it raised"""
+    if timed_out:
+        breaker.record_timeout(elapsed, latency_class)
+        PROVIDER_LATENCY.observe(elapsed, provider=provider, outcome="timeout")
+    elif status_code is None:
+        breaker.record_failure()
+        PROVIDER_LATENCY.observe(elapsed, provider=provider, outcome="error")
+    elif _is_upstream_failure(status_code):
+        breaker.record_failure()
+        PROVIDER_LATENCY.observe(elapsed, provider=provider, outcome=f"http_{status_code}")
+    else:
+        breaker.record_success(elapsed, latency_class)
+        PROVIDER_LATENCY.observe(elapsed, provider=provider, outcome="ok")
+
+
+def _time_left(breaker):
+    """Seconds until ``request_deadline`` (None without one); releases the breaker if it has passed"""
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        if breaker:
+            breaker.release()
+        raise TimeoutError("Deadline exceeded before the request was sent")
+    return remaining
+
+
+def request(method: str, url: str, timeout=None, provider: str = None, api_key: str = None,
+            tokens: int = 0, **kwargs) -> requests.Response:
+    """
+    Send a request over the pooled session for ``url``'s host.
+
+    ``timeout`` is the read timeout in seconds (default HTTP_READ_TIMEOUT);
+    the connect timeout is always HTTP_CONNECT_TIMEOUT. Passing ``provider``
+    routes the call through that provider's circuit breaker: it raises
+    CircuitOpenError while the circuit is open, and the read timeout shrinks
+    to what the provider's observed latency for this ``call_class`` and
+    ``timeout`` justifies. The call then waits
+    for the rate limit of ``provider``/``api_key``. ``tokens`` is the
+    estimated LLM token usage counted against the per-minute budget.
+    Under a ``request_deadline`` the rate-limit wait and both timeouts are
+    capped by the time left.
+    """
+    key = _host_key(url)
+    session = get_session(url)
+    read_timeout = timeout or READ_TIMEOUT
+    latency_class = _call_class(read_timeout)
+    breaker = get_breaker(provider) if provider else None
+    if breaker:
+        breaker.allow()
+        read_timeout = breaker.timeout(read_timeout, latency_class)
+        if RATE_LIMIT_ENABLED:
+            # Never queue past the deadline; fails fast when it has already passed
+            max_wait = _time_left(breaker)
+            try:
+                rate_limiter.acquire(provider, api_key, tokens, max_wait=max_wait)
+            except RateLimitExceeded:
+                breaker.release()
+                raise
+    connect_timeout = CONNECT_TIMEOUT
+    remaining = _time_left(breaker)
+    if remaining is not None:
+        connect_timeout, read_timeout = min(connect_timeout, remaining), min(read_timeout, remaining)
+    started = time.monotonic()
+    try:
+        response = session.request(method, url, timeout=(connect_timeout, read_timeout), **kwargs)
+    except Exception as e:
+        with _lock:
+            _stats[key]["requests"] += 1
+            _stats[key]["errors"] += 1
+        if breaker:
+            _record_provider_call(breaker, provider, None, time.monotonic() - started, latency_class,
+                                  timed_out=isinstance(e, requests.Timeout))
+        raise
+    with _lock:
+        _stats[key]["requests"] += 1
+    if breaker:
+        _record_provider_call(breaker, provider, response.status_code, time.monotonic() - started, latency_class)
+    return response
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def transport_stats() -> Dict:
+    """Per-host request counts and how many of them reused a pooled connection"""
+    with _lock:
+        result = {}
+        for key, counters in _stats.items():
+            session = _sessions.get(key)
+            opened = _connections_opened(session) if session is not None else None
+            entry = dict(counters, pooled=session is not None)
+            if opened is not None:
+                entry["connections_opened"] = opened
+                entry["connections_reused"] = max(0, counters["requests"] - opened)
+            result[key] = entry
+        return result
+
+
+def _connections_opened(session: requests.Session):
+    try:
+        adapter = session.get_adapter("https://")
+        pools = adapter.poolmanager.pools
+        return sum(pools[pool_key].num_connections for pool_key in pools.keys())
+    except Exception:
+        return None
+
+
+# --- asyncio transport -------------------------------------------------------
+
+ASYNC_POOL_LIMIT = int(os.getenv("ASYNC_HTTP_POOL_LIMIT", "500"))
+ASYNC_POOL_LIMIT_PER_HOST = int(os.getenv("ASYNC_HTTP_POOL_LIMIT_PER_HOST", "100"))
+
+# aiohttp sessions are bound to the loop that created them
+_async_sessions = {}
+
+
+def get_async_session():
+    """Return the aiohttp session for the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=ASYNC_POOL_LIMIT, limit_per_host=ASYNC_POOL_LIMIT_PER_HOST,
+                                         keepalive_timeout=60)
+        session = _async_sessions[loop] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+async def close_async_session():
+    """Close the running loop's aiohttp session, e.g. when an ASGI server shuts down"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def async_request(method: str, url: str, timeout=None, provider: str = None, api_key: str = None,
+                        tokens: int = 0, **kwargs):
+    """
+    Async counterpart of ``request``; returns ``(status_code, body)``.
+
+    The body is parsed JSON for JSON responses and text otherwise, read
+    before the connection is released back to the pool.
+    """
+    key = _host_key(url)
+    total_timeout = timeout or READ_TIMEOUT
+    latency_class = _call_class(total_timeout)
+    breaker = get_breaker(provider) if provider else None
+    if breaker:
+        breaker.allow()
+        total_timeout = breaker.timeout(total_timeout, latency_class)
+        if RATE_LIMIT_ENABLED:
+            max_wait = _time_left(breaker)
+            try:
+                await rate_limiter.acquire_async(provider, api_key, tokens, max_wait=max_wait)
+            except (RateLimitExceeded, asyncio.CancelledError):
+                breaker.release()
+                raise
+    remaining = _time_left(breaker)
+    if remaining is not None:
+        total_timeout = min(total_timeout, remaining)
+    with _lock:
+        _stats.setdefault(key, {"requests": 0, "errors": 0})
+        _stats[key]["requests"] += 1
+
+    client_timeout = aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, total=total_timeout)
+    started = time.monotonic()
+    try:
+        async with get_async_session().request(method, url, timeout=client_timeout, **kwargs) as response:
+            if response.content_type == "application/json":
+                body = await response.json()
+            else:
+                body = await response.text()
+    except asyncio.CancelledError:
+        # Cancelled by the caller (e.g. a hedged call that lost): no outcome
+        if breaker:
+            breaker.release()
+        raise
+    except Exception as e:
+        with _lock:
+            _stats[key]["errors"] += 1
+        if breaker:
+            _record_provider_call(breaker, provider, None, time.monotonic() - started, latency_class,
+                                  timed_out=isinstance(e, asyncio.TimeoutError))
+        raise
+    if breaker:
+        _record_provider_call(breaker, provider, response.status, time.monotonic() - started, latency_class)
+    return response.status, body
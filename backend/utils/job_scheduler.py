@@ -0,0 +1,136 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITIES = {
+    "interactive": 0,
+    "batch": 10,
+}
+
+
+class QueueFullError(Exception):
+    """Raised when the scheduler queue is at capacity"""
+
+
+class JobScheduler:
+    """
+    Process-wide worker pool with a bounded priority queue.
+
+    Jobs are ordered by (priority, submission order), so interactive
+    requests overtake queued batch work but never preempt running jobs.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 100):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._heap = []  # (priority, seq, job_id, fn, args, enqueued_at)
+        self._running = {}  # job_id -> started_at
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._shutdown = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._started = 0
+
+    def submit(self, job_id: str, fn: Callable, *args, priority: str = "interactive"):
+        """Queue ``fn(*args)``; raises QueueFullError when the queue is full"""
+        rank = PRIORITIES.get(priority, PRIORITIES["interactive"])
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Scheduler is shut down")
+            if len(self._heap) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(f"Analysis queue is full ({self.max_queue} jobs waiting)")
+            self._ensure_workers()
+            heapq.heappush(self._heap, (rank, next(self._seq), job_id, fn, args, time.monotonic()))
+            self.submitted += 1
+            self._cond.notify()
+
+    def available_slots(self) -> int:
+        with self._cond:
+            return self.max_queue - len(self._heap)
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position among waiting jobs, 0 if running, None if unknown"""
+        with self._cond:
+            if job_id in self._running:
+                return 0
+            for position, item in enumerate(sorted(self._heap), start=1):
+                if item[2] == job_id:
+                    return position
+        return None
+
+    def stats(self) -> Dict:
+        with self._cond:
+            now = time.monotonic()
+            oldest_wait = max((now - item[5] for item in self._heap), default=0.0)
+            return {
+                "workers": self.workers,
+                "queue_depth": len(self._heap),
+                "max_queue": self.max_queue,
+                "running": len(self._running),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_seconds": round(self._total_wait / self._started, 3) if self._started else 0.0,
+                "max_wait_seconds": round(self._max_wait, 3),
+                "oldest_queued_seconds": round(oldest_wait, 3)
+            }
+
+    def shutdown(self, wait: bool = True):
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _ensure_workers(self):
+        # Threads start lazily so importing routes doesn't spawn workers
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, name=f"analysis-worker-{len(self._threads)}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown and not self._heap:
+                    return
+                _, _, job_id, fn, args, enqueued_at = heapq.heappop(self._heap)
+                started_at = time.monotonic()
+                waited = started_at - enqueued_at
+                self._running[job_id] = started_at
+                self._started += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+
+            ok = True
+            try:
+                fn(*args)
+            except Exception as e:
+                ok = False
+                logger.error(f"Scheduled job {job_id} raised: {str(e)}")
+            finally:
+                with self._cond:
+                    self._running.pop(job_id, None)
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
@@ -0,0 +1,578 @@
+import os
+import json
+import uuid
+import zlib
+import time
+import atexit
+import sqlite3
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fields kept as indexed columns; everything else lives in the compressed blob
+INDEXED_FIELDS = ("status", "progress", "created_at")
+
+# Jobs in these states no longer change and may leave memory
+FINISHED_STATUSES = ("completed", "failed")
+
+
+def _pack(data: Dict) -> bytes:
+    return zlib.compress(json.dumps(data, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> Dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8")) if blob else {}
+
+
+class JobStore:
+    """
+    Interface for analysis job persistence.
+
+    Jobs are plain dicts. ``update`` merges top-level fields, so callers never
+    mutate a job in place and every backend sees each change.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400, purge_interval: float = 300):
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self.expired = 0
+        self.orphaned = 0
+        # Wakes local event subscribers; other processes are seen by polling
+        self._event_cond = threading.Condition()
+
+    def create(self, job_id: str, job: Dict):
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields):
+        raise NotImplementedError
+
+    def delete(self, job_id: str):
+        raise NotImplementedError
+
+    def list_by_status(self, status: str, limit: int = 100) -> List[str]:
+        """Job ids with the given status, oldest first"""
+        raise NotImplementedError
+
+    def purge_expired(self, ttl_seconds: float = None) -> int:
+        """Delete jobs not updated within the TTL; returns how many were removed"""
+        raise NotImplementedError
+
+    def recover_orphans(self) -> int:
+        """Fail unfinished jobs whose owning process is gone; returns how many"""
+        return 0
+
+    def append_event(self, job_id: str, event: str, data: Dict) -> int:
+        """Append to the job's event log; returns the new event id (1-based). KeyError for an unknown job"""
+        raise NotImplementedError
+
+    def events_since(self, job_id: str, after_id: int = 0) -> List[Tuple[int, str, Dict]]:
+        """``(event_id, event, data)`` tuples with id greater than ``after_id``"""
+        raise NotImplementedError
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def publish(self, job_id: str, event: str, data: Dict) -> int:
+        """Append an event and wake subscribers waiting in this process"""
+        event_id = self.append_event(job_id, event, data)
+        with self._event_cond:
+            self._event_cond.notify_all()
+        return event_id
+
+    def wait_for_events(self, job_id: str, after_id: int = 0, timeout: float = 15.0,
+                        poll_interval: float = 0.5) -> List[Tuple[int, str, Dict]]:
+        """Block until events newer than ``after_id`` exist or ``timeout`` passes"""
+        deadline = time.monotonic() + timeout
+        while True:
+            events = self.events_since(job_id, after_id)
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return events
+            with self._event_cond:
+                self._event_cond.wait(min(poll_interval, remaining))
+
+    def stats(self) -> Dict:
+        return {"backend": type(self).__name__, "ttl_seconds": self.ttl_seconds, "expired": self.expired,
+                "orphaned": self.orphaned}
+
+    def maybe_purge(self):
+        """Run purge_expired at most once per purge_interval"""
+        now = time.monotonic()
+        if now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        try:
+            removed = self.purge_expired()
+            self.expired += removed
+            if removed:
+                logger.info(f"Purged {removed} expired analysis jobs")
+            self.recover_orphans()
+        except Exception as e:
+            logger.error(f"Job purge failed: {str(e)}")
+
+
+class MemoryJobStore(JobStore):
+    """
+    Single-process store; jobs are lost on restart.
+
+    Queued and running jobs always stay in memory. Finished jobs form an LRU
+    hot set bounded by ``max_resident`` jobs and ``max_resident_bytes`` of
+    serialized JSON (events included). The least recently used ones beyond
+    it are spilled, zlib-compressed, to an append-only segment file in
+    ``spill_dir`` and read back transparently when accessed again. Without
+    a ``spill_dir`` they are dropped instead. The segment is an unlinked
+    temporary file private to the process, so workers sharing the
+    directory never touch each other's jobs.
+    """
+
+    # Rewrite the segment once this much of it belongs to deleted or rehydrated jobs
+    COMPACT_MIN_DEAD_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, max_resident: int = 200, max_resident_bytes: int = 64 * 1024 * 1024,
+                 spill_dir: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self.max_resident = max_resident
+        self.max_resident_bytes = max_resident_bytes
+        self.spill_dir = spill_dir
+        self._jobs = {}
+        self._updated = {}
+        self._events = {}
+        self._finished = OrderedDict()  # resident finished job_id -> serialized bytes, LRU first
+        self._finished_bytes = 0
+        self._spilled = {}  # job_id -> (offset, length, status, updated_at)
+        self._segment = None
+        self._segment_pid = None
+        self._segment_bytes = 0
+        self._dead_bytes = 0
+        self.counters = {"spilled": 0, "rehydrated": 0, "dropped": 0, "compactions": 0}
+        self._lock = threading.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def create(self, job_id: str, job: Dict):
+        with self._lock:
+            self._forget(job_id)
+            self._jobs[job_id] = dict(job)
+            self._updated[job_id] = time.time()
+            self._track(job_id)
+        self.maybe_purge()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            if not self._resident(job_id):
+                return None
+            if job_id in self._finished:
+                self._finished.move_to_end(job_id)
+            return dict(self._jobs[job_id])
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            if not self._resident(job_id):
+                raise KeyError(job_id)
+            self._jobs[job_id].update(fields)
+            self._updated[job_id] = time.time()
+            self._track(job_id)
+
+    def delete(self, job_id: str):
+        with self._lock:
+            self._forget(job_id)
+
+    def append_event(self, job_id: str, event: str, data: Dict) -> int:
+        with self._lock:
+            if not self._resident(job_id):
+                raise KeyError(job_id)
+            log = self._events.setdefault(job_id, [])
+            log.append((len(log) + 1, event, data))
+            if job_id in self._finished:
+                self._track(job_id)
+            return len(log)
+
+    def events_since(self, job_id: str, after_id: int = 0) -> List[Tuple[int, str, Dict]]:
+        with self._lock:
+            self._resident(job_id)
+            return list(self._events.get(job_id, [])[max(0, after_id):])
+
+    def list_by_status(self, status: str, limit: int = 100) -> List[str]:
+        with self._lock:
+            ids = [job_id for job_id, job in self._jobs.items() if job.get("status") == status]
+            ids += [job_id for job_id, entry in self._spilled.items() if entry[2] == status]
+            updated = lambda job_id: self._updated[job_id] if job_id in self._updated else self._spilled[job_id][3]
+            ids.sort(key=updated)
+            return ids[:limit]
+
+    def purge_expired(self, ttl_seconds: float = None) -> int:
+        cutoff = time.time() - (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            expired = [job_id for job_id, updated in self._updated.items() if updated < cutoff]
+            expired += [job_id for job_id, entry in self._spilled.items() if entry[3] < cutoff]
+            for job_id in expired:
+                self._forget(job_id)
+            self._maybe_compact()
+        return len(expired)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(
+                super().stats(),
+                resident_jobs=len(self._jobs),
+                resident_finished_jobs=len(self._finished),
+                resident_finished_bytes=self._finished_bytes,
+                max_resident=self.max_resident,
+                max_resident_bytes=self.max_resident_bytes,
+                spilled_jobs=len(self._spilled),
+                segment_bytes=self._segment_bytes,
+                segment_dead_bytes=self._dead_bytes,
+                **self.counters
+            )
+
+    # Callers below hold self._lock
+
+    def _forget(self, job_id: str):
+        self._jobs.pop(job_id, None)
+        self._updated.pop(job_id, None)
+        self._events.pop(job_id, None)
+        self._finished_bytes -= self._finished.pop(job_id, 0)
+        entry = self._spilled.pop(job_id, None)
+        if entry is not None:
+            self._dead_bytes += entry[1]
+
+    def _track(self, job_id: str):
+        """Account a finished job in the hot set, then spill whatever exceeds the limits"""
+        if self._jobs[job_id].get("status") not in FINISHED_STATUSES:
+            return
+        size = len(json.dumps([self._jobs[job_id], self._events.get(job_id, [])], default=str))
+        self._finished_bytes += size - self._finished.get(job_id, 0)
+        self._finished[job_id] = size
+        self._finished.move_to_end(job_id)
+        # The job just touched stays resident even if it alone exceeds the byte limit
+        while len(self._finished) > 1 and (len(self._finished) > self.max_resident
+                                           or self._finished_bytes > self.max_resident_bytes):
+            coldest = next(iter(self._finished))
+            if self.spill_dir:
+                self._spill(coldest)
+            else:
+                self._forget(coldest)
+                self.counters["dropped"] += 1
+
+    def _spill(self, job_id: str):
+        job = self._jobs.pop(job_id)
+        blob = _pack({"job": job, "events": self._events.pop(job_id, [])})
+        segment = self._segment_file()
+        segment.seek(self._segment_bytes)
+        segment.write(blob)
+        self._spilled[job_id] = (self._segment_bytes, len(blob), job.get("status"), self._updated.pop(job_id))
+        self._segment_bytes += len(blob)
+        self._finished_bytes -= self._finished.pop(job_id)
+        self.counters["spilled"] += 1
+
+    def _resident(self, job_id: str) -> bool:
+        """Bring a spilled job back into memory; False if the job doesn't exist"""
+        if job_id in self._jobs:
+            return True
+        if self._spilled:
+            self._segment_file()
+        entry = self._spilled.pop(job_id, None)
+        if entry is None:
+            return False
+        offset, length, _, updated = entry
+        self._segment.seek(offset)
+        record = _unpack(self._segment.read(length))
+        self._dead_bytes += length
+        self._jobs[job_id] = record["job"]
+        self._events[job_id] = [tuple(event) for event in record["events"]]
+        self._updated[job_id] = updated
+        self.counters["rehydrated"] += 1
+        self._track(job_id)
+        self._maybe_compact()
+        return True
+
+    def _maybe_compact(self):
+        """Rewrite the segment without dead records once they are most of it"""
+        if self._segment is None or self._dead_bytes < max(self.COMPACT_MIN_DEAD_BYTES, self._segment_bytes / 2):
+            return
+        segment = self._segment_file()
+        out = self._new_segment()
+        spilled = {}
+        position = 0
+        for job_id, (offset, length, status, updated) in self._spilled.items():
+            segment.seek(offset)
+            out.write(segment.read(length))
+            spilled[job_id] = (position, length, status, updated)
+            position += length
+        segment.close()
+        self._segment = out
+        self._spilled = spilled
+        self._segment_bytes = position
+        self._dead_bytes = 0
+        self.counters["compactions"] += 1
+
+    def _new_segment(self):
+        return tempfile.TemporaryFile(prefix="job_spill-", suffix=".seg", dir=self.spill_dir)
+
+    def _segment_file(self):
+        """This process's segment; a forked worker starts its own rather than share the parent's file offset"""
+        if self._segment_pid != os.getpid():
+            if self._spilled:
+                self.counters["dropped"] += len(self._spilled)
+                self._spilled = {}
+            self._segment = self._new_segment()
+            self._segment_pid = os.getpid()
+            self._segment_bytes = 0
+            self._dead_bytes = 0
+        return self._segment
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite-backed store shared by every worker process on the host.
+
+    WAL mode lets status polls read while an analysis worker writes. Status
+    and progress are plain columns so frequent progress updates don't
+    rewrite the zlib-compressed JSON payload.
+
+    Every job records the process that created it (and runs it). Processes
+    heartbeat into ``job_owners``; unfinished jobs whose owner exited or
+    stopped heartbeating for ``owner_stale_seconds`` are marked failed, at
+    startup and on each purge, so their pollers and SSE streams end.
+    """
+
+    ORPHAN_ERROR = "Interrupted by restart"
+
+    def __init__(self, path: str, heartbeat_interval: float = 10, owner_stale_seconds: float = 60, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.heartbeat_interval = heartbeat_interval
+        self.owner_stale_seconds = owner_stale_seconds
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._owner_id = None
+        self._owner_pid = None
+        self._owner_lock = threading.Lock()
+        self._released = threading.Event()
+        self._init_schema()
+        self.recover_orphans()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # A connection inherited through fork() belongs to the parent; it is
+        # left unclosed (closing it could release the parent's locks) and the
+        # child opens its own
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                progress INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT,
+                updated_at REAL NOT NULL,
+                data BLOB
+            )
+        """)
+        if "owner" not in [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]:
+            conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_owners (
+                owner TEXT PRIMARY KEY,
+                heartbeat REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, updated_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs(updated_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_events (
+                job_id TEXT NOT NULL,
+                event_id INTEGER NOT NULL,
+                event TEXT NOT NULL,
+                data TEXT,
+                PRIMARY KEY (job_id, event_id)
+            ) WITHOUT ROWID
+        """)
+
+    def _owner(self) -> str:
+        """This process's owner id; a forked worker gets its own, with its own heartbeat"""
+        with self._owner_lock:
+            if self._owner_pid != os.getpid():
+                self._owner_id = uuid.uuid4().hex
+                self._owner_pid = os.getpid()
+                self._released.clear()
+                self._heartbeat()
+                threading.Thread(target=self._heartbeat_loop, args=(self._owner_id,),
+                                 name="job-store-heartbeat", daemon=True).start()
+                atexit.register(self.release)
+            return self._owner_id
+
+    def _heartbeat(self):
+        self._conn().execute("INSERT OR REPLACE INTO job_owners (owner, heartbeat) VALUES (?, ?)",
+                             (self._owner_id, time.time()))
+
+    def _heartbeat_loop(self, owner_id: str):
+        while not self._released.wait(self.heartbeat_interval) and self._owner_id == owner_id:
+            try:
+                self._heartbeat()
+            except Exception as e:
+                logger.error(f"Job store heartbeat failed: {str(e)}")
+
+    def release(self):
+        """Give up ownership (at exit) so another process can fail this one's unfinished jobs right away"""
+        with self._owner_lock:
+            if self._owner_pid != os.getpid() or self._released.is_set():
+                return
+            self._released.set()
+            self._conn().execute("DELETE FROM job_owners WHERE owner = ?", (self._owner_id,))
+
+    def recover_orphans(self) -> int:
+        cutoff = time.time() - self.owner_stale_seconds
+        conn = self._conn()
+        conn.execute("DELETE FROM job_owners WHERE heartbeat < ?", (cutoff,))
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        rows = conn.execute(
+            f"SELECT job_id FROM jobs WHERE status NOT IN ({placeholders}) "
+            "AND (owner IS NULL OR owner NOT IN (SELECT owner FROM job_owners))",
+            FINISHED_STATUSES
+        ).fetchall()
+        for (job_id,) in rows:
+            self.update(job_id, status="failed", error=self.ORPHAN_ERROR)
+            self.publish(job_id, "failed", {"error": self.ORPHAN_ERROR})
+        if rows:
+            self.orphaned += len(rows)
+            logger.warning(f"⚠️ Marked {len(rows)} analysis jobs from stopped processes as failed")
+        return len(rows)
+
+    @staticmethod
+    def _split(job: Dict):
+        rest = {k: v for k, v in job.items() if k not in INDEXED_FIELDS}
+        return job.get("status", "queued"), int(job.get("progress", 0)), job.get("created_at"), rest
+
+    def create(self, job_id: str, job: Dict):
+        status, progress, created_at, rest = self._split(job)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO jobs (job_id, status, progress, created_at, updated_at, data, owner) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, status, progress, created_at, time.time(), _pack(rest), self._owner())
+        )
+        self.maybe_purge()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT status, progress, created_at, data FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = _unpack(row[3])
+        job.update(status=row[0], progress=row[1], created_at=row[2])
+        return job
+
+    def update(self, job_id: str, **fields):
+        conn = self._conn()
+        columns = {k: v for k, v in fields.items() if k in INDEXED_FIELDS}
+        rest = {k: v for k, v in fields.items() if k not in INDEXED_FIELDS}
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            assignments = [f"{name} = ?" for name in columns] + ["updated_at = ?"]
+            params = list(columns.values()) + [time.time()]
+            if rest:
+                row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if row is None:
+                    raise KeyError(job_id)
+                data = _unpack(row[0])
+                data.update(rest)
+                assignments.append("data = ?")
+                params.append(_pack(data))
+            cursor = conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE job_id = ?",
+                                  params + [job_id])
+            if cursor.rowcount == 0:
+                raise KeyError(job_id)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, job_id: str):
+        conn = self._conn()
+        conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+
+    def append_event(self, job_id: str, event: str, data: Dict) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is None:
+                raise KeyError(job_id)
+            event_id = conn.execute(
+                "SELECT COALESCE(MAX(event_id), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            conn.execute("INSERT INTO job_events (job_id, event_id, event, data) VALUES (?, ?, ?, ?)",
+                         (job_id, event_id, event, json.dumps(data, separators=(",", ":"), default=str)))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return event_id
+
+    def events_since(self, job_id: str, after_id: int = 0) -> List[Tuple[int, str, Dict]]:
+        rows = self._conn().execute(
+            "SELECT event_id, event, data FROM job_events WHERE job_id = ? AND event_id > ? ORDER BY event_id",
+            (job_id, after_id)
+        ).fetchall()
+        return [(row[0], row[1], json.loads(row[2])) for row in rows]
+
+    def list_by_status(self, status: str, limit: int = 100) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT job_id FROM jobs WHERE status = ? ORDER BY updated_at LIMIT ?", (status, limit)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def purge_expired(self, ttl_seconds: float = None) -> int:
+        cutoff = time.time() - (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        conn = self._conn()
+        cursor = conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+        conn.execute("DELETE FROM job_events WHERE job_id NOT IN (SELECT job_id FROM jobs)")
+        return cursor.rowcount
+
+    def __contains__(self, job_id: str) -> bool:
+        return self._conn().execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+
+def create_job_store() -> JobStore:
+    """Build the job store selected by JOB_STORE_BACKEND (sqlite or memory)"""
+    backend = os.getenv("JOB_STORE_BACKEND", "sqlite").lower()
+    ttl = float(os.getenv("JOB_TTL_SECONDS", "86400"))
+
+    if backend == "memory":
+        spill = os.getenv("JOB_STORE_SPILL", "true").lower() == "true"
+        default_spill_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+        logger.info("Using in-memory job store")
+        return MemoryJobStore(
+            ttl_seconds=ttl,
+            max_resident=int(os.getenv("JOB_STORE_MAX_RESIDENT", "200")),
+            max_resident_bytes=int(float(os.getenv("JOB_STORE_MAX_RESIDENT_MB", "64")) * 1024 * 1024),
+            spill_dir=os.getenv("JOB_STORE_SPILL_DIR", default_spill_dir) if spill else None
+        )
+    if backend == "sqlite":
+        default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "data", "analysis_jobs.db")
+        path = os.getenv("JOB_STORE_PATH", default_path)
+        logger.info(f"Using SQLite job store at {path}")
+        return SQLiteJobStore(path, ttl_seconds=ttl,
+                              owner_stale_seconds=float(os.getenv("JOB_OWNER_STALE_SECONDS", "60")))
+    raise ValueError(f"Unknown JOB_STORE_BACKEND '{backend}'")
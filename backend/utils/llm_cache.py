@@ -0,0 +1,209 @@
+import os
+import re
+import json
+import zlib
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import contextvars
+from typing import Dict, Optional
+
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+# For call sites that don't pass ``cache``: "on" caches deterministic
+# (temperature 0) calls only, "all" caches sampled ones too, "off" none
+LLM_CACHE_DEFAULT = os.getenv("LLM_CACHE_DEFAULT", "on").lower()
+
+# Set per request/job; skips cache reads but still stores the fresh response
+llm_cache_bypass = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+# Timestamps embedded in prompts (scrape dates, article publishedAt, ...)
+# would otherwise make every prompt unique
+_TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def make_cache_key(provider: str, model: str, messages: list, temperature: float, max_tokens: int) -> str:
+    """Stable hash of a completion request, insensitive to whitespace and timestamps"""
+    normalized = [
+        {
+            "role": message.get("role"),
+            "content": _WHITESPACE_RE.sub(" ", _TIMESTAMP_RE.sub("<ts>", str(message.get("content", "")))).strip()
+        }
+        for message in messages
+    ]
+    material = json.dumps({
+        "provider": provider,
+        "model": model,
+        "messages": normalized,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def use_llm_cache(cache: Optional[bool], temperature: float = None) -> bool:
+    """Resolve a call site's ``cache`` argument against the global settings"""
+    if not LLM_CACHE_ENABLED:
+        return False
+    if cache is not None:
+        return cache
+    # A sampled completion replayed from the cache would always be the same one
+    return LLM_CACHE_DEFAULT == "all" or (LLM_CACHE_DEFAULT == "on" and not temperature)
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for LLM completions.
+
+    An in-memory LRU sits in front of a SQLite file with the same TTL and a
+    total size cap; least recently used rows are dropped first when the
+    cap is exceeded. Disk hits are promoted to memory.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400, memory_entries: int = 256,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = TTLCache(max_entries=memory_entries, ttl=ttl)
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_evictions = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL,
+                value BLOB NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_or_compute(self, key: str, compute, should_cache=None):
+        """
+        Return the cached response for ``key`` or compute and store it.
+
+        Concurrent callers for one key share a single computation. When the
+        current context bypasses the cache the response is recomputed and
+        overwrites the cached one.
+        """
+        if llm_cache_bypass.get():
+            value = compute()
+            if should_cache is None or should_cache(value):
+                self.set(key, value)
+            return value
+
+        def load():
+            cached = self._disk_get(key)
+            if cached is not None:
+                return cached
+            value = compute()
+            if should_cache is None or should_cache(value):
+                self._disk_set(key, value)
+            return value
+
+        return self.memory.get_or_load(key, load, should_cache=should_cache)
+
+    def lookup(self, key: str):
+        """Return a cached response from either tier, or None"""
+        if llm_cache_bypass.get():
+            return None
+        value = self.memory.get(key)
+        if value is None:
+            value = self._disk_get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value):
+        self.memory.set(key, value)
+        self._disk_set(key, value)
+
+    def _disk_get(self, key: str):
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT created_at, value FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or row[0] < now - self.ttl:
+                self.disk_misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.disk_hits += 1
+            return json.loads(zlib.decompress(row[1]).decode("utf-8"))
+        except Exception as e:
+            logger.error(f"LLM cache read failed: {str(e)}")
+            return None
+
+    def _disk_set(self, key: str, value):
+        try:
+            blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+            now = time.time()
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created_at, last_access, size, value) VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(blob), blob)
+            )
+            self._enforce_limits(conn, now)
+        except Exception as e:
+            logger.error(f"LLM cache write failed: {str(e)}")
+
+    def _enforce_limits(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        # Drop least recently used rows until back under the cap
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.disk_evictions += 1
+
+    def stats(self) -> Dict:
+        try:
+            entries, size = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        except Exception:
+            entries, size = None, None
+        return {
+            "memory": self.memory.stats(),
+            "disk": {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_disk_bytes,
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "evictions": self.disk_evictions
+            }
+        }
+
+
+_default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "llm_cache.db")
+
+llm_cache = LLMResponseCache(
+    path=os.getenv("LLM_CACHE_PATH", _default_path),
+    ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+    memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256")),
+    max_disk_bytes=int(float(os.getenv("LLM_CACHE_MAX_DISK_MB", "256")) * 1024 * 1024)
+)
@@ -0,0 +1,235 @@
+import os
+import time
+import asyncio
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from utils.context_compactor import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Longest a call may queue for its turn before failing with RateLimitExceeded
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "10"))
+
+# Requests per second and tokens per minute per provider API key; 0 disables a limit
+DEFAULT_LIMITS = {
+    "asi1": {"rps": 2.0, "tpm": 0},
+    "groq": {"rps": 0.5, "tpm": 6000},
+    "anthropic": {"rps": 0.8, "tpm": 40000},
+    "newsapi": {"rps": 1.0, "tpm": 0},
+}
+
+# (key, rate per second, capacity, amount)
+Reservation = Tuple[str, float, float, float]
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call would have to queue longer than the max wait"""
+
+    def __init__(self, provider: str, max_wait: float):
+        super().__init__(f"{provider} rate limit: no slot within {max_wait:g}s")
+        self.provider = provider
+        self.max_wait = max_wait
+
+
+def request_tokens(messages: list, max_tokens: int) -> int:
+    """Tokens a chat completion may use: estimated prompt plus the completion cap"""
+    return sum(estimate_tokens(str(message.get("content", ""))) for message in messages) + (max_tokens or 0)
+
+
+def _provider_limits(provider: str) -> Dict[str, float]:
+    defaults = DEFAULT_LIMITS.get(provider, {"rps": 0, "tpm": 0})
+    prefix = f"RATE_LIMIT_{provider.upper()}"
+    rps = float(os.getenv(f"{prefix}_RPS", str(defaults["rps"])))
+    return {
+        "rps": rps,
+        "burst": float(os.getenv(f"{prefix}_BURST", str(max(1, int(rps * 2))))),
+        "tpm": float(os.getenv(f"{prefix}_TPM", str(defaults["tpm"]))),
+    }
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, capacity: float) -> float:
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class MemoryBucketStore:
+    """Token buckets for this process only"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, reservations: List[Reservation], max_wait: float) -> Optional[float]:
+        """
+        Take ``amount`` from every bucket, or from none of them.
+
+        Buckets may go into debt: the returned wait is how long the caller
+        must sleep until its share has refilled, which queues concurrent
+        callers one after another. Returns None (nothing taken) when that
+        wait would exceed ``max_wait``.
+        """
+        now = time.time()
+        with self._lock:
+            updates, wait = [], 0.0
+            for key, rate, capacity, amount in reservations:
+                tokens, updated = self._buckets.get(key, (capacity, now))
+                tokens = _refill(tokens, updated, now, rate, capacity) - amount
+                updates.append((key, tokens))
+                wait = max(wait, -tokens / rate if tokens < 0 else 0.0)
+            if wait > max_wait:
+                return None
+            for key, tokens in updates:
+                self._buckets[key] = (tokens, now)
+            return wait
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets in a SQLite file shared by every worker process on the host.
+
+    Each reservation is a single ``BEGIN IMMEDIATE`` transaction, so the
+    processes draw from one budget per provider key.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, reservations: List[Reservation], max_wait: float) -> Optional[float]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            updates, wait = [], 0.0
+            for key, rate, capacity, amount in reservations:
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens = _refill(tokens, updated, now, rate, capacity) - amount
+                updates.append((key, tokens))
+                wait = max(wait, -tokens / rate if tokens < 0 else 0.0)
+            if wait > max_wait:
+                conn.execute("ROLLBACK")
+                return None
+            conn.executemany("INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                             [(key, tokens, now) for key, tokens in updates])
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class RateLimiter:
+    """
+    Per-provider, per-API-key request and token budgets.
+
+    Every call reserves one request and, for LLM providers, its estimated
+    tokens. Callers queue by sleeping until their reservation is due, up to
+    ``max_wait``.
+    """
+
+    def __init__(self, store, max_wait: float = RATE_LIMIT_MAX_WAIT):
+        self.store = store
+        self.max_wait = max_wait
+        self._limits = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _limits_for(self, provider: str) -> Dict[str, float]:
+        limits = self._limits.get(provider)
+        if limits is None:
+            limits = self._limits[provider] = _provider_limits(provider)
+        return limits
+
+    def _reservations(self, provider: str, api_key: str, tokens: int) -> List[Reservation]:
+        # Buckets are keyed by a hash so API keys never reach the shared store
+        key_id = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+        limits = self._limits_for(provider)
+        reservations = []
+        if limits["rps"] > 0:
+            reservations.append((f"{provider}:{key_id}:requests", limits["rps"], limits["burst"], 1))
+        if limits["tpm"] > 0 and tokens:
+            # A single oversized call can't need more than a full bucket
+            reservations.append((f"{provider}:{key_id}:tokens", limits["tpm"] / 60, limits["tpm"],
+                                 min(tokens, limits["tpm"])))
+        return reservations
+
+    def reserve(self, provider: str, api_key: str = None, tokens: int = 0, max_wait: float = None) -> float:
+        """
+        Reserve a slot; returns the seconds to wait before calling, or raises
+        RateLimitExceeded. ``max_wait`` (e.g. the time left before the
+        caller's deadline) can only shorten the limiter's own max wait.
+        """
+        max_wait = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        reservations = self._reservations(provider, api_key, tokens)
+        wait = self.store.reserve(reservations, max_wait) if reservations else 0.0
+        with self._lock:
+            stats = self._stats.setdefault(provider, {"calls": 0, "throttled": 0,
+                                                      "throttled_seconds": 0.0, "rejected": 0})
+            if wait is None:
+                stats["rejected"] += 1
+            else:
+                stats["calls"] += 1
+                if wait > 0:
+                    stats["throttled"] += 1
+                    stats["throttled_seconds"] += wait
+        if wait is None:
+            raise RateLimitExceeded(provider, max_wait)
+        return wait
+
+    def acquire(self, provider: str, api_key: str = None, tokens: int = 0, max_wait: float = None):
+        """Block until a call to ``provider`` is within its budget"""
+        wait = self.reserve(provider, api_key, tokens, max_wait)
+        if wait > 0:
+            logger.debug(f"Throttling {provider} call for {wait:.2f}s")
+            time.sleep(wait)
+
+    async def acquire_async(self, provider: str, api_key: str = None, tokens: int = 0, max_wait: float = None):
+        wait = await asyncio.to_thread(self.reserve, provider, api_key, tokens, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            result = {}
+            for provider, counters in self._stats.items():
+                entry = dict(counters, throttled_seconds=round(counters["throttled_seconds"], 3))
+                entry["limits"] = self._limits_for(provider)
+                result[provider] = entry
+            return result
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter selected by RATE_LIMIT_BACKEND (sqlite or memory)"""
+    backend = os.getenv("RATE_LIMIT_BACKEND", "sqlite").lower()
+    if backend == "memory":
+        return RateLimiter(MemoryBucketStore())
+    if backend == "sqlite":
+        default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "data", "rate_limits.db")
+        return RateLimiter(SQLiteBucketStore(os.getenv("RATE_LIMIT_PATH", default_path)))
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{backend}'")
+
+
+rate_limiter = create_rate_limiter()
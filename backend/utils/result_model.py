@@ -0,0 +1,103 @@
+import json
+import hashlib
+from typing import Dict, Iterable
+
+# Top-level report fields the frontend renders; /results returns these by default
+SUMMARY_FIELDS = ("trends", "opportunities", "actionPlan", "marketingStrategy", "competitiveAnalysis",
+                  "productivityTips", "riskAssessment", "metadata")
+DETAIL_FIELDS = ("ai_analysis", "business_context", "website_info", "market_data", "industry_insights",
+                 "competitor_intel", "analysis_type")
+ALL_FIELDS = SUMMARY_FIELDS + ("analysis_details",)
+
+# Shorter strings are cheaper inline than behind a reference
+MIN_BLOB_CHARS = 256
+BLOB_REF = "$blob"
+
+
+def _store(value, blobs: Dict) -> Dict:
+    key = hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+    blobs.setdefault(key, value)
+    return {BLOB_REF: key}
+
+
+def _normalize(value, blobs: Dict):
+    """Replace news articles and long texts with references into ``blobs``"""
+    if isinstance(value, str):
+        return _store(value, blobs) if len(value) >= MIN_BLOB_CHARS else value
+    if isinstance(value, dict):
+        return {
+            key: [_store(article, blobs) for article in item]
+            if key == "articles" and isinstance(item, list) else _normalize(item, blobs)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_normalize(item, blobs) for item in value]
+    return value
+
+
+def _expand(value, blobs: Dict):
+    if isinstance(value, dict):
+        if len(value) == 1 and BLOB_REF in value:
+            return blobs[value[BLOB_REF]]
+        return {key: _expand(item, blobs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_expand(item, blobs) for item in value]
+    return value
+
+
+def compact_results(results: Dict) -> Dict:
+    """
+    Stored form of a completed analysis.
+
+    The market, industry and competitor stages each embed their own NewsAPI
+    response, and the same articles and LLM texts show up several times.
+    Here every article and long text is kept once under ``blobs`` and
+    referenced from ``analysis_details``. ``business_context`` is dropped
+    because the job record already holds it as ``business_data``.
+    """
+    blobs = {}
+    details = {name: value for name, value in results["analysis_details"].items() if name != "business_context"}
+    compact = {name: value for name, value in results.items() if name != "analysis_details"}
+    compact["analysis_details"] = _normalize(details, blobs)
+    compact["blobs"] = blobs
+    return compact
+
+
+def parse_fields(raw: str) -> tuple:
+    """
+    ``fields`` query parameter -> field names.
+
+    Empty means the summary and ``*`` means everything. Otherwise it is a
+    comma-separated list of top-level fields, or ``analysis_details.<name>``
+    for a single detail section. Raises ValueError for unknown names.
+    """
+    if not raw or not raw.strip():
+        return SUMMARY_FIELDS
+    if raw.strip() == "*":
+        return ALL_FIELDS
+    fields = tuple(field.strip() for field in raw.split(",") if field.strip())
+    for field in fields:
+        name, _, detail = field.partition(".")
+        if name not in ALL_FIELDS or (detail and (name != "analysis_details" or detail not in DETAIL_FIELDS)):
+            raise ValueError(f"Unknown field '{field}'")
+    return fields
+
+
+def project_results(stored: Dict, fields: Iterable[str] = SUMMARY_FIELDS, business_data: Dict = None) -> Dict:
+    """Expand only the requested fields of stored results (compact or the older full form)"""
+    blobs = stored.get("blobs", {})
+    stored_details = stored.get("analysis_details", {})
+    projected = {}
+    for field in fields:
+        name, _, detail = field.partition(".")
+        if name != "analysis_details":
+            if name in stored:
+                projected[name] = stored[name]
+            continue
+        details = projected.setdefault("analysis_details", {})
+        for section in ([detail] if detail else DETAIL_FIELDS):
+            if section in stored_details:
+                details[section] = _expand(stored_details[section], blobs)
+            elif section == "business_context":
+                details[section] = business_data or {}
+    return projected
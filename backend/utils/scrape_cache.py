@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from utils.web_scraper import fetch_page_summary
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_CACHE_ENABLED = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() == "true"
+
+
+class ScrapeCache:
+    """
+    Per-URL cache of extracted page summaries with HTTP revalidation.
+
+    A summary is served as-is for ``ttl`` seconds. After that, for another
+    ``stale_ttl`` seconds, it is still served immediately while a background
+    conditional GET (If-None-Match / If-Modified-Since) refreshes it. A 304
+    only bumps the timestamp; nothing is parsed. Older entries are
+    revalidated before returning. Failures are cached for ``negative_ttl``
+    so unreachable sites aren't retried on every analysis. If a
+    revalidation fails, the last good summary is served instead.
+
+    ``counters`` describe how lookups were answered; background
+    revalidations are counted separately in ``revalidations``.
+    """
+
+    def __init__(self, path: str, ttl: float = 21600, stale_ttl: float = 604800, negative_ttl: float = 600):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.counters = {"fresh": 0, "stale": 0, "not_modified": 0, "fetched": 0,
+                         "negative_hits": 0, "errors": 0}
+        self.revalidations = {"not_modified": 0, "fetched": 0, "errors": 0}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scrape-revalidate")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER,
+                summary TEXT,
+                error TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_fetched ON pages(fetched_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, background: bool = False):
+        with self._lock:
+            (self.revalidations if background else self.counters)[name] += 1
+
+    def _load(self, url: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT status_code, summary, error, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "status_code": row[0],
+            "summary": json.loads(row[1]) if row[1] else None,
+            "error": row[2],
+            "etag": row[3],
+            "last_modified": row[4],
+            "fetched_at": row[5]
+        }
+
+    def _store(self, url: str, entry: Dict):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO pages (url, status_code, summary, error, etag, last_modified, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, entry.get("status_code"), json.dumps(entry["summary"]) if entry.get("summary") else None,
+             entry.get("error"), entry.get("etag"), entry.get("last_modified"), now)
+        )
+        conn.execute("DELETE FROM pages WHERE fetched_at < ?", (now - self.ttl - self.stale_ttl,))
+
+    def _touch(self, url: str):
+        self._conn().execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    @staticmethod
+    def _result(entry: Dict) -> Dict:
+        return {"status_code": entry.get("status_code"), "summary": entry.get("summary"),
+                "error": entry.get("error")}
+
+    def get(self, url: str) -> Dict:
+        """
+        Summary for ``url``.
+
+        Returns ``{"status_code", "summary", "error"}``. ``summary`` is set
+        only for a 200; ``error`` is set when the site could not be fetched.
+        """
+        entry = self._load(url)
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if entry["summary"] is None:
+                if age < self.negative_ttl:
+                    self._count("negative_hits")
+                    return self._result(entry)
+            elif age < self.ttl:
+                self._count("fresh")
+                return self._result(entry)
+            elif age < self.ttl + self.stale_ttl:
+                self._count("stale")
+                self._revalidate_in_background(url, entry)
+                return self._result(entry)
+        return self._revalidate(url, entry)
+
+    def _revalidate_in_background(self, url: str, entry: Dict):
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def refresh():
+            try:
+                self._revalidate(url, entry, background=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        self._executor.submit(refresh)
+
+    def _revalidate(self, url: str, entry: Optional[Dict], background: bool = False) -> Dict:
+        """Conditional GET when a good summary is cached, plain GET otherwise"""
+        headers = {}
+        if entry is not None and entry["summary"] is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            page = fetch_page_summary(url, headers=headers)
+        except Exception as e:
+            page = {"status_code": None, "summary": None, "error": str(e), "headers": {}}
+
+        if page["status_code"] == 304 and entry is not None and entry["summary"] is not None:
+            self._count("not_modified", background)
+            self._touch(url)
+            return self._result(entry)
+
+        if page["status_code"] == 200 and page["summary"] is not None:
+            self._count("fetched", background)
+            fresh = {
+                "status_code": 200,
+                "summary": page["summary"],
+                "etag": page["headers"].get("ETag"),
+                "last_modified": page["headers"].get("Last-Modified")
+            }
+            self._store(url, fresh)
+            return self._result(fresh)
+
+        self._count("errors", background)
+        failure = {"status_code": page["status_code"], "summary": None, "error": page.get("error")}
+        if entry is not None and entry["summary"] is not None:
+            # Keep serving the last good summary, as fresh for negative_ttl more seconds
+            logger.warning(f"Revalidating {url} failed, serving cached summary")
+            self._conn().execute("UPDATE pages SET fetched_at = ? WHERE url = ?",
+                                 (time.time() - self.ttl + self.negative_ttl, url))
+            return self._result(entry)
+        self._store(url, failure)
+        return self._result(failure)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters, revalidations=dict(self.revalidations))
+        try:
+            counters["entries"] = self._conn().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        except Exception:
+            counters["entries"] = None
+        return counters
+
+
+_default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "scrape_cache.db")
+
+scrape_cache = ScrapeCache(
+    path=os.getenv("SCRAPE_CACHE_PATH", _default_path),
+    ttl=float(os.getenv("SCRAPE_CACHE_TTL", "21600")),
+    stale_ttl=float(os.getenv("SCRAPE_CACHE_STALE_TTL", "604800")),
+    negative_ttl=float(os.getenv("SCRAPE_CACHE_NEGATIVE_TTL", "600"))
+)
+
+
+def get_page_summary(url: str) -> Dict:
+    """Cached page summary; falls through to a direct fetch when SCRAPE_CACHE_ENABLED is off"""
+    if SCRAPE_CACHE_ENABLED:
+        return scrape_cache.get(url)
+    try:
+        page = fetch_page_summary(url)
+        return {"status_code": page["status_code"], "summary": page["summary"], "error": None}
+    except Exception as e:
+        return {"status_code": None, "summary": None, "error": str(e)}
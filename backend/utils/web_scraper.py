@@ -0,0 +1,192 @@
+import os
+import re
+import codecs
+import logging
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Tuple
+
+from utils.http_transport import http_get
+
+logger = logging.getLogger(__name__)
+
+# "stream" parses the body incrementally and stops early; "soup" downloads
+# the whole page and builds a BeautifulSoup tree
+SCRAPER_MODE = os.getenv("SCRAPER_MODE", "stream").lower()
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", str(512 * 1024)))
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "10"))
+SCRAPE_CHUNK_BYTES = 16 * 1024
+# Characters of body text kept for the content preview
+PREVIEW_CHARS = 500
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+def normalize_page_text(text: str) -> str:
+    """Collapse page text the way the original scraper did: per line, split on double spaces"""
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+
+class PageSummaryParser(HTMLParser):
+    """
+    Event-based extraction of title, meta description and leading page text.
+
+    Text outside ``<script>``/``<style>`` is collected in document order (as
+    ``get_text()`` would). ``done`` turns true once the parser is past the
+    head and has seen enough text for the preview, so the caller can stop
+    reading the body.
+    """
+
+    SKIP_TAGS = ("script", "style")
+    HEAD_TAGS = ("html", "head", "title", "meta", "link", "base", "noscript", "script", "style")
+
+    def __init__(self, preview_chars: int = PREVIEW_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.preview_chars = preview_chars
+        self.title = None
+        self.description = None
+        self._in_title = False
+        self._title_parts = []
+        self._skip_depth = 0
+        self._in_body = False
+        self._text_parts = []
+        self._text_length = 0
+
+    @property
+    def done(self) -> bool:
+        # A small margin covers whitespace merged away across chunk boundaries
+        return self._in_body and self._text_length >= self.preview_chars + 50
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "meta" and self.description is None:
+            attributes = dict(attrs)
+            if attributes.get("name") == "description":
+                self.description = (attributes.get("content") or "").strip()
+        if tag not in self.HEAD_TAGS:
+            self._in_body = True
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "meta":
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = ''.join(self._title_parts).strip()
+        elif tag == "head":
+            self._in_body = True
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+        self._text_parts.append(data)
+        self._text_length += len(normalize_page_text(data))
+
+    def summary(self) -> Dict[str, str]:
+        title = self.title if self.title is not None else ''.join(self._title_parts).strip()
+        return {
+            "title": title,
+            "description": self.description or "",
+            "text": normalize_page_text(''.join(self._text_parts))[:self.preview_chars]
+        }
+
+
+def _detect_encoding(content_type: str, head: bytes) -> str:
+    """Charset from the Content-Type header, else from a <meta charset>, else UTF-8"""
+    match = re.search(r'charset=["\']?([\w-]+)', content_type or "", re.IGNORECASE)
+    if not match:
+        match = _CHARSET_RE.search(head)
+        charset = match.group(1).decode("ascii", "ignore") if match else "utf-8"
+    else:
+        charset = match.group(1)
+    try:
+        codecs.lookup(charset)
+        return charset
+    except LookupError:
+        return "utf-8"
+
+
+def extract_summary_streaming(chunks: Iterable[bytes], content_type: str = "",
+                              max_bytes: int = SCRAPE_MAX_BYTES) -> Tuple[Dict[str, str], int]:
+    """
+    Feed body chunks to a PageSummaryParser until it is done or ``max_bytes`` are read.
+
+    Returns ``(summary, bytes_read)``.
+    """
+    parser = PageSummaryParser()
+    decoder = None
+    bytes_read = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(_detect_encoding(content_type, chunk[:2048]))(errors="replace")
+        chunk = chunk[:max(0, max_bytes - bytes_read)]
+        bytes_read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or bytes_read >= max_bytes:
+            break
+    else:
+        # Whole body read: flush text still buffered after the last tag
+        if decoder is not None:
+            parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    return parser.summary(), bytes_read
+
+
+def extract_summary_soup(content: bytes) -> Dict[str, str]:
+    """Original full-tree extraction with BeautifulSoup"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    title = soup.find('title')
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return {
+        "title": title.get_text().strip() if title else "",
+        "description": meta_desc.get('content', '').strip() if meta_desc else "",
+        "text": normalize_page_text(soup.get_text())[:PREVIEW_CHARS]
+    }
+
+
+def fetch_page_summary(url: str, headers: Dict = None) -> Dict:
+    """
+    GET ``url`` and extract its summary.
+
+    Returns ``{"status_code", "summary", "bytes_read", "headers"}``.
+    ``summary`` is None unless the response was a 200.
+    """
+    request_headers = {'User-Agent': USER_AGENT}
+    request_headers.update(headers or {})
+
+    if SCRAPER_MODE == "soup":
+        response = http_get(url, headers=request_headers, timeout=SCRAPE_TIMEOUT)
+        summary = extract_summary_soup(response.content) if response.status_code == 200 else None
+        return {"status_code": response.status_code, "summary": summary,
+                "bytes_read": len(response.content), "headers": response.headers}
+
+    response = http_get(url, headers=request_headers, timeout=SCRAPE_TIMEOUT, stream=True)
+    try:
+        summary, bytes_read = None, 0
+        if response.status_code == 200:
+            summary, bytes_read = extract_summary_streaming(
+                response.iter_content(chunk_size=SCRAPE_CHUNK_BYTES),
+                response.headers.get('Content-Type', '')
+            )
+        return {"status_code": response.status_code, "summary": summary,
+                "bytes_read": bytes_read, "headers": response.headers}
+    finally:
+        # Drops the connection if the body wasn't fully read
+        response.close()